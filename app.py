@@ -1,5 +1,5 @@
 import streamlit as st
-from src import login, ui, home, auth_user, movie_recommend, data_fetcher
+from src import login, ui, home, auth_user, movie_recommend, data_fetcher, tmdb_client, page_profiler
 
 # ✅ Debugging - ui 모듈이 제대로 import 되었는지 확인
 print(dir(ui))  # ui.py에 정의된 함수 및 변수 목록 출력
@@ -9,41 +9,49 @@ st.set_page_config(page_title="MovieMind", page_icon="🎬", layout="wide")
 def app():
     """📌 MovieMind 메인 실행 함수"""
     
-    # ✅ CSS 스타일 로드
-    ui.load_css()
+    # ✅ 렌더링 CPU 프로파일 (PAGE_PROFILE=1, 또는 PAGE_PROFILE_ALLOW_QUERY=1일 때 ?profile=1)
+    with page_profiler.profile_render() as render:
+        # ✅ CSS 스타일 로드
+        ui.load_css()
 
-    # ✅ 메인 헤더 표시
-    ui.main_header()
+        # ✅ 메인 헤더 표시
+        ui.main_header()
 
-    # ✅ 사용자 로그인 & 인증
-    login.user_authentication()
+        # ✅ TMDb 장애 안내 (회로가 열려 있으면 저장된 데이터로 표시 중)
+        if tmdb_client.degraded():
+            st.warning("⚠️ TMDb 응답이 원활하지 않아 일부 정보는 저장된 데이터로 표시됩니다.")
 
-    # ✅ 네비게이션 메뉴
-    selected_page = ui.navigation_menu()  # ✅ navigation_menu() 호출
+        # ✅ 사용자 로그인 & 인증
+        login.user_authentication()
 
-    # ✅ 페이지 라우팅
-    if selected_page == "홈":
-        home.show_home_page()
-    elif selected_page == "사용자 페이지":
-        ui.show_user_page()
-    elif selected_page == "영화 스타일 선택":
-        ui.show_profile_setup()
-    elif selected_page == "영화 검색":
-        ui.show_movie_search()
-    elif selected_page == "추천 생성":
-        ui.show_generated_recommendations()
-    elif selected_page == "즐겨찾기":
-        ui.show_favorite_movies()
+        # ✅ 네비게이션 메뉴
+        selected_page = ui.navigation_menu()  # ✅ navigation_menu() 호출
+        render.page = selected_page or render.page
 
-    # ✅ 푸터 표시
-    ui.show_footer()
+        # ✅ 페이지 라우팅
+        if selected_page == "홈":
+            home.show_home_page()
+        elif selected_page == "사용자 페이지":
+            ui.show_user_page()
+        elif selected_page == "영화 스타일 선택":
+            ui.show_profile_setup()
+        elif selected_page == "영화 검색":
+            ui.show_movie_search()
+        elif selected_page == "추천 생성":
+            ui.show_generated_recommendations()
+        elif selected_page == "즐겨찾기":
+            ui.show_favorite_movies()
 
+        # ✅ 푸터 표시
+        ui.show_footer()
 
 
-from flask import Flask, jsonify, request
+
+from flask import Flask, Response, jsonify, request, send_file
 import requests
 import os
 import webbrowser
+from src import poster_cache, hot_lists, catalog_table, tmdb_client, rec_stream, api_response
 
 app = Flask(__name__)
 
@@ -142,7 +150,8 @@ def create_guest_session():
 
 
 
-def fetch_movies(endpoint, params=None):
+# ✅ 임의 엔드포인트 조회 (discover 등 로컬에서 처리하지 못한 요청의 TMDb 대체 경로)
+def fetch_endpoint(endpoint, params=None):
     url = f"{BASE_URL}/{endpoint}"
     headers = {
         "accept": "application/json"
@@ -186,6 +195,30 @@ def fetch_movies(category, page=1, append_to_response=None):
         print(f"❌ 오류 발생: {response.status_code} - {response.text}")
         return {"error": f"영화 데이터를 가져오는 중 오류가 발생했습니다. (상태 코드: {response.status_code})"}
 
+# ✅ 영화 목록 (1페이지는 백그라운드 스냅샷을 만든 목록 응답을 메모리에서 바로 응답, 모든 페이지가 TMDb 목록 형태)
+def fetch_movie_list(category, page):
+    if str(page) == "1":
+        data = hot_lists.get_list_page(category)
+        if data:
+            return data
+    return fetch_movies(category, page)
+
+def _not_error(data):
+    return "error" not in data
+
+def _movie_list_response(category, page):
+    return api_response.cached((category, str(page)), lambda: fetch_movie_list(category, page), cacheable=_not_error)
+
+# ✅ 스냅샷 상태 (갱신 시각, 실패 횟수)
+@app.route("/status/snapshots", methods=["GET"])
+def snapshot_status():
+    return api_response.respond(hot_lists.snapshot_status())
+
+@app.route("/status/circuits", methods=["GET"])
+def circuit_status():
+    """📌 TMDb 엔드포인트 계열별 회로 차단기 상태와 지난 값 제공 횟수"""
+    return api_response.respond({"circuits": tmdb_client.circuit_status(), "stats": dict(tmdb_client.STATS)})
+
 # ✅ Discover Movies
 @app.route("/discover/movie", methods=["GET"])
 def discover_movie():
@@ -205,37 +238,114 @@ def discover_movie():
     # 클라이언트가 전달한 파라미터 필터링
     params = {k: v for k, v in request.args.items() if k in allowed_params}
     
-    # API 호출
-    data = fetch_movies("discover/movie", params)
-    return jsonify(data)
+    # 로컬 열 테이블에서 먼저 처리하고, 지원하지 않는 파라미터면 TMDb로 넘김
+    def load():
+        data = catalog_table.discover(params)
+        return fetch_endpoint("discover/movie", dict(params)) if data is None else data
+
+    # 같은 필터 조합은 인코딩/압축된 바이트를 그대로 재사용 (?fields=로 항목 필드 선택)
+    return api_response.cached(("discover", tuple(sorted(params.items()))), load, cacheable=_not_error)
 
 # ✅ Now Playing
 @app.route("/now_playing", methods=["GET"])
 def now_playing():
     page = request.args.get("page", 1)
-    data = fetch_movies("movie/now_playing", {"page": page})
-    return jsonify(data)
+    return _movie_list_response("now_playing", page)
 
 # ✅ Popular
 @app.route("/popular", methods=["GET"])
 def popular():
     page = request.args.get("page", 1)
-    data = fetch_movies("movie/popular", {"page": page})
-    return jsonify(data)
+    return _movie_list_response("popular", page)
 
 # ✅ Top Rated
 @app.route("/top_rated", methods=["GET"])
 def top_rated():
     page = request.args.get("page", 1)
-    data = fetch_movies("movie/top_rated", {"page": page})
-    return jsonify(data)
+    return _movie_list_response("top_rated", page)
 
 # ✅ Upcoming
 @app.route("/upcoming", methods=["GET"])
 def upcoming():
     page = request.args.get("page", 1)
-    data = fetch_movies("movie/upcoming", {"page": page})
-    return jsonify(data)
+    return _movie_list_response("upcoming", page)
+
+# ✅ 여러 영화 상세 한 번에 조회 (상세 + 감독 + 주요 출연진, 한국어)
+BATCH_MAX_IDS = 100
+
+def _batch_error(e):
+    # HTTPError 문자열에는 api_key가 포함된 URL이 들어 있으므로 상태 코드만 전달
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return f"TMDb 요청 실패 (상태 코드: {e.response.status_code})"
+    return f"TMDb 요청 실패 ({type(e).__name__})"
+
+@app.route("/movies/batch", methods=["GET", "POST"])
+def movies_batch():
+    if request.method == "POST":
+        raw_ids = (request.get_json(silent=True) or {}).get("ids", [])
+    else:
+        raw_ids = request.args.get("ids", "").split(",")
+    if not isinstance(raw_ids, list):
+        return jsonify({"error": "ids는 영화 ID 목록이어야 합니다."}), 400
+    if len(raw_ids) > BATCH_MAX_IDS:  # 파싱/중복 제거 전에 입력 크기부터 제한
+        return jsonify({"error": f"한 번에 최대 {BATCH_MAX_IDS}개까지 조회할 수 있습니다."}), 400
+
+    movie_ids, errors = [], []
+    for raw_id in raw_ids:
+        if isinstance(raw_id, str):
+            raw_id = raw_id.strip()
+            if not raw_id:
+                continue
+        try:
+            movie_id = int(raw_id)
+        except (TypeError, ValueError):
+            errors.append({"id": raw_id, "error": "잘못된 영화 ID입니다."})
+            continue
+        movie_ids.append(movie_id)
+    movie_ids = list(dict.fromkeys(movie_ids))
+
+    # 캐시는 한 번의 multi-get으로 조회하고 미스만 병렬로 TMDb에서 채움 (일부 실패해도 나머지는 반환)
+    results = []
+    for movie_id, record in zip(movie_ids, tmdb_client.hydrate_movies(movie_ids, hedge=True)):
+        if isinstance(record, Exception):
+            errors.append({"id": movie_id, "error": _batch_error(record)})
+        elif record is None:
+            errors.append({"id": movie_id, "error": "영화 정보를 찾을 수 없습니다."})
+        else:
+            results.append(record._asdict())
+    return api_response.respond({"results": results, "errors": errors})
+
+# ✅ 추천 스트리밍 (SSE): data/user_profile.json과 같은 형태의 프로필을 받아 카테고리별로 준비되는 즉시 전송
+@app.route("/recommendations/stream", methods=["POST"])
+def recommendations_stream():
+    profile = request.get_json(silent=True)
+    if not isinstance(profile, dict):
+        return jsonify({"error": "프로필(JSON 객체)이 필요합니다."}), 400
+    additional_info = str(profile.get("additional_info") or request.args.get("additional_info", ""))
+    include_llm = request.args.get("llm", "1") != "0"
+    # 클라이언트가 연결을 끊으면 서버가 응답 이터레이터를 닫고, 진행 중인 업스트림 작업이 취소됨
+    response = Response(rec_stream.stream_sse(profile, additional_info, include_llm), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+# ✅ 포스터 썸네일 (WebP, 로컬 디스크 캐시)
+def _send_poster(path, max_age):
+    response = send_file(path, mimetype="image/webp", max_age=max_age)
+    response.headers["Cache-Control"] = f"public, max-age={max_age}, immutable"
+    return response
+
+@app.route("/posters/w<int:width>/<name>", methods=["GET"])
+def poster(width, name):
+    path = poster_cache.get_thumbnail(name, width)
+    if path:
+        return _send_poster(path, poster_cache.CACHE_MAX_AGE)
+    # 원본을 받지 못한 경우: 플레이스홀더를 짧게 캐시하여 나중에 다시 시도
+    return _send_poster(poster_cache.get_placeholder(width), 300)
+
+@app.route("/posters/placeholder/w<int:width>.webp", methods=["GET"])
+def poster_placeholder(width):
+    return _send_poster(poster_cache.get_placeholder(width), poster_cache.CACHE_MAX_AGE)
 
 
 
@@ -258,6 +368,7 @@ def upcoming():
 
 
 if __name__ == "__main__":
+    hot_lists.start()
     app.run(port=5000, debug=True)
 
 
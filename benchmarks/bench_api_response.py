@@ -0,0 +1,98 @@
+"""
+📌 프록시 JSON 응답 벤치마크 (jsonify vs api_response)
+
+실행: python -m benchmarks.bench_api_response [반복 횟수]
+
+tmdb_standin의 /discover/movie 페이지(20편)를 Flask 테스트 클라이언트로 요청해
+- 전송 바이트 (응답 본문 그대로, 압축된 경우 압축된 크기)
+- 요청 1건당 CPU 시간 (프로세스 CPU, 테스트 클라이언트/라우팅 비용 포함)
+- 그중 라우트 함수가 응답을 만드는 데 쓴 CPU 시간 (직렬화/압축/캐시 조회)
+을 비교합니다. 이전 코드는 jsonify(data)로 매번 다시 인코딩하고 압축하지 않았습니다.
+캐시 미스는 요청마다 다른 키를 써서, 캐시 적중은 같은 키를 반복해 측정합니다.
+"""
+import gzip
+import itertools
+import sys
+import time
+
+from flask import Flask, jsonify
+
+from benchmarks import tmdb_standin
+from src import api_response
+
+LIST_FIELDS = "id,title,poster_path,release_date,vote_average"
+_miss = itertools.count()
+
+
+def payload(page: int = 1):
+    return tmdb_standin.response_body("/discover/movie", {"page": [str(page)]})
+
+
+def create_app() -> Flask:
+    app = Flask(__name__)
+    data = payload()
+
+    @app.route("/legacy")
+    def legacy():
+        return jsonify(data)
+
+    @app.route("/respond")
+    def respond():
+        return api_response.respond(data)
+
+    @app.route("/cached/<key>")
+    def cached(key):
+        return api_response.cached(key, lambda: data)
+
+    return app
+
+
+def measure(app, client, url_for, headers, runs: int):
+    """📌 (요청당 CPU ms, 응답 만들기만의 CPU ms, 전송 바이트, Content-Encoding, 마지막 응답)"""
+    response = client.get(url_for(), headers=headers)  # 캐시 적중 시나리오의 첫 채움
+    started = time.process_time()
+    for _ in range(runs):
+        response = client.get(url_for(), headers=headers)
+    cpu = (time.process_time() - started) * 1000 / runs
+
+    # 라우트 함수만 (WSGI/테스트 클라이언트 비용 제외)
+    view = 0.0
+    for _ in range(runs):
+        with app.test_request_context(url_for(), headers=headers):
+            started = time.process_time()
+            app.dispatch_request()
+            view += time.process_time() - started
+    return cpu, view * 1000 / runs, len(response.data), response.headers.get("Content-Encoding", "-"), response
+
+
+def main(runs=2000):
+    app = create_app()
+    client = app.test_client()
+    encodings = ["gzip"] + (["br"] if api_response.brotli is not None else [])
+    scenarios = [("jsonify (이전)", lambda: "/legacy", {})]
+    scenarios.append(("respond, 압축 없음", lambda: "/respond", {}))
+    for encoding in encodings:
+        headers = {"Accept-Encoding": encoding}
+        scenarios += [
+            (f"respond, {encoding}", lambda: "/respond", headers),
+            (f"cached 미스, {encoding}", lambda: f"/cached/miss{next(_miss)}", headers),
+            (f"cached 적중, {encoding}", lambda: "/cached/hit", headers),
+            (f"cached 적중, {encoding}, fields", lambda: f"/cached/hit?fields={LIST_FIELDS}", headers),
+        ]
+
+    print(f"/discover/movie 1페이지 ({len(payload()['results'])}편), 시나리오마다 {runs}회 요청 (brotli "
+          f"{'사용' if api_response.brotli is not None else '미설치'})")
+    baseline = None
+    for label, url_for, headers in scenarios:
+        api_response.clear()
+        cpu, view, size, encoding, response = measure(app, client, url_for, headers, runs)
+        if encoding == "gzip":
+            gzip.decompress(response.data)  # 압축 본문이 올바른지 확인
+        baseline = baseline or (cpu, view, size)
+        print(f"  {label:<26} {size / 1024:6.1f} KiB ({size / baseline[2]:4.0%}) | "
+              f"CPU {cpu * 1000:4.0f} µs/요청 ({cpu / baseline[0]:4.0%}) | "
+              f"응답 만들기 {view * 1000:4.0f} µs ({view / baseline[1]:4.0%}) | {encoding}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
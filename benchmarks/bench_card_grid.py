@@ -0,0 +1,163 @@
+"""
+📌 카드 렌더링 벤치마크 (카드마다 개별 요소 vs 섹션/목록을 HTML 한 번으로)
+
+실행 (Streamlit secrets가 있는 위치에서): python -m benchmarks.bench_card_grid [반복 횟수]
+
+Streamlit AppTest로 스크립트를 실제로 실행해, 다시 실행(rerun) 한 번에 브라우저로 보내는
+- 델타 메시지 수와 직렬화 바이트 (ForwardMsg protobuf 크기)
+- 화면에 만들어지는 Streamlit 요소 수 (요소마다 React 컴포넌트가 하나씩 생김 - 브라우저 렌더링 비용의 대리 지표)
+- 바로 받는 포스터 수 (st.image는 즉시 로드, card_grid는 loading="lazy")
+- 스크립트 실행 시간
+을 홈(5섹션 × 5카드)과 검색 결과(50건) 화면에서 비교합니다. 이전 코드는 아래 _legacy_* 함수에 그대로 옮겨 두었습니다.
+"""
+import logging
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+from src import event_log
+from src.movie_record import MovieRecord
+
+HOME_SECTIONS = 5
+CARDS_PER_SECTION = 5
+SEARCH_RESULTS = 50
+_captured = []
+
+
+def sample_records(count: int, offset: int = 0):
+    return [MovieRecord(
+        id=offset + i, title=f"번역된 영화 제목 {offset + i}", overview=("영화 줄거리 설명 문장입니다. " * 12).strip(),
+        release_date="2019-04-24", vote_average=7.3, poster_path=f"/poster{offset + i:07d}abcdefghijklmnop.jpg",
+        genre_ids=(28, 12), directors=("감독 이름",), cast=("배우 하나", "배우 둘", "배우 셋", "배우 넷"),
+    ) for i in range(count)]
+
+
+# ---------------- 이전 렌더링 (비교 기준) ----------------
+def _legacy_home_section(section, records):
+    import streamlit as st
+    from src.home import show_full_movie_details
+    from src.poster_cache import poster_url
+
+    st.markdown(f"<h2 class='sub-header'>{section}</h2>", unsafe_allow_html=True)
+    cols = st.columns(CARDS_PER_SECTION)
+    for idx, movie in enumerate(records[:CARDS_PER_SECTION]):
+        with cols[idx]:
+            director_names = ", ".join(movie.directors) or "정보 없음"
+            cast_names = ", ".join(movie.cast[:3]) or "정보 없음"
+            director_html = f"<p class='movie-info'>🎬 감독: {director_names}</p>" if director_names != "정보 없음" else ""
+            cast_html = f"<p class='movie-info'>👥 출연진: {cast_names}</p>" if cast_names != "정보 없음" else ""
+            st.image(poster_url(movie.poster_path, 250), width=250, use_container_width=False)
+            st.markdown(f"""
+                <div class='movie-card'>
+                    <p class='movie-title'>{movie.title}</p>
+                    <p class='movie-info'>⭐ 평점: {movie.vote_average or "N/A"}/10</p>
+                    <p class='movie-info'>🗓 개봉일: {movie.release_date or "정보 없음"}</p>
+                    <p class='movie-info'>📜 줄거리: {(movie.overview or "줄거리 없음")[:100]}...</p>
+                    {director_html}
+                    {cast_html}
+                </div>
+                """, unsafe_allow_html=True)
+            with st.expander("자세히 보기", key=f"details_{section}_{movie.id}"):
+                show_full_movie_details(movie)
+
+
+def _legacy_search(records):
+    import streamlit as st
+    from src.poster_cache import poster_url
+
+    for movie in records:
+        st.image(poster_url(movie.poster_path, 150), width=150, caption=movie.title or "정보없음")
+        st.write(f"**{movie.title or '정보없음'}** ({movie.release_date or '정보없음'})")
+        st.write(f"⭐ 평점: {movie.vote_average or '정보없음'}/10")
+        st.write(f"📜 줄거리: {(movie.overview or '정보없음')[:150]}...")
+        st.write("---")
+
+
+def render(screen: str, legacy: bool):
+    """📌 AppTest 스크립트 본문: 화면 하나를 이전/새 방식으로 그림"""
+    import streamlit as st
+    from src import card_grid, home
+
+    if screen == "home":
+        for s in range(HOME_SECTIONS):
+            records = sample_records(CARDS_PER_SECTION, offset=s * 100)
+            if legacy:
+                _legacy_home_section(f"섹션 {s}", records)
+            else:
+                home.show_movie_section(f"섹션 {s}", records)
+    else:
+        records = sample_records(SEARCH_RESULTS)
+        if legacy:
+            _legacy_search(records)
+        else:
+            st.html(card_grid.list_html(records, poster_width=150))
+
+
+def _script(screen, legacy):
+    from benchmarks import bench_card_grid
+    bench_card_grid.render(screen, legacy)
+
+
+# ---------------- 측정 ----------------
+def _capture_runs():
+    """📌 AppTest가 실행마다 만든 ForwardMsg 목록을 보관 (브라우저로 보내질 메시지와 같음)"""
+    original = LocalScriptRunner.run
+
+    def run(self, *args, **kwargs):
+        tree = original(self, *args, **kwargs)
+        _captured.append(list(self.forward_msgs()))
+        return tree
+
+    LocalScriptRunner.run = run
+
+
+def _count_elements(node) -> int:
+    children = getattr(node, "children", None)
+    if not children:
+        return 1
+    return 1 + sum(_count_elements(child) for child in children.values())
+
+
+def measure(screen: str, legacy: bool, runs: int):
+    at = AppTest.from_function(_script, args=(screen, legacy), default_timeout=30)
+    times, messages, sizes = [], [], []
+    for _ in range(runs):
+        _captured.clear()
+        started = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - started) * 1000)
+        msgs = _captured[-1]
+        deltas = [m for m in msgs if m.WhichOneof("type") == "delta"]
+        messages.append(len(deltas))
+        sizes.append(sum(m.ByteSize() for m in msgs))
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    images = sum(1 for m in _captured[-1] if m.WhichOneof("type") == "delta"
+                 and m.delta.WhichOneof("type") == "new_element" and m.delta.new_element.WhichOneof("type") == "imgs")
+    return {
+        "deltas": statistics.median(messages), "bytes": statistics.median(sizes),
+        "elements": _count_elements(at._tree) - 1, "eager_images": images,
+        "ms": statistics.median(times),
+    }
+
+
+def main(runs=20):
+    event_log.EVENT_LOG_DIR = tempfile.mkdtemp(prefix="bench-events-")  # 노출 기록이 실제 로그에 섞이지 않도록
+    logging.getLogger("streamlit").setLevel(logging.ERROR)  # 이전 코드의 use_container_width 경고 생략
+    _capture_runs()
+    print(f"홈: {HOME_SECTIONS}섹션 × {CARDS_PER_SECTION}카드, 검색: {SEARCH_RESULTS}건, 화면마다 {runs}회 실행의 중앙값")
+    for screen in ("home", "search"):
+        print(f"\n[{screen}]")
+        for legacy in (True, False):
+            r = measure(screen, legacy, runs)
+            label = "이전 (요소별)" if legacy else "card_grid  "
+            print(f"  {label} 델타 {r['deltas']:4.0f}개 | {r['bytes'] / 1024:7.1f} KiB | 요소 {r['elements']:4d}개 | "
+                  f"즉시 로드 포스터 {r['eager_images']:3d}장 | 스크립트 {r['ms']:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,69 @@
+"""
+📌 헤지 요청 지연 벤치마크 (헤지 없음 vs p95 초과 시 헤지)
+
+실행: python -m benchmarks.bench_hedged_requests [페이지 수]
+
+로컬 TMDb 대역 서버(benchmarks.tmdb_standin)에 요청의 3%가 300ms 늦어지는 지연 스파이크를 넣고,
+- 단건: /movie/{id} 한 건씩 순서대로 요청
+- 페이지: 홈 화면 섹션처럼 영화 20편의 상세+크레딧을 한 번에 채움 (가장 느린 응답이 페이지 지연)
+의 p50/p95/p99 지연과 헤지로 더 보낸 요청 비율을 비교합니다. 캐시 효과를 빼기 위해 모든 요청은 서로 다른 영화 ID입니다.
+"""
+import itertools
+import statistics
+import sys
+import time
+
+from benchmarks import tmdb_standin
+from src import shared_cache, tmdb_client
+
+PAGE_SIZE = 20
+WARMUP = 200         # 헤지 기준(p95)을 잡기 위한 사전 요청 수
+_ids = itertools.count(1)
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+    return f"p50 {pick(0.5):6.1f} ms | p95 {pick(0.95):6.1f} ms | p99 {pick(0.99):6.1f} ms | 평균 {statistics.mean(ordered) * 1000:6.1f} ms"
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def run(hedge: bool, pages: int):
+    tmdb_client._breakers.clear()
+    shared_cache.set_cache(shared_cache.MemoryCache())
+    for _ in range(WARMUP):
+        tmdb_client.get_json(f"/movie/{next(_ids)}", cache_ttl=0)
+    before = dict(tmdb_client.STATS)
+
+    singles = [_timed(lambda: tmdb_client.get_json(f"/movie/{next(_ids)}", cache_ttl=0, hedge=hedge))
+               for _ in range(pages * 4)]
+    page_times = [_timed(lambda: tmdb_client.hydrate_movies([next(_ids) for _ in range(PAGE_SIZE)], hedge=hedge))
+                  for _ in range(pages)]
+
+    requests_sent = pages * 4 + pages * PAGE_SIZE
+    hedged = tmdb_client.STATS["hedged"] - before["hedged"]
+    wins = tmdb_client.STATS["hedge_wins"] - before["hedge_wins"]
+    label = "헤지 사용" if hedge else "헤지 없음"
+    print(f"\n[{label}] 추가 요청 {hedged}건 ({hedged / requests_sent:.1%}), 예비 요청이 먼저 도착 {wins}건")
+    print(f"  단건   {_percentiles(singles)}")
+    print(f"  페이지 {_percentiles(page_times)}")
+
+
+def main(pages=100):
+    server = tmdb_standin.serve()
+    tmdb_client.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    tmdb_client.API_KEY = tmdb_client.API_KEY or "standin"
+    print(f"대역 서버: 지연 스파이크 {tmdb_standin.SPIKE_RATE:.0%} × {tmdb_standin.SPIKE_LATENCY * 1000:.0f} ms, "
+          f"페이지당 {PAGE_SIZE}건, 페이지 {pages}개, 헤지 예산 {tmdb_client.HEDGE_MAX_RATIO:.0%}")
+    for hedge in (False, True):
+        run(hedge, pages)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
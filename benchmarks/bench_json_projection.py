@@ -0,0 +1,101 @@
+"""
+📌 크레딧/필모그래피 응답 디코딩 벤치마크 (전체 디코딩 vs 디코딩 직후 투영)
+
+실행: python -m benchmarks.bench_json_projection [반복 횟수]
+
+TMDb /movie/{id}?append_to_response=credits 응답(출연진 80명, 스태프 300명)과
+/person/{id}/movie_credits 응답(출연작 150편, 참여작 60편)을 흉내 낸 페이로드로
+영화(인물) 1건당 디코딩 CPU 시간, 캐시에 보관되는 객체 메모리, 공유 캐시 직렬화 크기를 비교합니다.
+이전 코드는 response.json()(표준 json)으로 전체를 디코딩해 그대로 보관했습니다.
+"""
+import json
+import sys
+import time
+import tracemalloc
+
+from src import json_projection, tmdb_client
+
+CAST_SIZE = 80
+CREW_SIZE = 300
+FILMOGRAPHY_CAST = 150
+FILMOGRAPHY_CREW = 60
+JOBS = ["Director", "Producer", "Screenplay", "Editor", "Sound Designer", "Art Direction", "Makeup Artist"]
+
+
+def _person(i, **extra):
+    return dict({
+        "adult": False, "gender": i % 3, "id": 1000 + i, "known_for_department": "Acting",
+        "name": f"Person Name {i}", "original_name": f"Original Person Name {i}", "popularity": 1.5 + i,
+        "profile_path": f"/profile{i:07d}abcdefghijk.jpg", "credit_id": f"52fe4{i:07d}c3a36847f80ab",
+    }, **extra)
+
+
+def _movie(i, **extra):
+    return dict({
+        "adult": False, "backdrop_path": f"/backdrop{i:07d}abcdefghijklmnop.jpg", "genre_ids": [28, 12, 878],
+        "id": 100000 + i, "original_language": "en", "original_title": f"Original Title Number {i}",
+        "overview": ("영화 줄거리 설명 문장입니다. " * 12).strip(), "popularity": 12.345 + i,
+        "poster_path": f"/poster{i:07d}abcdefghijklmnop.jpg", "release_date": "2019-04-24",
+        "title": f"번역된 영화 제목 {i}", "video": False, "vote_average": 7.3, "vote_count": 1000 + i,
+        "credit_id": f"52fe4{i:07d}c3a36847f80ab",
+    }, **extra)
+
+
+def movie_details_payload() -> bytes:
+    details = _movie(1, runtime=181, budget=356000000, revenue=2799439100, status="Released",
+                     tagline="Part of the journey is the end.", homepage="https://example.com",
+                     genres=[{"id": 28, "name": "액션"}, {"id": 12, "name": "모험"}],
+                     production_companies=[{"id": i, "name": f"Studio {i}", "logo_path": None,
+                                            "origin_country": "US"} for i in range(5)])
+    details["credits"] = {
+        "cast": [_person(i, cast_id=i, character=f"Character {i}", order=i) for i in range(CAST_SIZE)],
+        "crew": [_person(CAST_SIZE + i, department="Crew", job=JOBS[i % len(JOBS)]) for i in range(CREW_SIZE)],
+    }
+    return json.dumps(details, ensure_ascii=False).encode("utf-8")
+
+
+def filmography_payload() -> bytes:
+    return json.dumps({
+        "id": 500,
+        "cast": [_movie(i, character=f"Character {i}", order=i % 20) for i in range(FILMOGRAPHY_CAST)],
+        "crew": [_movie(1000 + i, department="Production", job="Producer") for i in range(FILMOGRAPHY_CREW)],
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def _cpu_ms(fn, raw, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        fn(raw)
+    return (time.process_time() - started) * 1000 / repeat
+
+
+def _retained_bytes(fn, raw):
+    """📌 디코딩 결과를 캐시에 보관한다고 보고, 남는 객체의 메모리 크기를 측정"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = fn(raw)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+
+def main(repeat=300):
+    print(f"orjson 사용: {'예' if json_projection.orjson is not None else '아니오 (표준 json)'}  반복 {repeat}회")
+    for name, raw in (("movie_details", movie_details_payload()), ("filmography", filmography_payload())):
+        projector = json_projection.compile_schema(tmdb_client.PROJECTIONS[name])
+        variants = {
+            "json 전체 디코딩": json.loads,
+            "고속 파서 전체 디코딩": json_projection.loads,
+            "고속 파서 + 투영": lambda data: json_projection.loads_projected(data, projector),
+        }
+        print(f"\n[{name}] 원본 응답 {len(raw) / 1024:,.1f} KiB")
+        for label, fn in variants.items():
+            cpu = _cpu_ms(fn, raw, repeat)
+            retained, kept = _retained_bytes(fn, raw)
+            cached = len(json_projection.dumps(kept))
+            print(f"  {label:<14} CPU {cpu:6.3f} ms/건 | 보관 객체 {retained / 1024:8.1f} KiB | "
+                  f"공유 캐시 값 {cached / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
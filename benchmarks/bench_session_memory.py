@@ -0,0 +1,91 @@
+"""
+📌 세션별 메모리 사용량 벤치마크 (원본 TMDb 딕셔너리 vs 압축 MovieRecord)
+
+실행: python -m benchmarks.bench_session_memory [세션 수]
+
+각 세션은 검색 결과(필모그래피 300편)와 홈 화면 5개 섹션(섹션당 20편)을 보관한다고 가정합니다.
+TMDb 응답은 요청마다 새로 파싱되므로 "이전" 방식은 세션마다 별도의 딕셔너리를 가집니다.
+"""
+import json
+import sys
+import tracemalloc
+
+from src import movie_record
+
+FILMOGRAPHY_SIZE = 300
+HOME_SECTIONS = 5
+SECTION_SIZE = 20
+POOL_SIZE = 600   # 세션들이 공통으로 보는 영화 수
+
+
+def _fake_movie(movie_id):
+    """📌 TMDb /person/{id}/movie_credits cast 항목과 같은 모양의 가짜 영화 데이터"""
+    return {
+        "adult": False,
+        "backdrop_path": f"/backdrop{movie_id:07d}abcdefghijklmnop.jpg",
+        "genre_ids": [28, 12, 878][: 1 + movie_id % 3],
+        "id": 100000 + movie_id,
+        "original_language": "en",
+        "original_title": f"Original Title Number {movie_id}",
+        "overview": ("영화 줄거리 설명 문장입니다. " * 12).strip(),
+        "popularity": 12.345 + movie_id,
+        "poster_path": f"/poster{movie_id:07d}abcdefghijklmnop.jpg",
+        "release_date": f"20{10 + movie_id % 15}-0{1 + movie_id % 9}-15",
+        "title": f"번역된 영화 제목 {movie_id}",
+        "video": False,
+        "vote_average": 6.5 + (movie_id % 30) / 10,
+        "vote_count": 1000 + movie_id,
+        "character": f"Character {movie_id}",
+        "credit_id": f"52fe4{movie_id:07d}c3a36847f80ab",
+        "order": movie_id % 40,
+        "directors": [f"감독 {movie_id % 50}"],
+        "cast": [f"배우 {(movie_id + i) % 200}" for i in range(10)],
+    }
+
+
+def _payload():
+    """📌 한 세션이 받는 TMDb 응답을 JSON 바이트로 직렬화 (세션마다 새로 파싱하기 위함)"""
+    filmography = [_fake_movie(i % POOL_SIZE) for i in range(FILMOGRAPHY_SIZE)]
+    home = [[_fake_movie((s * SECTION_SIZE + i) % POOL_SIZE) for i in range(SECTION_SIZE)]
+            for s in range(HOME_SECTIONS)]
+    return json.dumps({"filmography": filmography, "home": home}).encode("utf-8")
+
+
+def _measure(build_session, sessions):
+    """📌 sessions 개의 세션 상태를 만들고 tracemalloc으로 증가량 측정"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [build_session() for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(states) == sessions
+    return after - before
+
+
+def main(sessions=50):
+    raw = _payload()
+
+    def session_before():
+        data = json.loads(raw)
+        # 기존 코드: search_results에 원본 딕셔너리를 그대로 저장
+        return {"search_results": data["filmography"], "home": data["home"]}
+
+    def session_after():
+        data = json.loads(raw)
+        # 변경 후: 압축 레코드(프로세스 공유)만 보관하고 원본은 버림
+        return {
+            "search_results": movie_record.records_from_tmdb(data["filmography"]),
+            "home": tuple(tuple(r.id for r in movie_record.records_from_tmdb(section))
+                          for section in data["home"]),
+        }
+
+    before = _measure(session_before, sessions)
+    after = _measure(session_after, sessions)
+    print(f"세션 수: {sessions} (세션당 필모그래피 {FILMOGRAPHY_SIZE}편 + 홈 {HOME_SECTIONS}x{SECTION_SIZE}편)")
+    print(f"이전 (원본 dict): 총 {before / 1024:,.1f} KiB, 세션당 {before / sessions / 1024:,.1f} KiB")
+    print(f"이후 (MovieRecord): 총 {after / 1024:,.1f} KiB, 세션당 {after / sessions / 1024:,.1f} KiB")
+    print(f"감소율: {(1 - after / before) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
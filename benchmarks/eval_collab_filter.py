@@ -0,0 +1,109 @@
+"""
+📌 협업 필터링 추천기 오프라인 평가 (precision@k, hit rate, 서빙 지연 시간)
+
+실행:
+    python -m benchmarks.eval_collab_filter                 # data/ 의 실제 프로필 사용
+    python -m benchmarks.eval_collab_filter --synthetic 2000  # 취향 군집이 있는 가상 프로필 사용
+
+평가 방식: 영화가 2편 이상인 사용자마다 1편을 숨기고(leave-one-out) 나머지로 학습한 뒤,
+숨긴 영화가 top-k에 들어오는지 확인합니다. 인기순 추천을 기준선으로 함께 출력합니다.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+from src import collab_filter
+
+
+def synthetic_profiles(users: int, clusters: int = 20, items_per_cluster: int = 60, seed: int = 7):
+    """📌 군집별로 선호 영화가 겹치는 가상 프로필 생성"""
+    rng = random.Random(seed)
+    profiles = {}
+    for u in range(users):
+        cluster = rng.randrange(clusters)
+        pool = [f"영화 {cluster}-{i}" for i in range(items_per_cluster)]
+        noise = [f"영화 {rng.randrange(clusters)}-{rng.randrange(items_per_cluster)}" for _ in range(2)]
+        watched = rng.sample(pool, rng.randint(4, 12)) + noise
+        profiles[f"guest_{u}"] = {"watched_movies": watched, "favorite_movies": watched[:2]}
+    return profiles
+
+
+def split_leave_one_out(profiles, seed: int = 1):
+    """📌 사용자마다 영화 1편을 평가용으로 숨김"""
+    rng = random.Random(seed)
+    train, held_out = {}, {}
+    for user, profile in profiles.items():
+        titles = list(collab_filter.profile_weights(profile))
+        if len(titles) < 2:
+            train[user] = profile
+            continue
+        hidden = rng.choice(titles)
+        held_out[user] = hidden
+        train[user] = {
+            "watched_movies": [t for t in profile.get("watched_movies", []) if t != hidden],
+            "favorite_movies": [t for t in profile.get("favorite_movies", []) if t != hidden],
+        }
+    return train, held_out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synthetic", type=int, default=0, help="가상 사용자 수 (0이면 data/ 프로필 사용)")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = synthetic_profiles(args.synthetic) if args.synthetic else collab_filter.load_profiles()
+    train_profiles, held_out = split_leave_one_out(profiles)
+    if not held_out:
+        print("평가할 수 있는 프로필(영화 2편 이상)이 없습니다. --synthetic 옵션을 사용해 보세요.")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_dir = os.path.join(tmp, "profiles")
+        os.makedirs(profile_dir)
+        collab_filter.MODEL_DIR = os.path.join(tmp, "model")
+        for user, profile in train_profiles.items():
+            with open(os.path.join(profile_dir, f"{user}.json"), "w", encoding="utf-8") as f:
+                json.dump(profile, f, ensure_ascii=False)
+
+        started = time.perf_counter()
+        collab_filter.train_and_publish(profile_dir, collab_filter.MODEL_DIR)
+        train_seconds = time.perf_counter() - started
+
+        popularity = Counter(t for p in train_profiles.values() for t in collab_filter.profile_weights(p))
+        hits = pop_hits = 0
+        latencies = []
+        for user, hidden in held_out.items():
+            profile = train_profiles[user]
+            started = time.perf_counter()
+            recs = [title for title, _ in collab_filter.recommend(profile, k=args.k, user_key=user)]
+            latencies.append((time.perf_counter() - started) * 1000)
+            hits += hidden in recs
+
+            seen = set(collab_filter.profile_weights(profile))
+            popular = [t for t, _ in popularity.most_common(args.k + len(seen)) if t not in seen][:args.k]
+            pop_hits += hidden in popular
+
+        # 새 프로필(fold-in) 경로 지연 시간
+        fold_in = []
+        for user in list(held_out)[:200]:
+            started = time.perf_counter()
+            collab_filter.recommend(train_profiles[user], k=args.k)
+            fold_in.append((time.perf_counter() - started) * 1000)
+
+    n = len(held_out)
+    print(f"사용자 {len(profiles)}명, 평가 대상 {n}명, 학습 {train_seconds:.2f}초")
+    print(f"ALS      precision@{args.k}: {hits / n / args.k:.4f}  hit rate@{args.k}: {hits / n:.3f}")
+    print(f"인기순   precision@{args.k}: {pop_hits / n / args.k:.4f}  hit rate@{args.k}: {pop_hits / n:.3f}")
+    print(f"서빙 지연 (저장된 사용자 벡터): p50 {np.percentile(latencies, 50):.3f}ms, p95 {np.percentile(latencies, 95):.3f}ms")
+    print(f"서빙 지연 (fold-in):            p50 {np.percentile(fold_in, 50):.3f}ms, p95 {np.percentile(fold_in, 95):.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
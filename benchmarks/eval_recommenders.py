@@ -0,0 +1,338 @@
+"""
+📌 추천 전략 오프라인 평가와 지연 벤치마크 (precision/recall/NDCG@k, 커버리지, 다양성, 지연, 원본 요청 수)
+
+실행 (Streamlit secrets가 있는 위치에서):
+    python -m benchmarks.eval_recommenders                          # 가상 사용자 100명
+    python -m benchmarks.eval_recommenders --users 300 --spike-rate 0.03
+    python -m benchmarks.eval_recommenders --profiles data --events data/events   # 저장된 프로필/이벤트 로그 재생
+    python -m benchmarks.eval_recommenders --compare data/eval_reports/recommenders-20261019T120000.json
+
+TMDb는 로컬 대역 서버(benchmarks.tmdb_standin)가 가상 카탈로그로 대신 응답합니다.
+사용자마다 프로필과 이벤트 로그(검색어, 영화 열기)를 재생해 전략별로 추천을 받고,
+- 정답: 이벤트 로그에서 사용자가 연 영화 (이벤트의 user = event_log.track이 붙이는 프로필 키로 프로필과 연결)
+- 전략: 맞춤 추천(get_personalized_recommendations), 무드 추천(get_mood_based_recommendations),
+        검색어 추천(show_generated_recommendations의 검색 키워드 카테고리), 인기순(기준선)
+- precision/recall/NDCG@k, 카탈로그 커버리지, 목록 내 다양성(장르 자카드 거리 평균),
+  호출당 p50/p95 지연, 대역 서버가 받은 원본 요청 수
+를 계산해 JSON 보고서로 저장합니다. --compare를 주면 이전 보고서와의 차이를 함께 출력합니다.
+가상 사용자는 대역 카탈로그에서 만들므로 정답이 의미가 있습니다. 저장된 로그는 실제 TMDb ID를 담고 있어
+대역 카탈로그와 맞지 않으므로 지연/요청 수 비교용으로 보면 됩니다.
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from benchmarks import tmdb_standin
+from src import collab_filter, event_log, hot_lists, movie_recommend, rec_stream, shared_cache, tmdb_client
+from src.genre_map import GENRE_MAP, MOOD_TO_GENRE
+
+REPORT_DIR = "data/eval_reports"
+HISTORY_SIZE = 4             # 가상 사용자: 프로필(본 영화/좋아하는 영화)에 넣는 영화 수
+OPENS_PER_USER = (8, 16)     # 가상 사용자: 정답으로 쓰는 열기 이벤트 수 범위
+KEYWORD_OPENS = 3            # 가상 사용자: 그중 검색어가 제목에 들어간 영화 수
+SETTLE_TIMEOUT = 120         # 백그라운드 스냅샷 첫 갱신을 기다리는 최대 시간 (초)
+
+
+class Case(NamedTuple):
+    """📌 재생할 사용자 한 명 (프로필, 마지막 검색어, 정답 영화 ID)"""
+    user: str
+    profile: Dict
+    query: Optional[str]
+    relevant: frozenset
+
+
+# ---------------- 데이터 준비 ----------------
+def _weighted_sample(rng: random.Random, movies: List[Dict], k: int) -> List[Dict]:
+    """📌 인기도에 비례한 비복원 추출"""
+    keyed = sorted(movies, key=lambda m: rng.random() ** (1.0 / m["popularity"]), reverse=True)
+    return keyed[:k]
+
+
+def synthetic_dataset(users: int, profile_dir: str, events_dir: str, seed: int = 7):
+    """
+    📌 대역 카탈로그 기준으로 취향(장르/무드/검색어)이 있는 가상 사용자의 프로필 파일과 이벤트 로그를 기록
+    이벤트는 앱과 같은 event_log 경로로 기록하므로 재생 단계는 저장된 로그와 똑같이 읽습니다.
+    """
+    rng = random.Random(seed)
+    movies = list(tmdb_standin.catalog().values())
+    event_log.EVENT_LOG_DIR = events_dir
+    for u in range(users):
+        user = f"guest_{u}"
+        taste = rng.sample(list(GENRE_MAP), rng.randint(1, 3))
+        taste_ids = {GENRE_MAP[g] for g in taste}
+        mood = rng.choice([m for m, ids in MOOD_TO_GENRE.items() if taste_ids & set(ids)] or list(MOOD_TO_GENRE))
+        word = rng.choice(tmdb_standin.TITLE_WORDS)
+        liked = taste_ids | set(MOOD_TO_GENRE[mood])
+        pool = [m for m in movies if liked & set(m["genre_ids"])]
+
+        picks = _weighted_sample(rng, pool, HISTORY_SIZE + rng.randint(*OPENS_PER_USER))
+        picked = {m["id"] for m in picks}
+        picks += _weighted_sample(rng, [m for m in movies if word in m["title"] and m["id"] not in picked], KEYWORD_OPENS)
+        history, opened = picks[:HISTORY_SIZE], picks[HISTORY_SIZE:]
+        profile = {
+            "watched_movies": [m["title"] for m in history[1:]],
+            "favorite_movies": [history[0]["title"]],
+            "preferred_genres": taste,
+            "preferred_styles": [mood],
+        }
+        with open(os.path.join(profile_dir, f"{user}.json"), "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False)
+
+        # 앱(event_log.track)과 같은 모양: 세션은 무작위 ID, user는 프로필 키
+        session = f"{rng.getrandbits(64):016x}"
+        event_log.record("search", session=session, user=user, surface="search", query=word, results=KEYWORD_OPENS)
+        for position, movie in enumerate(opened):
+            event_log.record("open", session=session, user=user, surface="home", section="replay",
+                             movie_id=movie["id"], position=position)
+        if len(event_log._buffer) >= event_log.RING_SIZE // 2:
+            event_log.flush()
+    event_log.flush(final=True)
+
+
+def load_cases(profile_dir: str, events_dir: str) -> List[Case]:
+    """📌 프로필과 이벤트 로그를 사용자(프로필 키)별로 묶어 재생할 사례 목록을 만듦 (연 영화가 없는 사용자는 제외)"""
+    opened, queries = defaultdict(set), {}
+    for event in event_log.iter_events(directory=events_dir):
+        user = event.get("user")
+        if event.get("event") == "open" and event.get("movie_id"):
+            opened[user].add(event["movie_id"])
+        elif event.get("event") == "search" and event.get("query"):
+            queries[user] = event["query"]
+    return [Case(user, profile, queries.get(user), frozenset(opened[user]))
+            for user, profile in collab_filter.load_profiles(profile_dir).items() if opened.get(user)]
+
+
+# ---------------- 추천 전략 ----------------
+def _ids(movies: List[Dict]) -> List[int]:
+    return [m["id"] for m in movies if m and m.get("id")]
+
+
+def _personalized(case: Case) -> List[int]:
+    return _ids(movie_recommend.get_personalized_recommendations(case.profile))
+
+
+def _mood(case: Case) -> List[int]:
+    styles = case.profile.get("preferred_styles") or [""]
+    return _ids(movie_recommend.get_mood_based_recommendations(styles[0]))
+
+
+def _keyword(case: Case) -> Optional[List[int]]:
+    if not case.query:
+        return None
+    job = dict(rec_stream._plan({}, case.query))["검색 키워드 기반 추천"]
+    events = rec_stream._EventQueue(maxsize=0)
+    movies = job(events)
+    while not movies and not events.queue.empty():
+        name, data = events.queue.get_nowait()  # 검색 결과가 없을 때 내보내는 대체 카테고리
+        if name == "category":
+            movies = data["movies"]
+    return _ids(movies)
+
+
+def _popular(case: Case) -> List[int]:
+    seen = set(case.profile.get("watched_movies") or []) | set(case.profile.get("favorite_movies") or [])
+    return [record.id for record in hot_lists.get_snapshot("popular") if record.title not in seen]
+
+
+STRATEGIES: Dict[str, Callable[[Case], Optional[List[int]]]] = {
+    "personalized": _personalized,
+    "mood": _mood,
+    "keyword": _keyword,
+    "popular": _popular,
+}
+
+
+# ---------------- 지표 ----------------
+def _ndcg(recs: List[int], relevant: frozenset, k: int) -> float:
+    dcg = sum(1.0 / math.log2(i + 2) for i, movie_id in enumerate(recs[:k]) if movie_id in relevant)
+    ideal = sum(1.0 / math.log2(i + 2) for i in range(min(k, len(relevant))))
+    return dcg / ideal if ideal else 0.0
+
+
+def _diversity(recs: List[int]) -> Optional[float]:
+    """📌 목록 안 영화 쌍의 장르 자카드 거리 평균 (대역 카탈로그에 있는 영화만)"""
+    movies = tmdb_standin.catalog()
+    genres = [set(movies[m]["genre_ids"]) for m in recs if m in movies]
+    pairs = [(a, b) for i, a in enumerate(genres) for b in genres[i + 1:]]
+    if not pairs:
+        return None
+    return sum(1 - len(a & b) / len(a | b) for a, b in pairs) / len(pairs)
+
+
+def _mean(values) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(float(np.mean(values)), 4) if values else None
+
+
+def evaluate(name: str, strategy: Callable, cases: List[Case], k: int, server) -> Dict:
+    """📌 전략 하나를 모든 사용자에 대해 실행하고 지표를 계산 (전략마다 빈 캐시에서 시작)"""
+    shared_cache.set_cache(shared_cache.MemoryCache())
+    tmdb_client._breakers.clear()
+    with server.calls_lock:
+        before = Counter(server.calls)
+
+    latencies, precision, recall, ndcg, diversity, lengths = [], [], [], [], [], []
+    recommended, skipped, errors = set(), 0, 0
+    for case in cases:
+        started = time.perf_counter()
+        try:
+            recs = strategy(case)
+        except Exception as e:
+            errors += 1
+            print(f"Error running {name} for {case.user}: {e}")
+            continue
+        if recs is None:
+            skipped += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+        recs = list(dict.fromkeys(recs))[:k]
+        hits = sum(movie_id in case.relevant for movie_id in recs)
+        precision.append(hits / k)
+        recall.append(hits / len(case.relevant))
+        ndcg.append(_ndcg(recs, case.relevant, k))
+        diversity.append(_diversity(recs))
+        lengths.append(len(recs))
+        recommended.update(recs)
+
+    with server.calls_lock:
+        calls = Counter(server.calls)
+    calls.subtract(before)
+    calls = {path: count for path, count in calls.most_common() if count > 0}
+    total_calls = sum(calls.values())
+    return {
+        "users": len(latencies), "skipped": skipped, "errors": errors,
+        "precision": _mean(precision), "recall": _mean(recall), "ndcg": _mean(ndcg),
+        "coverage": round(len(recommended) / len(tmdb_standin.catalog()), 4),
+        "diversity": _mean(diversity), "avg_length": _mean(lengths),
+        "latency_ms": {
+            "p50": round(float(np.percentile(latencies, 50)), 2) if latencies else None,
+            "p95": round(float(np.percentile(latencies, 95)), 2) if latencies else None,
+        },
+        "upstream_calls": {
+            "total": total_calls,
+            "per_user": round(total_calls / len(latencies), 2) if latencies else None,
+            "by_path": calls,
+        },
+    }
+
+
+# ---------------- 보고서 ----------------
+def _flatten(metrics: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in metrics.items():
+        if key == "by_path":
+            continue
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def print_report(report: Dict, previous: Optional[Dict] = None):
+    k = report["config"]["k"]
+    print(f"\n{'전략':<14}{'P@' + str(k):>8}{'R@' + str(k):>8}{'NDCG@' + str(k):>10}{'커버리지':>8}{'다양성':>8}"
+          f"{'p50(ms)':>10}{'p95(ms)':>10}{'요청/사용자':>10}")
+    fmt = lambda v, spec: "-" if v is None else format(v, spec)
+    for name, m in report["strategies"].items():
+        print(f"{name:<14}{fmt(m['precision'], '8.4f')}{fmt(m['recall'], '8.4f')}{fmt(m['ndcg'], '10.4f')}"
+              f"{fmt(m['coverage'], '10.4f')}{fmt(m['diversity'], '9.3f')}"
+              f"{fmt(m['latency_ms']['p50'], '10.1f')}{fmt(m['latency_ms']['p95'], '10.1f')}"
+              f"{fmt(m['upstream_calls']['per_user'], '12.1f')}")
+    if not previous:
+        return
+    print(f"\n이전 보고서({previous.get('created_at')})와 비교:")
+    for name, metrics in report["strategies"].items():
+        old = _flatten(previous.get("strategies", {}).get(name, {}))
+        for key, value in _flatten(metrics).items():
+            if old.get(key) is not None and old[key] != value:
+                print(f"  {name:<14}{key:<26}{old[key]:>10} → {value:<10} ({value - old[key]:+.4g})")
+
+
+# ---------------- 실행 ----------------
+def _settle_hot_lists():
+    """📌 백그라운드 스냅샷의 첫 갱신이 끝날 때까지 대기 (측정 중에 갱신 요청이 섞이지 않도록)"""
+    hot_lists.start()
+    deadline = time.time() + SETTLE_TIMEOUT
+    while time.time() < deadline:
+        if all(s["size"] and s["next_refresh_in"] > 0 for s in hot_lists.snapshot_status().values()):
+            return
+        time.sleep(0.2)
+    print("백그라운드 스냅샷이 준비되지 않은 채로 측정합니다.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="추천 전략 오프라인 평가와 지연 벤치마크")
+    parser.add_argument("--users", type=int, default=100, help="가상 사용자 수 (--profiles가 없을 때)")
+    parser.add_argument("--profiles", help="재생할 프로필 디렉터리 (예: data)")
+    parser.add_argument("--events", default=event_log.EVENT_LOG_DIR, help="재생할 이벤트 로그 디렉터리")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="쉼표로 구분한 전략 이름")
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--spike-rate", type=float, default=0.0, help="대역 서버 지연 스파이크 확률")
+    parser.add_argument("--out", help="보고서 경로 (기본: data/eval_reports/recommenders-<시각>.json)")
+    parser.add_argument("--compare", help="비교할 이전 보고서 경로")
+    args = parser.parse_args(argv)
+
+    server = tmdb_standin.serve(spike_rate=args.spike_rate)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    tmdb_client.BASE_URL = movie_recommend.BASE_URL = base_url
+    tmdb_client.API_KEY = tmdb_client.API_KEY or "standin"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.profiles:
+            cases = load_cases(args.profiles, args.events)
+        else:
+            profile_dir, events_dir = os.path.join(tmp, "profiles"), os.path.join(tmp, "events")
+            os.makedirs(profile_dir)
+            synthetic_dataset(args.users, profile_dir, events_dir, args.seed)
+            cases = load_cases(profile_dir, events_dir)
+    if not cases:
+        print("평가할 사용자(프로필과 영화 열기 이벤트가 함께 있는)가 없습니다. --profiles 없이 가상 사용자로 실행해 보세요.")
+        if args.profiles:
+            # 사용자 키(user)가 없는 이전 로그는 프로필과 연결할 수 없음
+            users = {event.get("user") for event in event_log.iter_events(directory=args.events)}
+            print(f"  프로필 {len(collab_filter.load_profiles(args.profiles))}개, "
+                  f"이벤트의 사용자 키 {len(users - {None})}개 (사용자 키 없는 이벤트 {'있음' if None in users else '없음'})")
+        server.shutdown()
+        raise SystemExit(1)
+
+    _settle_hot_lists()
+    names = [name.strip() for name in args.strategies.split(",") if name.strip()]
+    print(f"사용자 {len(cases)}명, 전략 {len(names)}개, 대역 카탈로그 {len(tmdb_standin.catalog())}편, "
+          f"지연 스파이크 {args.spike_rate:.0%}")
+    report = {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "config": {"k": args.k, "users": len(cases), "seed": args.seed, "source": args.profiles or "synthetic",
+                   "spike_rate": args.spike_rate, "catalog_size": len(tmdb_standin.catalog())},
+        "strategies": {},
+    }
+    for name in names:
+        started = time.time()
+        report["strategies"][name] = evaluate(name, STRATEGIES[name], cases, args.k, server)
+        print(f"  {name}: {time.time() - started:.1f}초")
+    server.shutdown()
+
+    out = args.out or os.path.join(REPORT_DIR, f"recommenders-{datetime.datetime.now():%Y%m%dT%H%M%S}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+    print_report(report, previous)
+    print(f"\n보고서 저장: {out}")
+
+
+if __name__ == "__main__":
+    main()
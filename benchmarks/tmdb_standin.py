@@ -0,0 +1,172 @@
+"""
+📌 벤치마크/오프라인 평가용 로컬 TMDb 대역(stand-in) 서버 (가상 카탈로그, 지연 스파이크 주입)
+
+실행: python -m benchmarks.tmdb_standin [포트]
+      TMDB_BASE_URL=http://127.0.0.1:<포트> 로 앱/벤치마크를 이 서버에 연결합니다.
+
+- 시드로 고정된 가상 카탈로그(CATALOG_SIZE편, 장르/인기도/제목 단어)를 만들어 응답합니다.
+- /movie/{id}: 상세 정보 (append_to_response=credits이면 출연진/스태프 포함, 카탈로그 밖 ID도 응답)
+- /discover/movie: with_genres(쉼표=모두 포함, |=하나 이상) 조건의 인기순 목록
+- /search/movie: 제목에 query가 들어간 인기순 목록
+- /trending/..., /movie/popular 등 목록: 카탈로그 인기순 목록 (페이지당 20편)
+- /genre/movie/list: 장르 목록, 그 밖의 경로: 빈 목록 응답 {"page": 1, "results": []}
+- 요청마다 기본 지연을 주고, spike_rate 확률로 spike_latency만큼 더 늦게 응답합니다.
+  스파이크는 요청 단위로 무작위이므로 같은 요청을 다시 보내면 대개 빠르게 돌아옵니다.
+- server.calls에 경로별(숫자 ID는 {id}로 묶음) 요청 수를 셉니다.
+"""
+import functools
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+BASE_LATENCY = (0.004, 0.012)   # 평소 응답 지연 범위 (초)
+SPIKE_RATE = 0.03               # 지연 스파이크 확률
+SPIKE_LATENCY = 0.3             # 스파이크 때 추가되는 지연 (초)
+CATALOG_SIZE = 3000             # 가상 카탈로그 영화 수 (ID 1..CATALOG_SIZE)
+CATALOG_SEED = 42
+PAGE_SIZE = 20
+_MOVIE_PATH = re.compile(r"^/movie/(\d+)$")
+_LIST_PATHS = {"/movie/popular", "/movie/now_playing", "/movie/top_rated", "/movie/upcoming"}
+
+GENRES = {
+    28: "액션", 12: "모험", 16: "애니메이션", 35: "코미디", 80: "범죄", 99: "다큐멘터리", 18: "드라마",
+    10751: "가족", 14: "판타지", 36: "역사", 27: "공포", 10402: "음악", 9648: "미스터리", 10749: "로맨스",
+    878: "SF", 10770: "TV 영화", 53: "스릴러", 10752: "전쟁", 37: "서부",
+}
+TITLE_WORDS = ("사랑", "전쟁", "우주", "바다", "기억", "도시", "여름", "겨울", "비밀", "친구",
+               "가족", "복수", "꿈", "밤", "불꽃", "섬", "열차", "유령", "왕국", "거울")
+
+
+# ---------------- 가상 카탈로그 ----------------
+@functools.lru_cache(maxsize=None)
+def catalog(size: int = CATALOG_SIZE, seed: int = CATALOG_SEED) -> Dict[int, dict]:
+    """📌 시드로 고정된 가상 카탈로그 (영화 ID → 목록용 요약) - 오프라인 평가가 정답 데이터를 만들 때도 사용"""
+    rng = random.Random(seed)
+    movies = {}
+    for movie_id in range(1, size + 1):
+        word = rng.choice(TITLE_WORDS)
+        movies[movie_id] = {
+            "id": movie_id, "title": f"{word}의 {movie_id}", "original_title": f"Stand-in Movie {movie_id}",
+            "overview": "로컬 대역 서버가 만든 줄거리입니다.",
+            "release_date": f"{rng.randint(1980, 2025)}-{rng.randint(1, 12):02d}-01",
+            "vote_average": round(rng.uniform(4.0, 9.0), 1), "vote_count": rng.randint(10, 20000),
+            "popularity": round(rng.paretovariate(1.2) * 10, 3),
+            "poster_path": f"/poster{movie_id}.jpg", "genre_ids": rng.sample(list(GENRES), rng.choice((1, 2, 2, 3))),
+        }
+    return movies
+
+
+@functools.lru_cache(maxsize=None)
+def _by_popularity() -> List[dict]:
+    return sorted(catalog().values(), key=lambda m: -m["popularity"])
+
+
+def _matches_genres(movie: dict, with_genres: str) -> bool:
+    if "|" in with_genres:
+        return any(int(g) in movie["genre_ids"] for g in with_genres.split("|") if g)
+    return all(int(g) in movie["genre_ids"] for g in with_genres.split(",") if g)
+
+
+def _page(movies: List[dict], query: dict) -> dict:
+    page = max(1, int(query.get("page", ["1"])[0]))
+    start = (page - 1) * PAGE_SIZE
+    return {"page": page, "results": movies[start:start + PAGE_SIZE],
+            "total_pages": max(1, -(-len(movies) // PAGE_SIZE)), "total_results": len(movies)}
+
+
+def movie_payload(movie_id: int, with_credits: bool) -> dict:
+    summary = catalog().get(movie_id)
+    if summary is not None:
+        movie = {k: v for k, v in summary.items() if k != "genre_ids"}
+        movie["genres"] = [{"id": g, "name": GENRES[g]} for g in summary["genre_ids"]]
+    else:
+        movie = {
+            "id": movie_id, "title": f"대역 영화 {movie_id}", "original_title": f"Stand-in Movie {movie_id}",
+            "overview": "로컬 대역 서버가 만든 줄거리입니다.", "release_date": "2020-01-01",
+            "vote_average": 7.0, "vote_count": 100, "popularity": 10.0,
+            "poster_path": f"/poster{movie_id}.jpg", "genres": [{"id": 28, "name": "액션"}],
+        }
+    if with_credits:
+        movie["credits"] = {
+            "cast": [{"id": i, "name": f"배우 {i}", "character": f"역할 {i}", "order": i} for i in range(20)],
+            "crew": [{"id": 100 + i, "name": f"스태프 {i}", "job": "Director" if i == 0 else "Producer"}
+                     for i in range(20)],
+        }
+    return movie
+
+
+def response_body(path: str, query: dict) -> dict:
+    """📌 경로와 쿼리에 맞는 TMDb 형식 응답"""
+    match = _MOVIE_PATH.match(path)
+    if match:
+        return movie_payload(int(match.group(1)), "credits" in query.get("append_to_response", [""])[0])
+    if path == "/discover/movie":
+        with_genres = query.get("with_genres", [""])[0]
+        return _page([m for m in _by_popularity() if _matches_genres(m, with_genres)], query)
+    if path == "/search/movie":
+        text = query.get("query", [""])[0].strip()
+        return _page([m for m in _by_popularity() if text and text in m["title"]], query)
+    if path.startswith("/trending/") or path in _LIST_PATHS:
+        return _page(_by_popularity(), query)
+    if path == "/genre/movie/list":
+        return {"genres": [{"id": g, "name": name} for g, name in GENRES.items()]}
+    return {"page": 1, "results": []}
+
+
+# ---------------- HTTP 서버 ----------------
+class StandinHandler(BaseHTTPRequestHandler):
+    base_latency = BASE_LATENCY
+    spike_rate = SPIKE_RATE
+    spike_latency = SPIKE_LATENCY
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        delay = random.uniform(*self.base_latency)
+        if random.random() < self.spike_rate:
+            delay += self.spike_latency
+        time.sleep(delay)
+
+        path = url.path[3:] if url.path.startswith("/3/") else url.path
+        with self.server.calls_lock:
+            self.server.calls[re.sub(r"/\d+", "/{id}", path)] += 1
+        data = json.dumps(response_body(path, parse_qs(url.query)), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 벤치마크 출력이 섞이지 않도록 접근 로그 생략
+
+
+def serve(port: int = 0, spike_rate: float = SPIKE_RATE, spike_latency: float = SPIKE_LATENCY,
+          base_latency=BASE_LATENCY) -> ThreadingHTTPServer:
+    """📌 백그라운드 스레드에서 대역 서버를 띄우고 반환 (port=0이면 빈 포트 사용, server.server_port로 확인)"""
+    handler = type("ConfiguredStandinHandler", (StandinHandler,),
+                   {"spike_rate": spike_rate, "spike_latency": spike_latency, "base_latency": base_latency})
+    server_class = type("StandinServer", (ThreadingHTTPServer,), {"request_queue_size": 128})  # 기본 5는 동시 접속 시 SYN 재전송(1초) 유발
+    server = server_class(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.calls = Counter()
+    server.calls_lock = threading.Lock()
+    catalog()  # 첫 요청 지연에 카탈로그 생성 시간이 섞이지 않도록 미리 만듦
+    threading.Thread(target=server.serve_forever, name="tmdb-standin", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    server = serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"TMDb 대역 서버: http://127.0.0.1:{server.server_port} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,227 @@
+"""
+📌 계정별 즐겨찾기/보고 싶은 영화 목록 캐시
+
+- 처음 읽을 때 1페이지로 전체 페이지 수를 확인한 뒤 나머지 페이지를 동시에 가져옵니다.
+- 목록 변경은 로컬 목록에 먼저 반영(낙관적 write-through)하고, TMDb 요청이 실패하면 되돌립니다.
+- 오래된 목록은 화면을 막지 않고 백그라운드에서 sort_by=created_at.desc 순으로 새 항목만 가져옵니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from src import tmdb_client
+from src.movie_record import MovieRecord, from_tmdb, get_record, records_from_tmdb
+
+# ---------------- 목록 캐시 설정 ----------------
+CATEGORIES = ("favorite", "watchlist")
+REFRESH_INTERVAL = 5 * 60          # 새 항목 확인 주기 (초)
+FULL_RELOAD_INTERVAL = 60 * 60     # 다른 기기에서 삭제한 항목까지 반영하는 전체 재조회 주기 (초)
+MAX_LISTS = 1000                   # 프로세스에 보관하는 (계정, 목록) 수 상한
+MAX_ACCOUNT_IDS = 10000            # 프로세스에 보관하는 세션 → 계정 ID 수 상한
+ACCOUNT_MISS_TTL = 60              # 게스트 세션/조회 실패 결과를 다시 쓰는 시간 (초)
+
+# (계정 ID, 목록 종류) → {"records", "loaded_at", "full_at", "version", "refreshing"}
+# records는 불변 튜플로 통째로 교체하므로 읽는 쪽은 잠금이 필요 없습니다.
+_lists: "OrderedDict[Tuple[int, str], Dict]" = OrderedDict()
+# 세션 ID → (계정 ID 또는 None, 만료 시각 또는 None). 계정 ID는 세션 동안 바뀌지 않으므로 만료 없음
+_account_ids: "OrderedDict[str, Tuple[Optional[int], Optional[float]]]" = OrderedDict()
+_lock = threading.Lock()
+
+
+# ---------------- 계정 정보 ----------------
+def get_account_id(session_id: str) -> Optional[int]:
+    """📌 세션 ID로 TMDb 계정 ID 조회 (게스트 세션이거나 실패하면 None, 결과는 세션별로 재사용)"""
+    if not session_id:
+        return None
+    now = time.time()
+    with _lock:
+        cached = _account_ids.get(session_id)
+        if cached and (cached[1] is None or cached[1] > now):
+            _account_ids.move_to_end(session_id)
+            return cached[0]
+    try:
+        account = tmdb_client.get_json("/account", {"session_id": session_id}, cache_ttl=0)
+        account_id = account.get("id")
+    except Exception as e:
+        print(f"Error fetching account: {e}")
+        account_id = None
+    # 게스트 세션과 실패는 짧게만 기억해 렌더링마다 /account를 다시 요청하지 않도록
+    expires = None if account_id else now + ACCOUNT_MISS_TTL
+    with _lock:
+        _account_ids[session_id] = (account_id, expires)
+        _account_ids.move_to_end(session_id)
+        while len(_account_ids) > MAX_ACCOUNT_IDS:
+            _account_ids.popitem(last=False)
+    return account_id
+
+
+def _list_path(account_id: int, category: str) -> str:
+    return f"/account/{account_id}/{category}/movies"
+
+
+def _page_params(session_id: str, page: int) -> Dict:
+    return {"session_id": session_id, "language": tmdb_client.LANGUAGE, "sort_by": "created_at.desc", "page": page}
+
+
+# ---------------- 목록 조회 ----------------
+def _fetch_all(account_id: int, session_id: str, category: str) -> Tuple[MovieRecord, ...]:
+    """📌 1페이지로 전체 페이지 수를 확인하고 나머지 페이지를 한 번에 병렬 요청 (최근 추가순)"""
+    path = _list_path(account_id, category)
+    first = tmdb_client.get_json(path, _page_params(session_id, 1), cache_ttl=0)
+    pages = [first]
+    total_pages = first.get("total_pages") or 1
+    if total_pages > 1:
+        rest = tmdb_client.get_many_json(
+            [(path, _page_params(session_id, page)) for page in range(2, total_pages + 1)], cache_ttl=0)
+        for result in rest:
+            if isinstance(result, Exception):
+                raise result
+        pages.extend(rest)
+    return records_from_tmdb(movie for data in pages for movie in data.get("results", []))
+
+
+def _fetch_new(account_id: int, session_id: str, category: str, known_ids: set) -> Tuple[MovieRecord, ...]:
+    """📌 최근 추가순으로 페이지를 넘기다 이미 아는 영화가 나오면 멈춤 (새로 추가된 항목만 반환)"""
+    path = _list_path(account_id, category)
+    new_movies = []
+    page = total_pages = 1
+    while page <= total_pages:
+        data = tmdb_client.get_json(path, _page_params(session_id, page), cache_ttl=0)
+        total_pages = data.get("total_pages") or 1
+        for movie in data.get("results", []):
+            if movie.get("id") in known_ids:
+                return records_from_tmdb(new_movies)
+            new_movies.append(movie)
+        page += 1
+    return records_from_tmdb(new_movies)
+
+
+def _store(key: Tuple[int, str], records: Tuple[MovieRecord, ...]):
+    now = time.time()
+    with _lock:
+        _lists[key] = {"records": records, "loaded_at": now, "full_at": now, "version": 0, "refreshing": False}
+        _lists.move_to_end(key)
+        while len(_lists) > MAX_LISTS:
+            _lists.popitem(last=False)
+
+
+def _refresh(key: Tuple[int, str], session_id: str):
+    """📌 백그라운드 갱신: 평소에는 새 항목만, FULL_RELOAD_INTERVAL마다 전체를 다시 가져옴"""
+    account_id, category = key
+    entry = _lists.get(key)
+    if entry is None:
+        return
+    version = entry["version"]
+    try:
+        if time.time() - entry["full_at"] >= FULL_RELOAD_INTERVAL:
+            records = _fetch_all(account_id, session_id, category)
+            with _lock:
+                # 재조회 중에 로컬 변경이 있었다면 그 변경을 덮어쓰지 않고 다음 주기에 다시 시도
+                if entry["version"] == version:
+                    entry["records"] = records
+                    entry["full_at"] = time.time()
+        else:
+            new_records = _fetch_new(account_id, session_id, category, {r.id for r in entry["records"]})
+            with _lock:
+                current_ids = {r.id for r in entry["records"]}
+                fresh = tuple(r for r in new_records if r.id not in current_ids)
+                if fresh:
+                    entry["records"] = fresh + entry["records"]
+        entry["loaded_at"] = time.time()
+    except Exception as e:
+        print(f"Error refreshing {category} list: {e}")
+    finally:
+        entry["refreshing"] = False
+
+
+def get_list(session_id: str, category: str = "favorite") -> Tuple[MovieRecord, ...]:
+    """
+    📌 계정의 즐겨찾기/보고 싶은 영화 목록 (최근 추가순)
+    첫 호출만 TMDb를 기다리고, 이후에는 캐시를 바로 반환하면서 오래됐으면 백그라운드로 갱신합니다.
+    """
+    account_id = get_account_id(session_id)
+    if not account_id:
+        return ()
+    key = (account_id, category)
+    entry = _lists.get(key)
+    if entry is None:
+        try:
+            _store(key, _fetch_all(account_id, session_id, category))
+        except Exception as e:
+            print(f"Error fetching {category} list: {e}")
+            return ()
+        return _lists[key]["records"]
+
+    with _lock:
+        start = not entry["refreshing"] and time.time() - entry["loaded_at"] >= REFRESH_INTERVAL
+        if start:
+            entry["refreshing"] = True
+    if start:
+        threading.Thread(target=_refresh, args=(key, session_id), daemon=True, name="account-list-refresh").start()
+    return entry["records"]
+
+
+# ---------------- 목록 변경 (write-through) ----------------
+def _to_record(movie: Union[MovieRecord, Dict, int]) -> Optional[MovieRecord]:
+    if isinstance(movie, MovieRecord):
+        return movie
+    if isinstance(movie, dict):
+        return from_tmdb(movie)
+    record = get_record(movie)
+    if record is None:
+        try:
+            record = tmdb_client.hydrate_movie(movie)
+        except Exception as e:
+            print(f"Error hydrating movie {movie}: {e}")
+    return record
+
+
+def _apply(entry: Dict, movie_id: int, record: Optional[MovieRecord], add: bool, index: int = 0):
+    """📌 로컬 목록에 추가/제거를 반영 (이미 같은 상태면 변경 없음)"""
+    records = entry["records"]
+    ids = [r.id for r in records]
+    if add and movie_id not in ids and record is not None:
+        index = min(index, len(records))
+        entry["records"] = records[:index] + (record,) + records[index:]
+    elif not add and movie_id in ids:
+        entry["records"] = tuple(r for r in records if r.id != movie_id)
+    entry["version"] += 1
+
+
+def set_favorite(session_id: str, movie: Union[MovieRecord, Dict, int], value: bool = True,
+                 category: str = "favorite") -> bool:
+    """
+    📌 영화를 즐겨찾기(또는 보고 싶은 영화)에 추가/제거
+    로컬 목록을 먼저 바꿔 화면에 바로 반영하고, TMDb 요청이 실패하면 원래대로 되돌립니다.
+    """
+    account_id = get_account_id(session_id)
+    if not account_id:
+        return False
+    record = _to_record(movie)
+    movie_id = record.id if record else int(movie["id"] if isinstance(movie, dict) else movie)
+
+    entry = _lists.get((account_id, category))
+    previous_index = None
+    if entry is not None:
+        with _lock:
+            ids = [r.id for r in entry["records"]]
+            previous_index = ids.index(movie_id) if movie_id in ids else None
+            if not value and previous_index is not None:
+                record = entry["records"][previous_index]
+            _apply(entry, movie_id, record, value)
+
+    try:
+        tmdb_client.post_json(f"/account/{account_id}/{category}",
+                              {"media_type": "movie", "media_id": movie_id, category: value},
+                              {"session_id": session_id})
+        return True
+    except Exception as e:
+        print(f"Error updating {category} list: {e}")
+        if entry is not None:
+            with _lock:
+                if value and previous_index is None:
+                    _apply(entry, movie_id, None, False)
+                elif not value and previous_index is not None:
+                    _apply(entry, movie_id, record, True, previous_index)
+        return False
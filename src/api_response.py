@@ -0,0 +1,138 @@
+"""
+📌 Flask 프록시의 JSON 응답 인코딩 (필드 선택, 압축, 인코딩된 바이트 캐시)
+
+jsonify는 요청마다 표준 json으로 다시 인코딩하고 압축 없이 보냅니다. 여기서는
+- json_projection.dumps(orjson 우선)로 인코딩합니다.
+- ?fields=id,title,poster_path 로 결과 항목(results 배열이 있으면 그 항목, 없으면 최상위 객체)의 필드를 고릅니다.
+- Accept-Encoding에 따라 brotli(설치된 경우) 또는 gzip으로 압축합니다. MIN_COMPRESS_SIZE보다 작은 응답은 그대로 보냅니다.
+- cached()로 감싼 응답은 원본 데이터와 함께 (필드 선택, 인코딩)별 완성된 바이트를 보관하므로
+  같은 요청이 다시 오면 직렬화/압축 없이 바로 보냅니다.
+"""
+import functools
+import gzip
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, request
+
+from src.json_projection import compile_schema, dumps
+
+try:
+    import brotli  # 선택 의존성: 같은 JSON을 gzip보다 15~25% 더 작게 압축
+except ImportError:
+    brotli = None
+
+# ---------------- 응답 설정 ----------------
+RESPONSE_CACHE_TTL = 60          # 인코딩된 응답을 다시 쓰는 시간 (초)
+RESPONSE_CACHE_MAX = 512         # 보관하는 응답(요청 키) 수
+MIN_COMPRESS_SIZE = 1024         # 이보다 작은 본문은 압축하지 않음 (바이트)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5               # 응답마다 한 번만 압축하지만 첫 요청 지연을 위해 중간 품질
+FIELDS_PARAM = "fields"
+MAX_FIELDS = 50
+MAX_VARIANTS = 8                 # 응답 하나에 보관하는 (필드 선택, 인코딩) 조합 수
+MAX_PROJECTORS = 64              # 컴파일해 두는 필드 선택 조합 수 (클라이언트가 조합을 바꿔도 메모리가 늘지 않도록)
+
+_COMPRESSORS = {"gzip": lambda body: gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)}
+if brotli is not None:
+    _COMPRESSORS = {"br": lambda body: brotli.compress(body, quality=BROTLI_QUALITY), **_COMPRESSORS}
+
+_entries: "OrderedDict[Hashable, Dict]" = OrderedDict()   # 키 → {"data", "expires", "bodies"}
+_lock = threading.Lock()
+
+
+# ---------------- 필드 선택 ----------------
+def requested_fields() -> Tuple[str, ...]:
+    """📌 ?fields= 값을 정렬된 필드 이름 튜플로 (없으면 빈 튜플 = 전체)"""
+    raw = request.args.get(FIELDS_PARAM, "")
+    fields = sorted({name.strip() for name in raw.split(",") if name.strip()})
+    return tuple(fields[:MAX_FIELDS])
+
+
+@functools.lru_cache(maxsize=MAX_PROJECTORS)
+def _projector(fields: Tuple[str, ...]) -> Callable[[Any], Any]:
+    return compile_schema({name: True for name in fields})
+
+
+def select_fields(data: Any, fields: Tuple[str, ...]) -> Any:
+    """📌 results 배열의 항목(없으면 최상위 객체)에서 고른 필드만 남김 (page, total_results 등은 유지)"""
+    if not fields:
+        return data
+    project = _projector(fields)
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        return dict(data, results=[project(item) for item in data["results"]])
+    return project(data)
+
+
+# ---------------- 인코딩 / 압축 ----------------
+def negotiate_encoding() -> Optional[str]:
+    """📌 클라이언트가 받을 수 있는 압축 방식 중 서버가 지원하는 첫 번째 (br > gzip, 없으면 None)"""
+    accepted = request.accept_encodings
+    for encoding in _COMPRESSORS:
+        if accepted[encoding] > 0:
+            return encoding
+    return None
+
+
+def encode(data: Any, fields: Tuple[str, ...] = (), encoding: Optional[str] = None) -> Tuple[bytes, Optional[str]]:
+    """📌 필드 선택 → JSON 바이트 → (크기가 충분하면) 압축. 실제로 적용한 인코딩을 함께 반환"""
+    body = dumps(select_fields(data, fields))
+    if encoding is None or len(body) < MIN_COMPRESS_SIZE:
+        return body, None
+    return _COMPRESSORS[encoding](body), encoding
+
+
+def _response(body: bytes, encoding: Optional[str], status: int = 200) -> Response:
+    response = Response(body, status=status, mimetype="application/json")
+    response.headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def respond(data: Any, status: int = 200) -> Response:
+    """📌 jsonify 대신 쓰는 JSON 응답 (필드 선택과 압축 적용, 캐시하지 않음)"""
+    return _response(*encode(data, requested_fields(), negotiate_encoding()), status=status)
+
+
+# ---------------- 인코딩된 응답 캐시 ----------------
+def cached(key: Hashable, loader: Callable[[], Any], ttl: float = RESPONSE_CACHE_TTL,
+           cacheable: Callable[[Any], bool] = lambda data: True) -> Response:
+    """
+    📌 key로 응답을 캐시: 데이터는 loader()로 한 번만 만들고, (필드 선택, 인코딩) 조합마다 완성된 바이트를 보관
+    cacheable(data)가 False인 응답(오류 등)은 보관하지 않습니다.
+    """
+    fields, encoding = requested_fields(), negotiate_encoding()
+    now = time.time()
+    with _lock:
+        entry = _entries.get(key)
+        if entry and entry["expires"] > now:
+            _entries.move_to_end(key)
+            body = entry["bodies"].get((fields, encoding))
+            if body is not None:
+                return _response(*body)
+        else:
+            entry = None
+
+    if entry is None:
+        data = loader()
+        if not cacheable(data):
+            return _response(*encode(data, fields, encoding))
+        entry = {"data": data, "expires": now + ttl, "bodies": {}}
+    body = encode(entry["data"], fields, encoding)
+    with _lock:
+        if len(entry["bodies"]) < MAX_VARIANTS:
+            entry["bodies"][(fields, encoding)] = body
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > RESPONSE_CACHE_MAX:
+            _entries.popitem(last=False)
+    return _response(*body)
+
+
+def clear():
+    """📌 캐시된 응답 모두 삭제"""
+    with _lock:
+        _entries.clear()
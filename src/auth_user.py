@@ -85,6 +85,7 @@ def load_user_preferences():
 def save_guest_preferences(guest_id, watched_movies, favorite_movies, preferred_genres):
     """📌 게스트 유저의 프로필 저장"""
     guest_data_file = f"data/guest_{guest_id}.json"
+    st.session_state["PROFILE_KEY"] = f"guest_{guest_id}"  # ✅ 이벤트 로그가 이 프로필로 기록되도록
     guest_data = {
         "watched_movies": watched_movies,
         "favorite_movies": favorite_movies,
@@ -98,6 +99,7 @@ def save_guest_preferences(guest_id, watched_movies, favorite_movies, preferred_
 def load_guest_preferences(guest_id):
     """📌 게스트 유저 프로필 불러오기"""
     guest_data_file = f"data/guest_{guest_id}.json"
+    st.session_state["PROFILE_KEY"] = f"guest_{guest_id}"  # ✅ 이벤트 로그가 이 프로필로 기록되도록
     if os.path.exists(guest_data_file):
         with open(guest_data_file, "r", encoding="utf-8") as f:
             return json.load(f)
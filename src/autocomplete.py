@@ -0,0 +1,285 @@
+"""
+📌 배우/키워드 이름 자동 완성 (한글 자모 분해 접두사 색인)
+
+- 이름을 자모 단위로 풀고 공백/기호를 뺀 키를 정렬 배열에 넣어, 접두사를 이분 탐색 구간으로 찾습니다.
+  "톰 크" → "ㅌㅗㅁㅋㅡ"는 "톰 크루즈"의 키 앞부분이므로 입력 중인 글자("톰 클" = ...ㅋㅡㄹ)도 맞습니다.
+- 이름의 단어 시작 위치마다 키를 넣어 "크루즈"로도 "톰 크루즈"를 찾습니다.
+- 짧은 접두사(SHORT_PREFIX 자모 이하)는 구간이 커서 인기도 상위 목록을 색인을 만들 때 미리 계산합니다.
+- 색인 원본: 카탈로그 수집기(catalog_ingest)가 만든 people.jsonl/keywords.jsonl과, TMDb 검색 응답에서 배운 이름.
+  검색어는 첫 번째 결과의 별칭으로 기록하므로 한국어로 검색한 외국 배우도 다음부터는 로컬에서 완성됩니다.
+- resolve()는 로컬 색인에 없는 종류만 모아 한 번의 병렬 요청(get_many_json)으로 조회하고 결과를 색인에 배웁니다.
+"""
+import bisect
+import heapq
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src import tmdb_client
+from src.catalog_ingest import CATALOG_DIR, OUTPUT_FILES
+
+# ---------------- 자동 완성 설정 ----------------
+LEARNED_FILE = os.getenv("AUTOCOMPLETE_LEARNED_FILE", os.path.join(CATALOG_DIR, "autocomplete_learned.jsonl"))
+SEARCH_PATHS = {"person": "/search/person", "keyword": "/search/keyword"}
+SUGGEST_LIMIT = 8
+SHORT_PREFIX = 3           # 이 길이(자모 수) 이하의 접두사는 미리 계산한 상위 목록으로 응답
+MAX_PEOPLE = 200_000       # 카탈로그에서 색인에 넣는 인물 수 (인기도 순)
+MAX_WORDS = 4              # 이름에서 키를 만드는 단어 시작 위치 수
+LEARN_TOP = 5              # 검색 응답에서 배우는 결과 수
+REBUILD_PENDING = 500      # 새로 배운 항목이 이만큼 쌓이면 백그라운드에서 색인을 다시 만듦
+
+# ---------------- 한글 자모 분해 ----------------
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = ("ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ",
+         "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ")
+_JONG = ("", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+         "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 겹모음/겹받침 낱자 → 입력 순서대로 푼 자모 (입력 중인 "과"는 "고" 다음에 오므로)
+_SPLIT = dict(zip("ㅘㅙㅚㅝㅞㅟㅢ", ("ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅡㅣ")))
+_SPLIT.update(zip("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ", ("ㄱㅅ", "ㄴㅈ", "ㄴㅎ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+                                           "ㄹㅍ", "ㄹㅎ", "ㅂㅅ")))
+
+
+def decompose(text: str) -> str:
+    """📌 검색 키: 한글 음절은 자모로 풀고, 글자/숫자만 소문자로 남김 ("톰 크루즈" → "ㅌㅗㅁㅋㅡㄹㅜㅈㅡ")"""
+    out = []
+    for ch in text.lower():
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[code % 588 // 28])
+            out.append(_JONG[code % 28])
+        elif ch.isalnum():
+            out.append(_SPLIT.get(ch, ch))
+    return "".join(out)
+
+
+def _keys(name: str) -> List[str]:
+    """📌 이름의 단어 시작 위치마다 하나씩 만든 키 ("톰 크루즈" → 톰크루즈, 크루즈)"""
+    words = name.replace("-", " ").split()
+    keys = []
+    for start in range(min(len(words), MAX_WORDS)):
+        key = decompose("".join(words[start:]))
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+class Suggestion(NamedTuple):
+    """📌 자동 완성 후보 (label은 맞은 이름, 별칭으로 맞았으면 "별칭 (이름)")"""
+    kind: str
+    id: int
+    name: str
+    label: str
+    popularity: float
+
+
+# ---------------- 접두사 색인 ----------------
+class PrefixIndex:
+    """📌 인기도 순 항목 + (자모 키, 항목 순위, 이름 번호) 정렬 배열 + 짧은 접두사 상위 목록"""
+
+    def __init__(self, entries: Iterable[Tuple[str, int, Tuple[str, ...], float]]):
+        self.entries = sorted(entries, key=lambda e: -e[3])
+        rows, self.top = [], {}
+        for rank, (kind, _, names, _) in enumerate(self.entries):
+            for n, name in enumerate(names):
+                for key in _keys(name):
+                    rows.append((key, rank, n))
+                    for length in range(1, min(SHORT_PREFIX, len(key)) + 1):
+                        for bucket_key in ((None, key[:length]), (kind, key[:length])):
+                            bucket = self.top.setdefault(bucket_key, [])
+                            if len(bucket) < SUGGEST_LIMIT and (not bucket or bucket[-1][0] != rank):
+                                bucket.append((rank, n))  # 순위 오름차순으로 돌므로 앞에서부터 인기순
+        rows.sort()
+        self.keys = [row[0] for row in rows]
+        self.refs = [(row[1], row[2]) for row in rows]
+
+    def search(self, key: str, kind: Optional[str], limit: int) -> List[Tuple[int, int]]:
+        """📌 키 접두사가 맞는 (순위, 이름 번호)를 인기순으로 최대 limit개"""
+        if len(key) <= SHORT_PREFIX:
+            return self.top.get((kind, key), [])[:limit]
+        lo = bisect.bisect_left(self.keys, key)
+        hi = bisect.bisect_left(self.keys, key + "\uffff")
+        best = {}
+        for rank, n in self.refs[lo:hi]:
+            if (kind is None or self.entries[rank][0] == kind) and rank not in best:
+                best[rank] = n
+        return [(rank, best[rank]) for rank in heapq.nsmallest(limit, best)]
+
+    def suggestion(self, rank: int, n: int) -> Suggestion:
+        kind, entry_id, names, popularity = self.entries[rank]
+        label = names[n] if n == 0 else f"{names[n]} ({names[0]})"
+        return Suggestion(kind, entry_id, names[0], label, popularity)
+
+
+_index: Optional[PrefixIndex] = None
+_learned: Dict[Tuple[str, int], list] = {}      # (종류, ID) → [이름들, 인기도]
+_pending: Dict[Tuple[str, int], list] = {}      # 색인을 만든 뒤에 배운 항목 (선형 탐색)
+_lock = threading.Lock()
+_rebuilding = False
+
+
+def _catalog_entries() -> Iterable[Tuple[str, int, Tuple[str, ...], float]]:
+    """📌 카탈로그 수집기가 만든 인물(인기도 상위 MAX_PEOPLE명)/키워드 파일"""
+    for kind in ("person", "keyword"):
+        path = os.path.join(CATALOG_DIR, OUTPUT_FILES[kind])
+        if not os.path.exists(path):
+            continue
+        items = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    continue
+                if item.get("id") and item.get("name"):
+                    items.append((kind, item["id"], (item["name"],), float(item.get("popularity") or 0.0)))
+        if kind == "person" and len(items) > MAX_PEOPLE:
+            items = heapq.nlargest(MAX_PEOPLE, items, key=lambda e: e[3])
+        yield from items
+
+
+def _load_learned():
+    try:
+        with open(LEARNED_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    kind, entry_id, names, popularity = json.loads(line)
+                except ValueError:
+                    continue
+                _merge(_learned, kind, entry_id, names, popularity)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading autocomplete names: {e}")
+
+
+def _merge(target: Dict, kind: str, entry_id: int, names: Iterable[str], popularity: float) -> bool:
+    """📌 항목에 새 이름/인기도를 합침 (바뀐 것이 있으면 True)"""
+    entry = target.setdefault((kind, entry_id), [[], 0.0])
+    added = [name for name in names if name and name not in entry[0]]
+    entry[0].extend(added)
+    changed = bool(added) or popularity > entry[1]
+    entry[1] = max(entry[1], popularity)
+    return changed
+
+
+def _build() -> PrefixIndex:
+    entries = {}
+    for kind, entry_id, names, popularity in _catalog_entries():
+        _merge(entries, kind, entry_id, names, popularity)
+    with _lock:
+        for (kind, entry_id), (names, popularity) in _learned.items():
+            _merge(entries, kind, entry_id, names, popularity)
+    return PrefixIndex((kind, entry_id, tuple(names), popularity)
+                       for (kind, entry_id), (names, popularity) in entries.items())
+
+
+def get_index() -> PrefixIndex:
+    """📌 프로세스당 한 번 색인을 만들어 재사용 (첫 호출에서 파일을 읽음)"""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None and not _learned:
+                _load_learned()
+        index = _build()
+        with _lock:
+            if _index is None:
+                _index = index
+    return _index
+
+
+def _rebuild():
+    global _index, _rebuilding
+    try:
+        with _lock:
+            pending = set(_pending)
+        index = _build()
+        with _lock:
+            _index = index
+            for key in pending:
+                _pending.pop(key, None)
+    except Exception as e:
+        print(f"Error rebuilding autocomplete index: {e}")
+    finally:
+        _rebuilding = False
+
+
+# ---------------- 조회 ----------------
+def suggest(query: str, kind: Optional[str] = None, limit: int = SUGGEST_LIMIT) -> List[Suggestion]:
+    """📌 입력 중인 검색어의 자동 완성 후보 (인기순, 네트워크 요청 없음)"""
+    key = decompose(query)
+    if not key:
+        return []
+    index = get_index()
+    found = {}
+    for rank, n in index.search(key, kind, limit):
+        s = index.suggestion(rank, n)
+        found[(s.kind, s.id)] = s
+    with _lock:
+        pending = list(_pending.items())
+    for (entry_kind, entry_id), (names, popularity) in pending:
+        if kind not in (None, entry_kind):
+            continue
+        for n, name in enumerate(names):
+            if any(k.startswith(key) for k in _keys(name)):
+                label = name if n == 0 else f"{name} ({names[0]})"
+                found[(entry_kind, entry_id)] = Suggestion(entry_kind, entry_id, names[0], label, popularity)
+                break
+    return heapq.nlargest(limit, found.values(), key=lambda s: s.popularity)
+
+
+def learn(kind: str, query: str, results: List[Dict]):
+    """📌 검색 응답의 이름을 색인에 추가하고, 검색어를 첫 결과의 별칭으로 기록"""
+    global _rebuilding
+    lines = []
+    query_key = decompose(query)
+    for position, item in enumerate(results[:LEARN_TOP]):
+        if not item.get("id") or not item.get("name"):
+            continue
+        names = [name for name in (item["name"], item.get("original_name")) if name]
+        if position == 0 and query_key and not any(k.startswith(query_key) for n in names for k in _keys(n)):
+            names.append(query.strip())
+        popularity = float(item.get("popularity") or 0.0)
+        with _lock:
+            if _merge(_learned, kind, item["id"], names, popularity):
+                _merge(_pending, kind, item["id"], _learned[(kind, item["id"])][0], popularity)
+                lines.append(json.dumps([kind, item["id"], names, popularity], ensure_ascii=False))
+    if not lines:
+        return
+    try:
+        os.makedirs(os.path.dirname(LEARNED_FILE) or ".", exist_ok=True)
+        with open(LEARNED_FILE, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except Exception as e:
+        print(f"Error saving autocomplete names: {e}")
+    with _lock:
+        start = len(_pending) >= REBUILD_PENDING and not _rebuilding
+        if start:
+            _rebuilding = True
+    if start:
+        threading.Thread(target=_rebuild, name="autocomplete-rebuild", daemon=True).start()
+
+
+def resolve(query: str, kinds: Iterable[str] = tuple(SEARCH_PATHS)) -> Dict[str, List[Dict]]:
+    """
+    📌 검색을 제출했을 때 종류별 후보 ({"id", "name"} 목록)
+    로컬 색인에 후보가 있는 종류는 그대로 쓰고, 없는 종류만 모아 한 번에 TMDb 검색을 보냅니다.
+    """
+    kinds = list(kinds)
+    found = {kind: [{"id": s.id, "name": s.name} for s in suggest(query, kind)] for kind in kinds}
+    misses = [kind for kind in kinds if not found[kind] and query.strip()]
+    if not misses:
+        return found
+    params = {"person": {"query": query, "include_adult": False, "language": tmdb_client.LANGUAGE},
+              "keyword": {"query": query}}
+    responses = tmdb_client.get_many_json([(SEARCH_PATHS[kind], params[kind]) for kind in misses])
+    for kind, data in zip(misses, responses):
+        if isinstance(data, Exception):
+            print(f"Error searching {kind}: {data}")
+            continue
+        results = data.get("results", [])
+        learn(kind, query, results)
+        found[kind] = [{"id": item["id"], "name": item["name"]} for item in results if item.get("id")]
+    return found
@@ -0,0 +1,154 @@
+"""
+📌 배포용 캐시 예열(warm-up)과 캐시 스냅샷 내보내기
+
+사용 예:
+    python -m src.cache_warmup warm --top 200 --export data/cache_snapshot.bin
+    python -m src.cache_warmup inspect data/cache_snapshot.bin
+
+- 트렌딩/카테고리 목록, 장르 목록과 장르 카탈로그, 상위 N편의 상세+크레딧/크레딧/번역, 포스터 썸네일을 미리 받아
+  이 노드의 캐시(TMDB_CACHE_BACKEND)와 포스터 디스크 캐시를 채웁니다.
+- --export를 주면 예열 중 읽고 쓴 캐시 키를 모아 버전과 체크섬이 붙은 스냅샷 파일로 저장합니다.
+- 다른 노드는 이 파일을 TMDB_CACHE_SNAPSHOT 위치에 두면 시작할 때 mmap으로 열어 바로 씁니다
+  (헤더 확인과 체크섬 계산만 하고, 값은 조회될 때 해당 항목만 디코딩).
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
+
+from src import hot_lists, poster_cache, shared_cache, tmdb_client
+from src.movie_record import MovieRecord
+
+# ---------------- 예열 설정 ----------------
+DEFAULT_TOP_N = 200
+DEFAULT_FRESH_FOR = 60 * 60    # 스냅샷 값을 신선한 것으로 볼 시간 (내보낸 시각 기준, 초)
+LIST_PAGES_MAX = 5             # 목록별로 따라갈 최대 페이지 수 (페이지당 20편)
+POSTER_WORKERS = 8
+
+
+class _KeyRecorder:
+    """📌 캐시 백엔드를 감싸 예열 중 읽거나 쓴 키를 기록 (스냅샷에 담을 키 목록)"""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.keys = set()
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        found = self.cache.get_many(keys)
+        self.keys.update(found)
+        return found
+
+    def set_many(self, items: Dict, ttl: float):
+        self.keys.update(items)
+        self.cache.set_many(items, ttl)
+
+    def lock(self, key: str, timeout: float = shared_cache.LOCK_TIMEOUT):
+        return self.cache.lock(key, timeout)
+
+
+@contextmanager
+def _recording():
+    recorder = _KeyRecorder(shared_cache.get_cache())
+    shared_cache.set_cache(recorder)
+    try:
+        yield recorder
+    finally:
+        shared_cache.set_cache(recorder.cache)
+
+
+# ---------------- 예열 ----------------
+def hot_movie_ids(top_n: int) -> List[int]:
+    """📌 트렌딩/카테고리 목록을 페이지 순서대로 훑어 중복 없는 상위 N편의 ID"""
+    ids, seen = [], set()
+    for page in range(1, LIST_PAGES_MAX + 1):
+        params = {"language": tmdb_client.LANGUAGE}
+        if page > 1:
+            params["page"] = page  # 첫 페이지는 hot_lists와 같은 캐시 키를 쓰도록 page 생략
+        pages = tmdb_client.get_many_json([(path, params) for path in hot_lists.LIST_ENDPOINTS.values()])
+        for data in pages:
+            if isinstance(data, Exception):
+                print(f"Error fetching hot list: {data}")
+                continue
+            for movie in data.get("results", []):
+                if movie.get("id") and movie["id"] not in seen:
+                    seen.add(movie["id"])
+                    ids.append(movie["id"])
+        if len(ids) >= top_n:
+            break
+    return ids[:top_n]
+
+
+def warm(top_n: int = DEFAULT_TOP_N, posters: bool = True) -> Tuple[set, Tuple[MovieRecord, ...]]:
+    """📌 핫 세트를 캐시에 채우고 (기록된 캐시 키, 상위 영화 레코드)를 반환"""
+    from src import genre_catalog  # 모듈을 불러오면 카탈로그 파일을 읽으므로 예열할 때만 가져옴
+
+    started = time.time()
+    with _recording() as recorder:
+        tmdb_client.get_json("/genre/movie/list", {"language": tmdb_client.LANGUAGE})
+        movie_ids = hot_movie_ids(top_n)
+        records = tuple(r for r in tmdb_client.hydrate_movies(movie_ids) if isinstance(r, MovieRecord))
+        extras = [(f"/movie/{movie_id}/credits", None) for movie_id in movie_ids]
+        extras += [(f"/movie/{movie_id}/translations", None) for movie_id in movie_ids]
+        failures = sum(isinstance(r, Exception) for r in tmdb_client.get_many_json(extras))
+        try:
+            genre_catalog.build_catalog()
+        except Exception as e:
+            print(f"Error building genre catalog: {e}")
+        keys = set(recorder.keys)
+
+    if posters:
+        with ThreadPoolExecutor(max_workers=POSTER_WORKERS) as pool:
+            list(pool.map(lambda r: poster_cache.get_thumbnail(r.poster_path, poster_cache.THUMBNAIL_WIDTHS[0]),
+                          [r for r in records if r.poster_path]))
+    print(f"캐시 예열: 영화 {len(records)}편, 캐시 키 {len(keys)}개, 실패 {failures}건 "
+          f"({time.time() - started:.1f}초)")
+    return keys, records
+
+
+# ---------------- 스냅샷 ----------------
+def export_snapshot(path: str, keys: Iterable[str], records: Iterable[MovieRecord] = (),
+                    fresh_for: float = DEFAULT_FRESH_FOR) -> int:
+    """📌 캐시 값과 포스터 썸네일을 스냅샷 파일로 저장하고 항목 수를 반환"""
+    entries = tmdb_client.export_entries(keys, fresh_for)
+    for record in records:
+        entries.update(poster_cache.snapshot_entries(record.poster_path))
+    size = shared_cache.write_snapshot(path, entries)
+    print(f"캐시 스냅샷 저장: {path} (항목 {len(entries)}개, {size / 1024 / 1024:.1f} MiB)")
+    return len(entries)
+
+
+def inspect_snapshot(path: str):
+    """📌 스냅샷을 시작 시와 같은 방식으로 열어 버전/항목 수/여는 시간을 출력 (체크섬 검증 포함)"""
+    started = time.perf_counter()
+    snapshot = shared_cache.CacheSnapshot(path)
+    elapsed = (time.perf_counter() - started) * 1000
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.created_at))
+    print(f"{path}: 버전 {shared_cache.SNAPSHOT_VERSION}, 생성 {created}, 항목 {snapshot.count}개, "
+          f"{len(snapshot.map) / 1024 / 1024:.1f} MiB, 열기+체크섬 {elapsed:.1f} ms")
+
+
+# ---------------- 실행 ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="캐시 예열과 캐시 스냅샷 내보내기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_cmd = sub.add_parser("warm")
+    warm_cmd.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="상세 정보를 미리 받을 영화 수")
+    warm_cmd.add_argument("--no-posters", action="store_true", help="포스터 썸네일은 예열하지 않음")
+    warm_cmd.add_argument("--export", help="예열 결과를 저장할 스냅샷 파일 경로")
+    warm_cmd.add_argument("--fresh-for", type=float, default=DEFAULT_FRESH_FOR,
+                          help="스냅샷 값을 신선한 것으로 볼 시간 (초)")
+    inspect_cmd = sub.add_parser("inspect")
+    inspect_cmd.add_argument("path", nargs="?", default=shared_cache.SNAPSHOT_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "inspect":
+        inspect_snapshot(args.path)
+        return
+    keys, records = warm(args.top, posters=not args.no_posters)
+    if args.export:
+        export_snapshot(args.export, keys, records, args.fresh_for)
+
+
+if __name__ == "__main__":
+    main()
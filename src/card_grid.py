@@ -0,0 +1,67 @@
+"""
+📌 영화 카드 격자/목록을 HTML 한 덩어리로 그리기
+
+카드마다 st.image/st.markdown/st.expander를 따로 보내면 섹션 하나가 수십 개의 델타 메시지와
+그만큼의 Streamlit 요소(React 컴포넌트)가 됩니다. 여기서는 섹션(목록) 전체를 st.html 한 번으로 보냅니다.
+- 포스터는 <img loading="lazy" decoding="async">로 화면에 가까워질 때 받고, width/height를 지정해 자리를 미리 잡습니다.
+- 긴 목록의 행은 content-visibility: auto로 화면 밖 행의 레이아웃/그리기를 건너뜁니다 (스크립트 없는 행 가상화).
+- 제목/줄거리 등 TMDb 문자열은 HTML 이스케이프합니다.
+스타일(.card-grid, .card-list 등)은 ui.load_css에 있습니다.
+"""
+import html
+from typing import Iterable, Optional
+
+from src.movie_record import MovieRecord
+from src.poster_cache import poster_url
+
+POSTER_RATIO = 1.5   # 포스터 세로/가로 비율 (자리 확보용)
+
+
+def _text(value, default: str = "정보 없음") -> str:
+    return html.escape(str(value)) if value not in (None, "") else default
+
+
+def _poster(movie: MovieRecord, width: int) -> str:
+    return (f"<img src='{html.escape(poster_url(movie.poster_path, width), quote=True)}' "
+            f"width='{width}' height='{int(width * POSTER_RATIO)}' loading='lazy' decoding='async' "
+            f"alt='{_text(movie.title, '')}'>")
+
+
+def card_html(movie: MovieRecord, poster_width: int = 250, overview_len: int = 100) -> str:
+    """📌 홈 화면 카드 하나 (포스터, 제목, 평점, 개봉일, 줄거리, 감독/출연진은 있을 때만)"""
+    parts = [
+        f"<div class='movie-card'>{_poster(movie, poster_width)}",
+        f"<p class='movie-title'>{_text(movie.title)}</p>",
+        f"<p class='movie-info'>⭐ 평점: {_text(movie.vote_average or None, 'N/A')}/10</p>",
+        f"<p class='movie-info'>🗓 개봉일: {_text(movie.release_date)}</p>",
+        f"<p class='movie-info'>📜 줄거리: {_text((movie.overview or '줄거리 없음')[:overview_len])}...</p>",
+    ]
+    if movie.directors:
+        parts.append(f"<p class='movie-info'>🎬 감독: {_text(', '.join(movie.directors))}</p>")
+    if movie.cast:
+        parts.append(f"<p class='movie-info'>👥 출연진: {_text(', '.join(movie.cast[:3]))}</p>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def grid_html(records: Iterable[MovieRecord], columns: int, title: Optional[str] = None,
+              poster_width: int = 250, overview_len: int = 100) -> str:
+    """📌 섹션 제목과 카드 격자를 한 덩어리로"""
+    header = f"<h2 class='sub-header'>{_text(title)}</h2>" if title else ""
+    cards = "".join(card_html(movie, poster_width, overview_len) for movie in records)
+    return (f"{header}<div class='card-grid' style='grid-template-columns: repeat({columns}, minmax(0, 1fr))'>"
+            f"{cards}</div>")
+
+
+def list_html(records: Iterable[MovieRecord], poster_width: int = 150, overview_len: int = 150) -> str:
+    """📌 검색 결과처럼 길어질 수 있는 세로 목록 (행마다 포스터 + 제목/개봉일/평점/줄거리)"""
+    rows = []
+    for movie in records:
+        rows.append(
+            f"<div class='card-list-row'>{_poster(movie, poster_width)}<div>"
+            f"<p class='movie-title'>{_text(movie.title, '정보없음')} ({_text(movie.release_date, '정보없음')})</p>"
+            f"<p class='movie-info'>⭐ 평점: {_text(movie.vote_average or None, '정보없음')}/10</p>"
+            f"<p class='movie-info'>📜 줄거리: {_text((movie.overview or '정보없음')[:overview_len])}...</p>"
+            f"</div></div>"
+        )
+    return f"<div class='card-list'>{''.join(rows)}</div>"
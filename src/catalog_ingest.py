@@ -0,0 +1,440 @@
+"""
+📌 TMDb 일일 ID 내보내기 파일(.json.gz)로 로컬 영화 카탈로그를 만드는 오프라인 수집기
+
+사용 예:
+    python -m src.catalog_ingest movie movie_ids_05_15_2025.json.gz --min-popularity 1
+    python -m src.catalog_ingest person person_ids_05_15_2025.json.gz
+    python -m src.catalog_ingest keyword keyword_ids_05_15_2025.json.gz
+
+- 내보내기 파일은 한 줄씩 스트리밍으로 읽으므로 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+  이전 카탈로그와 비교할 때도 ID 집합을 메모리에 두지 않고, 양쪽을 id 순으로 외부 정렬해 한 번에 병합합니다.
+- 영화는 배치 단위로 상세+크레딧+키워드를 병렬로 받아오며, 초당 요청 수를 제한합니다.
+- 배치가 끝날 때마다 체크포인트를 남기므로 중단 후 다시 실행하면 이어서 진행합니다.
+- 상세 조회에 실패한 영화는 내보내기 파일을 다 읽은 뒤 한 번 더 시도합니다 (그래도 실패하면 failed_movies.jsonl에 남음).
+- 새 날짜의 내보내기 파일이면 이미 받은 영화는 다시 받지 않고 새 ID만 받은 뒤,
+  내보내기에서 빠진 영화를 지우고 인기도를 새 값으로 바꿉니다 (인물/키워드는 내보내기 자체가 레코드라 새로 씀).
+"""
+import argparse
+import gzip
+import heapq
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src import tmdb_client
+
+# ---------------- 수집 설정 ----------------
+CATALOG_DIR = os.getenv("CATALOG_DIR", "data/catalog")
+OUTPUT_FILES = {"movie": "movies.jsonl", "person": "people.jsonl", "keyword": "keywords.jsonl"}
+CHECKPOINT_FILE = "checkpoint.json"
+FAILED_FILE = "failed_movies.jsonl"
+PENDING_FILE = "pending_movies.txt"   # 이번 내보내기에서 새로 받을 영화 ID (id 순)
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 40.0       # TMDb 권장 한도 이하의 초당 요청 수
+CAST_LIMIT = 20
+SORT_RUN_BYTES = 32 * 1024 * 1024   # 외부 정렬에서 한 번에 메모리에 올리는 크기 (런 하나)
+
+
+# ---------------- 요청 속도 제한 ----------------
+class RateLimiter:
+    """📌 여러 스레드가 공유하는 토큰 버킷 (초당 rate개 요청)"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ---------------- 내보내기 파일 읽기 ----------------
+def iter_export(path: str, skip: int = 0) -> Iterator[Dict]:
+    """📌 gzip JSON-lines 내보내기 파일을 한 줄씩 읽음 (앞의 skip줄은 건너뜀)"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line_no < skip or not line.strip():
+                continue
+            yield json.loads(line)
+
+
+def _batches(items: Iterator[Dict], size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------- 영화 상세 수집 ----------------
+def compact_movie(details: Dict) -> Dict:
+    """📌 상세+크레딧+키워드 응답에서 카탈로그와 discover 필터에 필요한 필드만 추출"""
+    credits = details.get("credits") or {}
+    keywords = (details.get("keywords") or {}).get("keywords", [])
+    return {
+        "id": details["id"],
+        "title": details.get("title") or details.get("original_title", ""),
+        "original_title": details.get("original_title", ""),
+        "original_language": details.get("original_language", ""),
+        "overview": details.get("overview", ""),
+        "release_date": details.get("release_date", ""),
+        "runtime": details.get("runtime") or 0,
+        "popularity": details.get("popularity", 0.0),
+        "vote_average": details.get("vote_average", 0.0),
+        "vote_count": details.get("vote_count", 0),
+        "revenue": details.get("revenue", 0),
+        "adult": bool(details.get("adult")),
+        "video": bool(details.get("video")),
+        "poster_path": details.get("poster_path"),
+        "genre_ids": [g["id"] for g in details.get("genres", [])],
+        "origin_country": details.get("origin_country", []),
+        "company_ids": [c["id"] for c in details.get("production_companies", [])],
+        "cast": [{"id": c["id"], "name": c.get("name", "")} for c in credits.get("cast", [])[:CAST_LIMIT]],
+        "crew": [{"id": c["id"], "name": c.get("name", ""), "job": c.get("job", "")}
+                 for c in credits.get("crew", []) if c.get("job") in ("Director", "Screenplay", "Writer")],
+        # discover의 with_cast/with_crew/with_people가 TMDb와 같은 결과를 내도록 전체 출연진/제작진 ID도 보관
+        "cast_ids": list(dict.fromkeys(c["id"] for c in credits.get("cast", []))),
+        "crew_ids": list(dict.fromkeys(c["id"] for c in credits.get("crew", []))),
+        "keyword_ids": [k["id"] for k in keywords],
+    }
+
+
+def _hydrate(movie_id: int, limiter: RateLimiter) -> Optional[Dict]:
+    limiter.wait()
+    details = tmdb_client.get_json(f"/movie/{movie_id}", {
+        "language": tmdb_client.LANGUAGE, "append_to_response": "credits,keywords",
+    }, cache_ttl=0, project=False)  # 키워드/제작사 등 전체 필드가 필요하고, 공유 캐시도 채우지 않음
+    return compact_movie(details)
+
+
+def _hydrate_batch(pool: ThreadPoolExecutor, limiter: RateLimiter, movie_ids: Iterable[int]
+                   ) -> Tuple[List[Dict], List[Dict]]:
+    """📌 영화 ID 묶음을 병렬로 상세 조회 → (카탈로그 레코드, 실패 항목)"""
+    futures = [(movie_id, pool.submit(_hydrate, movie_id, limiter)) for movie_id in movie_ids]
+    records, failures = [], []
+    for movie_id, future in futures:
+        try:
+            records.append(future.result())
+        except Exception as e:
+            failures.append({"id": movie_id, "error": str(e)})
+    return records, failures
+
+
+def _keep(kind: str, item: Dict, min_popularity: float, include_adult: bool) -> bool:
+    if not include_adult and item.get("adult"):
+        return False
+    if kind == "movie" and item.get("video"):
+        return False
+    return item.get("popularity", 0.0) >= min_popularity if kind != "keyword" else True
+
+
+# ---------------- 체크포인트 ----------------
+def _load_checkpoint(out_dir: str) -> Dict:
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def _save_checkpoint(out_dir: str, checkpoint: Dict):
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# ---------------- 외부 정렬 ----------------
+def _external_sort(pairs: Iterable[Tuple[int, str]], work_dir: str) -> Iterator[Tuple[int, str]]:
+    """
+    📌 (id, 줄) 스트림을 id 순으로 정렬해 반환 (외부 병합 정렬)
+    SORT_RUN_BYTES만큼씩 메모리에서 정렬해 임시 런 파일로 쓰고, 런들을 heapq.merge로 한 줄씩 합칩니다.
+    메모리는 런 하나 크기로 일정하고, 임시 파일은 다 읽으면 지웁니다.
+    """
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="sort-") as tmp:
+        runs, buffer, size = [], [], 0
+
+        def spill():
+            buffer.sort(key=lambda pair: pair[0])
+            path = os.path.join(tmp, f"run-{len(runs):05d}")
+            with open(path, "w", encoding="utf-8") as f:
+                for movie_id, line in buffer:
+                    f.write(f"{movie_id}\t{line}\n")
+            runs.append(path)
+            buffer.clear()
+
+        for movie_id, line in pairs:
+            buffer.append((movie_id, line))
+            size += len(line) + 64
+            if size >= SORT_RUN_BYTES:
+                spill()
+                size = 0
+        if buffer:
+            spill()
+
+        files = [open(path, "r", encoding="utf-8") for path in runs]
+        try:
+            readers = [((int(key), line) for key, line in (row.rstrip("\n").split("\t", 1) for row in f))
+                       for f in files]
+            yield from heapq.merge(*readers, key=lambda pair: pair[0])
+        finally:
+            for f in files:
+                f.close()
+
+
+def _unique(pairs: Iterable[Tuple[int, str]]) -> Iterator[Tuple[int, str]]:
+    """📌 정렬된 스트림에서 id가 같은 연속 항목은 첫 번째만 남김"""
+    last = None
+    for pair in pairs:
+        if pair[0] != last:
+            last = pair[0]
+            yield pair
+
+
+def _difference(pairs: Iterable[Tuple[int, str]], exclude: Iterable[Tuple[int, str]]) -> Iterator[int]:
+    """📌 정렬된 두 스트림을 한 번에 훑어 exclude에 없는 id만 반환"""
+    exclude = iter(exclude)
+    current = next(exclude, None)
+    for movie_id, _ in pairs:
+        while current is not None and current[0] < movie_id:
+            current = next(exclude, None)
+        if current is None or current[0] != movie_id:
+            yield movie_id
+
+
+def _output_records(out_path: str) -> Iterator[Tuple[int, str]]:
+    """📌 출력 파일의 (영화 ID, JSON 줄)"""
+    with open(out_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)["id"], line.rstrip("\n")
+
+
+def _export_movies(export_path: str, min_popularity: float, include_adult: bool) -> Iterator[Tuple[int, str]]:
+    """📌 내보내기에서 필터를 통과한 영화의 (ID, 인기도)"""
+    for item in iter_export(export_path):
+        if _keep("movie", item, min_popularity, include_adult):
+            yield item["id"], repr(float(item.get("popularity", 0.0)))
+
+
+def _write_ids(path: str, movie_ids: Iterable[int]) -> int:
+    tmp_path = f"{path}.tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for movie_id in movie_ids:
+            f.write(f"{movie_id}\n")
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return count
+
+
+def _read_ids(path: str, skip: int = 0) -> Iterator[int]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f):
+            if line_no >= skip and line.strip():
+                yield int(line)
+
+
+# ---------------- 이전 내보내기와의 차이 ----------------
+def _plan_movies(export_path: str, out_dir: str, out_path: str, min_popularity: float, include_adult: bool) -> int:
+    """📌 내보내기에 있고 출력에는 아직 없는 영화 ID를 id 순으로 PENDING_FILE에 씀 (반환: 건수)"""
+    wanted = _unique(_external_sort(_export_movies(export_path, min_popularity, include_adult), out_dir))
+    have = _unique(_external_sort(((movie_id, "") for movie_id, _ in _output_records(out_path)), out_dir))
+    return _write_ids(os.path.join(out_dir, PENDING_FILE), _difference(wanted, have))
+
+
+def _retry_failed(out_dir: str, out_path: str, state: Dict, workers: int, rate: float, batch_size: int):
+    """
+    📌 실패 목록의 영화를 한 번 더 상세 조회해 출력에 추가하고, 그래도 실패한 영화만 남겨 실패 파일을 다시 씀
+    (같은 ID가 여러 번 기록되어 있어도 한 번만 시도, 이미 출력에 있는 영화는 건너뜀)
+    """
+    failed_path = os.path.join(out_dir, FAILED_FILE)
+    if not os.path.exists(failed_path):
+        return
+
+    def failed_ids():
+        with open(failed_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)["id"], ""
+
+    # 재시도 목록을 먼저 파일로 써 두어야 출력 파일에 덧붙이는 동안 정렬이 그 파일을 읽지 않음
+    retry_path = os.path.join(out_dir, f"{FAILED_FILE}.retry")
+    have = _unique(_external_sort(((movie_id, "") for movie_id, _ in _output_records(out_path)), out_dir))
+    total = _write_ids(retry_path, _difference(_unique(_external_sort(failed_ids(), out_dir)), have))
+
+    still_failed, saved = 0, 0
+    limiter = RateLimiter(rate)
+    tmp_path = f"{failed_path}.tmp"
+    with open(out_path, "a", encoding="utf-8") as out, open(tmp_path, "w", encoding="utf-8") as failed, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(_read_ids(retry_path), batch_size):
+            records, failures = _hydrate_batch(pool, limiter, batch)
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            for failure in failures:
+                failed.write(json.dumps(failure) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            still_failed += len(failures)
+            saved += len(records)
+            state["written"] += len(records)
+            state["output_bytes"] = out.tell()
+    os.replace(tmp_path, failed_path)
+    os.remove(retry_path)
+    state["failed_bytes"] = os.path.getsize(failed_path)
+    print(f"[movie] 실패 {total:,}건 재시도 → {saved:,}건 저장 ({still_failed:,}건 실패)")
+
+
+def _compact(export_path: str, out_dir: str, out_path: str, min_popularity: float,
+             include_adult: bool) -> Tuple[int, int]:
+    """
+    📌 새 내보내기에 없는(삭제되었거나 필터에서 빠진) 영화를 지우고 인기도를 내보내기 값으로 바꿔 출력 파일을 다시 씀
+    내보내기와 출력을 각각 id 순으로 외부 정렬해 한 번에 병합하므로 메모리는 카탈로그 크기와 무관합니다
+    (다시 쓴 출력 파일은 id 순, 같은 영화가 두 번 기록되어 있으면 하나만 남김).
+    반환: (새 파일 크기, 레코드 수)
+    """
+    popularity = _unique(_external_sort(_export_movies(export_path, min_popularity, include_adult), out_dir))
+    records = _unique(_external_sort(_output_records(out_path), out_dir))
+    tmp_path = f"{out_path}.tmp"
+    count = 0
+    current = next(popularity, None)
+    with open(tmp_path, "w", encoding="utf-8") as dst:
+        for movie_id, line in records:
+            while current is not None and current[0] < movie_id:
+                current = next(popularity, None)
+            if current is None or current[0] != movie_id:
+                continue
+            record = json.loads(line)
+            record["popularity"] = float(current[1])
+            dst.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp_path, out_path)
+    return os.path.getsize(out_path), count
+
+
+# ---------------- 수집 실행 ----------------
+def ingest(kind: str, export_path: str, out_dir: str = CATALOG_DIR, batch_size: int = DEFAULT_BATCH_SIZE,
+           workers: int = DEFAULT_WORKERS, rate: float = DEFAULT_RATE, min_popularity: float = 0.0,
+           include_adult: bool = False, limit: Optional[int] = None) -> Dict:
+    """
+    📌 내보내기 파일 하나를 카탈로그에 반영하고 진행 상황을 반환
+    체크포인트에는 읽은 줄 수와 출력/실패 파일의 바이트 위치를 함께 기록합니다.
+    재시작 시 두 파일을 그 위치로 잘라내므로 중복 없이 이어서 쓸 수 있습니다.
+    영화는 먼저 받을 ID 목록(PENDING_FILE)을 만들고, 읽은 줄 수는 그 목록 기준으로 셉니다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, OUTPUT_FILES[kind])
+    failed_path = os.path.join(out_dir, FAILED_FILE)
+    pending_path = os.path.join(out_dir, PENDING_FILE)
+    checkpoint = _load_checkpoint(out_dir)
+    state = checkpoint.get(kind, {})
+    if state.get("export") != os.path.basename(export_path):
+        previous = state
+        state = {"export": os.path.basename(export_path), "lines_done": 0, "output_bytes": 0, "written": 0,
+                 "failed_bytes": 0, "planned": False, "done": False}
+        if kind == "movie" and previous.get("output_bytes"):
+            # 이전 내보내기로 받은 영화는 그대로 두고 새 ID만 받음 (빠진 영화는 마지막에 정리)
+            state.update(output_bytes=previous["output_bytes"], written=previous.get("written", 0))
+    elif state.get("done"):
+        print(f"[{kind}] {state['export']}은(는) 이미 반영했습니다.")
+        return state
+
+    # 마지막 체크포인트 이후에 기록된(반쯤 쓰인) 데이터는 버림
+    # (정리 단계에서 파일을 바꾼 직후 중단되었으면 파일이 기록보다 작을 수 있으므로 늘리지 않음)
+    for path, key in ((out_path, "output_bytes"), (failed_path, "failed_bytes")):
+        with open(path, "a", encoding="utf-8"):
+            pass
+        state[key] = min(state.get(key, 0), os.path.getsize(path))
+        os.truncate(path, state[key])
+    checkpoint[kind] = state
+    if kind == "movie" and (not state.get("planned") or not os.path.exists(pending_path)):
+        pending = _plan_movies(export_path, out_dir, out_path, min_popularity, include_adult)
+        state.update(planned=True, lines_done=0)
+        _save_checkpoint(out_dir, checkpoint)
+        print(f"[movie] 새로 받을 영화 {pending:,}건")
+    source = _read_ids(pending_path, skip=state["lines_done"]) if kind == "movie" else \
+        iter_export(export_path, skip=state["lines_done"])
+
+    limiter = RateLimiter(rate)
+    started = time.time()
+    finished = True
+    with open(out_path, "a", encoding="utf-8") as out, \
+            open(failed_path, "a", encoding="utf-8") as failed, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(source, batch_size):
+            if kind == "movie":
+                records, failures = _hydrate_batch(pool, limiter, batch)
+                for failure in failures:
+                    failed.write(json.dumps(failure) + "\n")
+            else:
+                records = [item for item in batch if _keep(kind, item, min_popularity, include_adult)]
+
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            failed.flush()
+
+            state["lines_done"] += len(batch)
+            state["written"] += len(records)
+            state["output_bytes"] = out.tell()
+            state["failed_bytes"] = failed.tell()
+            checkpoint[kind] = state
+            _save_checkpoint(out_dir, checkpoint)
+            print(f"[{kind}] {state['lines_done']:,}줄 처리, {state['written']:,}건 저장 "
+                  f"({time.time() - started:.0f}초)")
+            if limit and state["written"] >= limit:
+                finished = False
+                break
+
+    if finished and kind == "movie":
+        _retry_failed(out_dir, out_path, state, workers, rate, batch_size)
+        _save_checkpoint(out_dir, checkpoint)
+        state["output_bytes"], state["written"] = _compact(export_path, out_dir, out_path, min_popularity,
+                                                           include_adult)
+        os.remove(pending_path)
+    state["done"] = finished
+    checkpoint[kind] = state
+    _save_checkpoint(out_dir, checkpoint)
+    return state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TMDb 일일 ID 내보내기 파일로 로컬 카탈로그 생성")
+    parser.add_argument("kind", choices=sorted(OUTPUT_FILES))
+    parser.add_argument("export_path", help="로컬 .json.gz 내보내기 파일 경로")
+    parser.add_argument("--out", default=CATALOG_DIR)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="초당 최대 TMDb 요청 수")
+    parser.add_argument("--min-popularity", type=float, default=0.0)
+    parser.add_argument("--include-adult", action="store_true")
+    parser.add_argument("--limit", type=int, default=None, help="저장할 최대 건수 (테스트용)")
+    args = parser.parse_args(argv)
+    ingest(args.kind, args.export_path, out_dir=args.out, batch_size=args.batch_size, workers=args.workers,
+           rate=args.rate, min_popularity=args.min_popularity, include_adult=args.include_adult, limit=args.limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+📌 로컬 카탈로그(movies.jsonl)를 열 단위 NumPy 테이블로 변환하고 /discover/movie 필터를 벡터 연산으로 처리
+
+사용 예:
+    python -m src.catalog_table build            # data/catalog/movies.jsonl → data/catalog/table/
+    python -m src.catalog_table query with_genres=28 sort_by=vote_average.desc
+
+- 숫자 열은 .npy 파일로 저장하고 memory-map으로 읽으므로 여러 프로세스가 페이지 캐시를 공유합니다.
+- 장르/출연진/제작진/키워드/제작사/국가는 역색인(값 → 행 번호)으로 저장하고 조회 시 비트맵으로 변환합니다.
+- 지원하지 않는 파라미터가 오면 None을 반환하여 호출자가 TMDb로 넘기게 합니다.
+"""
+import argparse
+import json
+import os
+import sys
+from array import array
+from functools import lru_cache
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.catalog_ingest import CATALOG_DIR
+
+# ---------------- 테이블 설정 ----------------
+TABLE_DIR = os.path.join(CATALOG_DIR, "table")
+PAGE_SIZE = 20
+MAX_PAGES = 500            # TMDb와 동일한 페이지 상한
+BITMAP_CACHE_SIZE = 1024
+
+NUMERIC_COLUMNS = {
+    "id": "int64", "popularity": "float32", "vote_average": "float32", "vote_count": "int32",
+    "revenue": "int64", "runtime": "int32", "release_date": "int32", "adult": "bool", "video": "bool",
+    "original_language": "int16", "title_rank": "int32", "original_title_rank": "int32",
+}
+# 다중 값 필드: 필드 이름 → 카탈로그 레코드에서 값을 꺼내는 함수
+MULTI_COLUMNS = {
+    "genres": lambda m: m.get("genre_ids", []),
+    "cast": lambda m: m["cast_ids"] if "cast_ids" in m else [c["id"] for c in m.get("cast", [])],
+    "crew": lambda m: m["crew_ids"] if "crew_ids" in m else [c["id"] for c in m.get("crew", [])],
+    "keywords": lambda m: m.get("keyword_ids", []),
+    "companies": lambda m: m.get("company_ids", []),
+    "origin_country": lambda m: m.get("origin_country", []),
+}
+RESULT_FIELDS = (
+    "adult", "genre_ids", "id", "original_language", "original_title", "overview", "popularity",
+    "poster_path", "release_date", "title", "video", "vote_average", "vote_count",
+)
+
+SORT_COLUMNS = {
+    "popularity": "popularity", "vote_average": "vote_average", "vote_count": "vote_count",
+    "revenue": "revenue", "primary_release_date": "release_date", "release_date": "release_date",
+    "title": "title_rank", "original_title": "original_title_rank",
+}
+# 파라미터 → (열, 비교) 범위 필터
+RANGE_FILTERS = {
+    "vote_average.gte": ("vote_average", "gte"), "vote_average.lte": ("vote_average", "lte"),
+    "vote_count.gte": ("vote_count", "gte"), "vote_count.lte": ("vote_count", "lte"),
+    "with_runtime.gte": ("runtime", "gte"), "with_runtime.lte": ("runtime", "lte"),
+    "primary_release_date.gte": ("release_date", "gte"), "primary_release_date.lte": ("release_date", "lte"),
+    "release_date.gte": ("release_date", "gte"), "release_date.lte": ("release_date", "lte"),
+}
+# 파라미터 → (다중 값 필드, 제외 여부)
+SET_FILTERS = {
+    "with_genres": ("genres", False), "without_genres": ("genres", True),
+    "with_cast": ("cast", False), "with_crew": ("crew", False),
+    "with_keywords": ("keywords", False), "without_keywords": ("keywords", True),
+    "with_companies": ("companies", False), "without_companies": ("companies", True),
+    "with_origin_country": ("origin_country", False),
+}
+# 인물 필터: 모든 영화의 전체 크레딧이 색인되어 있을 때만 로컬에서 처리
+# (이전 카탈로그는 출연진 앞 20명과 감독/각본만 있어 조연이나 작곡가 등으로 거르면 결과가 빠짐)
+PEOPLE_PARAMS = {"with_cast", "with_crew", "with_people"}
+IGNORED_PARAMS = {"page", "language", "sort_by", "include_adult", "include_video", "region"}
+LOCAL_LANGUAGE = "ko-KR"
+UNDATED = -1                   # 개봉일이 없는 영화의 release_date 값 (이전 테이블은 0)
+DATE_PARAMS = {"primary_release_date.gte", "primary_release_date.lte", "release_date.gte", "release_date.lte",
+               "primary_release_year", "year"}
+
+
+def _date_key(value: str) -> int:
+    """📌 "YYYY-MM-DD" → YYYYMMDD 정수 (없거나 형식이 다르면 UNDATED)"""
+    digits = (value or "").replace("-", "")[:8]
+    return int(digits) if len(digits) == 8 and digits.isdigit() else UNDATED
+
+
+# ---------------- 테이블 생성 ----------------
+def build_table(catalog_dir: str = CATALOG_DIR, table_dir: str = TABLE_DIR) -> int:
+    """📌 movies.jsonl을 한 번 읽어 열 파일, 역색인, 행 오프셋을 생성하고 행 수를 반환"""
+    os.makedirs(table_dir, exist_ok=True)
+    numeric = {name: [] for name in NUMERIC_COLUMNS if not name.endswith("_rank")}
+    multi_values = {name: array("q") for name in MULTI_COLUMNS}
+    multi_rows = {name: array("i") for name in MULTI_COLUMNS}
+    languages, countries = {}, {}
+    titles, original_titles = [], []
+    offsets = array("q", [0])
+    full_credits = True
+
+    with open(os.path.join(catalog_dir, "movies.jsonl"), "r", encoding="utf-8") as src, \
+            open(os.path.join(table_dir, "rows.jsonl"), "wb") as rows:
+        for row, line in enumerate(src):
+            movie = json.loads(line)
+            numeric["id"].append(movie["id"])
+            numeric["popularity"].append(movie.get("popularity") or 0.0)
+            numeric["vote_average"].append(movie.get("vote_average") or 0.0)
+            numeric["vote_count"].append(movie.get("vote_count") or 0)
+            numeric["revenue"].append(movie.get("revenue") or 0)
+            numeric["runtime"].append(movie.get("runtime") or 0)
+            numeric["release_date"].append(_date_key(movie.get("release_date")))
+            numeric["adult"].append(bool(movie.get("adult")))
+            numeric["video"].append(bool(movie.get("video")))
+            numeric["original_language"].append(
+                languages.setdefault(movie.get("original_language", ""), len(languages)))
+            full_credits = full_credits and "cast_ids" in movie and "crew_ids" in movie
+            titles.append(movie.get("title", ""))
+            original_titles.append(movie.get("original_title", ""))
+
+            for name, extract in MULTI_COLUMNS.items():
+                for value in extract(movie):
+                    if name == "origin_country":
+                        value = countries.setdefault(value, len(countries))
+                    multi_values[name].append(value)
+                    multi_rows[name].append(row)
+
+            result = {key: movie.get(key) for key in RESULT_FIELDS if key != "genre_ids"}
+            result["genre_ids"] = movie.get("genre_ids", [])
+            rows.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+            offsets.append(rows.tell())
+
+    for name, values in numeric.items():
+        np.save(os.path.join(table_dir, f"{name}.npy"), np.asarray(values, dtype=NUMERIC_COLUMNS[name]))
+    for name, values in (("title_rank", titles), ("original_title_rank", original_titles)):
+        order = np.argsort(np.asarray(values, dtype=object), kind="stable")
+        rank = np.empty(len(values), dtype="int32")
+        rank[order] = np.arange(len(values), dtype="int32")
+        np.save(os.path.join(table_dir, f"{name}.npy"), rank)
+    np.save(os.path.join(table_dir, "offsets.npy"), np.frombuffer(offsets, dtype="int64"))
+
+    # 역색인: 값 기준으로 정렬한 (값, 행) 쌍 → 값별 행 목록
+    for name in MULTI_COLUMNS:
+        values = np.frombuffer(multi_values[name], dtype="int64")
+        rows_ = np.frombuffer(multi_rows[name], dtype="int32")
+        order = np.argsort(values, kind="stable")
+        keys, starts = np.unique(values[order], return_index=True)
+        np.save(os.path.join(table_dir, f"{name}_keys.npy"), keys)
+        np.save(os.path.join(table_dir, f"{name}_indptr.npy"), np.append(starts, len(order)).astype("int64"))
+        np.save(os.path.join(table_dir, f"{name}_rows.npy"), rows_[order])
+
+    with open(os.path.join(table_dir, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump({"original_language": languages, "origin_country": countries}, f, ensure_ascii=False)
+    with open(os.path.join(table_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"full_credits": full_credits and bool(titles)}, f)
+    return len(titles)
+
+
+# ---------------- 테이블 로드 ----------------
+class CatalogTable:
+    """📌 memory-map으로 연 열 배열과 역색인 묶음"""
+
+    def __init__(self, table_dir: str = TABLE_DIR):
+        load = lambda name: np.load(os.path.join(table_dir, f"{name}.npy"), mmap_mode="r")
+        self.columns = {name: load(name) for name in NUMERIC_COLUMNS}
+        self.index = {name: (load(f"{name}_keys"), load(f"{name}_indptr"), load(f"{name}_rows"))
+                      for name in MULTI_COLUMNS}
+        self.offsets = load("offsets")
+        with open(os.path.join(table_dir, "vocab.json"), "r", encoding="utf-8") as f:
+            self.vocab = json.load(f)
+        meta_path = os.path.join(table_dir, "meta.json")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        self.full_credits = bool(meta.get("full_credits"))
+        self.rows_fd = os.open(os.path.join(table_dir, "rows.jsonl"), os.O_RDONLY)
+        self.size = len(self.columns["id"])
+        # 같은 값에 대한 비트맵은 여러 요청에서 재사용
+        self.bitmap = lru_cache(maxsize=BITMAP_CACHE_SIZE)(self._bitmap)
+
+    def _bitmap(self, field: str, value: int) -> np.ndarray:
+        """📌 다중 값 필드의 특정 값을 가진 행의 불리언 비트맵"""
+        keys, indptr, rows = self.index[field]
+        mask = np.zeros(self.size, dtype=bool)
+        pos = np.searchsorted(keys, value)
+        if pos < len(keys) and keys[pos] == value:
+            mask[rows[indptr[pos]:indptr[pos + 1]]] = True
+        mask.flags.writeable = False
+        return mask
+
+    def read_rows(self, row_ids) -> list:
+        """📌 결과 페이지에 해당하는 행만 rows.jsonl에서 읽어 디코딩 (pread라 여러 스레드에서 안전)"""
+        results = []
+        for row in row_ids:
+            start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+            results.append(json.loads(os.pread(self.rows_fd, end - start, start)))
+        return results
+
+
+_table = None
+
+
+def get_table() -> Optional[CatalogTable]:
+    """📌 프로세스당 한 번 테이블을 열어 재사용 (테이블이 없으면 None)"""
+    global _table
+    if _table is None and os.path.exists(os.path.join(TABLE_DIR, "offsets.npy")):
+        _table = CatalogTable(TABLE_DIR)
+    return _table
+
+
+# ---------------- discover 쿼리 ----------------
+def _value_key(table: CatalogTable, field: str, raw: str) -> Optional[int]:
+    if field == "origin_country":
+        return table.vocab["origin_country"].get(raw)
+    return int(raw) if raw.strip().lstrip("-").isdigit() else None
+
+
+def _set_mask(table: CatalogTable, field: str, expression: str) -> np.ndarray:
+    """📌 TMDb 규칙: ","는 AND, "|"는 OR"""
+    mask = None
+    for and_part in expression.split(","):
+        part = np.zeros(table.size, dtype=bool)
+        for raw in and_part.split("|"):
+            key = _value_key(table, field, raw)
+            if key is not None:
+                part |= table.bitmap(field, key)
+        mask = part if mask is None else mask & part
+    return mask
+
+
+def _parse_bound(column: str, raw: str):
+    if column == "release_date":
+        key = _date_key(raw)
+        if key == UNDATED:
+            raise ValueError(f"invalid date: {raw}")
+        return key
+    return float(raw)
+
+
+def discover(params: Dict[str, str], table: Optional[CatalogTable] = None) -> Optional[Dict]:
+    """
+    📌 /discover/movie 파라미터를 로컬 테이블에서 벡터 연산으로 처리
+    처리할 수 없는 파라미터가 있거나 테이블이 없으면 None을 반환합니다.
+    인물 필터는 테이블이 전체 크레딧으로 만들어졌을 때만 처리합니다.
+    """
+    table = table or get_table()
+    if table is None:
+        return None
+    if params.get("language", LOCAL_LANGUAGE) != LOCAL_LANGUAGE:
+        return None
+    supported = IGNORED_PARAMS | set(RANGE_FILTERS) | set(SET_FILTERS) | {
+        "primary_release_year", "year", "with_people", "with_original_language"}
+    if any(key not in supported for key in params):
+        return None
+    if not table.full_credits and PEOPLE_PARAMS & set(params):
+        return None
+
+    cols = table.columns
+    try:
+        mask = np.ones(table.size, dtype=bool)
+        if str(params.get("include_adult", "false")).lower() != "true":
+            mask &= ~cols["adult"]
+        if str(params.get("include_video", "false")).lower() != "true":
+            mask &= ~cols["video"]
+        for key, (column, op) in RANGE_FILTERS.items():
+            if key in params:
+                bound = _parse_bound(column, params[key])
+                mask &= cols[column] >= bound if op == "gte" else cols[column] <= bound
+        for key in ("primary_release_year", "year"):
+            if key in params:
+                year = int(params[key])
+                mask &= (cols["release_date"] // 10000) == year
+        if "with_original_language" in params:
+            codes = [table.vocab["original_language"].get(v, -1) for v in params["with_original_language"].split("|")]
+            mask &= np.isin(cols["original_language"], codes)
+        for key, (field, exclude) in SET_FILTERS.items():
+            if key not in params:
+                continue
+            if exclude:
+                # without_*: 나열된 값 중 하나라도 있으면 제외
+                mask &= ~_set_mask(table, field, params[key].replace(",", "|"))
+            else:
+                mask &= _set_mask(table, field, params[key])
+        if "with_people" in params:
+            mask &= _set_mask(table, "cast", params["with_people"]) | _set_mask(table, "crew", params["with_people"])
+
+        sort_key, _, direction = params.get("sort_by", "popularity.desc").partition(".")
+        sort_column = SORT_COLUMNS[sort_key]
+        if DATE_PARAMS & set(params) or sort_column == "release_date":
+            # TMDb는 날짜 범위/날짜 정렬 결과에서 개봉일 없는 영화를 뺌 (0은 이전 테이블의 빈 값)
+            mask &= cols["release_date"] > 0
+        page = min(MAX_PAGES, max(1, int(params.get("page", 1))))
+    except (KeyError, ValueError):
+        return None
+
+    matched = np.flatnonzero(mask)
+    total_results = len(matched)
+    total_pages = min(MAX_PAGES, -(-total_results // PAGE_SIZE))
+
+    # 필요한 페이지까지만 부분 정렬 (전체 argsort 대신 argpartition)
+    values = np.asarray(cols[sort_column][matched])
+    if direction == "desc":
+        values = -values.astype("float64")
+    needed = min(total_results, page * PAGE_SIZE)
+    if needed and needed < total_results:
+        top = np.argpartition(values, needed - 1)[:needed]
+        top = top[np.argsort(values[top], kind="stable")]
+    else:
+        top = np.argsort(values, kind="stable")
+    page_rows = matched[top[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]]
+
+    return {
+        "page": page,
+        "results": table.read_rows(page_rows),
+        "total_pages": total_pages,
+        "total_results": total_results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 카탈로그 열 테이블 생성 및 조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build")
+    query = sub.add_parser("query")
+    query.add_argument("params", nargs="*", help="key=value 형식의 discover 파라미터")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(f"{build_table():,}개 영화로 테이블을 만들었습니다: {TABLE_DIR}")
+    else:
+        params = dict(p.split("=", 1) for p in args.params)
+        result = discover(params)
+        if result is None:
+            print("로컬에서 처리할 수 없는 쿼리입니다.", file=sys.stderr)
+            sys.exit(1)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+📌 저장된 사용자 프로필(본 영화/좋아하는 영화)로 학습하는 암묵적 피드백 ALS 추천기
+
+사용 예:
+    python -m src.collab_filter train                  # 한 번 학습 후 모델 게시
+    python -m src.collab_filter retrain-loop --interval 3600   # 별도 프로세스로 주기적 재학습
+
+- 상호작용은 scipy CSR 행렬(사용자 x 영화)로 만들고, 좋아하는 영화는 더 높은 신뢰도를 줍니다.
+- 학습 결과(영화/사용자 잠재 요인)는 버전별 디렉터리에 .npy로 저장하고 CURRENT 파일을 원자적으로 교체합니다.
+- 각 Streamlit 워커는 요인을 memory-map으로 열고, 사용자 벡터와 영화 요인의 행렬-벡터 곱 한 번으로 top-k를 계산합니다.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# ---------------- 모델 설정 ----------------
+PROFILE_DIR = "data"
+MODEL_DIR = os.getenv("CF_MODEL_DIR", "data/cf_model")
+FACTORS = 32
+REGULARIZATION = 0.1
+ALPHA = 20.0              # 신뢰도 c = 1 + alpha * r
+ITERATIONS = 12
+WATCHED_WEIGHT = 1.0
+FAVORITE_WEIGHT = 2.0
+KEEP_VERSIONS = 3
+
+
+# ---------------- 상호작용 행렬 ----------------
+def load_profiles(profile_dir: str = PROFILE_DIR) -> Dict[str, Dict]:
+    """📌 auth_user가 저장한 사용자/게스트 프로필 파일을 모두 읽음 (사용자 키 → 프로필)"""
+    profiles = {}
+    for path in sorted(glob.glob(os.path.join(profile_dir, "user_profile.json")) +
+                       glob.glob(os.path.join(profile_dir, "guest_*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                profiles[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+        except Exception as e:
+            print(f"Error loading profile {path}: {e}")
+    return profiles
+
+
+def profile_weights(profile: Dict) -> Dict[str, float]:
+    """📌 프로필 하나를 영화 제목 → 선호 강도로 변환"""
+    weights = {}
+    for title in profile.get("watched_movies", []):
+        weights[title] = max(weights.get(title, 0.0), WATCHED_WEIGHT)
+    for title in profile.get("favorite_movies", []):
+        weights[title] = max(weights.get(title, 0.0), FAVORITE_WEIGHT)
+    return weights
+
+
+def build_matrix(profiles: Dict[str, Dict]) -> Tuple[csr_matrix, List[str], List[str]]:
+    """📌 프로필 묶음을 (사용자 x 영화) CSR 행렬과 사용자/영화 목록으로 변환"""
+    users, items, item_index = [], [], {}
+    rows, cols, data = [], [], []
+    for user, profile in profiles.items():
+        weights = profile_weights(profile)
+        if not weights:
+            continue
+        row = len(users)
+        users.append(user)
+        for title, weight in weights.items():
+            col = item_index.setdefault(title, len(items))
+            if col == len(items):
+                items.append(title)
+            rows.append(row)
+            cols.append(col)
+            data.append(weight)
+    matrix = csr_matrix((np.asarray(data, dtype="float32"), (rows, cols)), shape=(len(users), len(items)))
+    return matrix, users, items
+
+
+# ---------------- 암묵적 ALS ----------------
+def _solve_rows(R: csr_matrix, Y: np.ndarray, reg: float, alpha: float) -> np.ndarray:
+    """
+    📌 Hu-Koren-Volinsky 암묵적 ALS의 한 단계: 고정된 Y로 R의 각 행 벡터를 계산
+    x_u = (YᵀY + Yᵀ(C_u - I)Y + λI)⁻¹ Yᵀ C_u p_u
+    """
+    k = Y.shape[1]
+    YtY = Y.T @ Y
+    X = np.zeros((R.shape[0], k), dtype="float32")
+    for u in range(R.shape[0]):
+        start, end = R.indptr[u], R.indptr[u + 1]
+        if start == end:
+            continue
+        idx = R.indices[start:end]
+        conf = 1.0 + alpha * R.data[start:end]
+        Yu = Y[idx]
+        A = YtY + (Yu.T * (conf - 1.0)) @ Yu + reg * np.eye(k)
+        b = Yu.T @ conf
+        X[u] = np.linalg.solve(A, b)
+    return X
+
+
+def train(matrix: csr_matrix, factors: int = FACTORS, iterations: int = ITERATIONS,
+          reg: float = REGULARIZATION, alpha: float = ALPHA, init_items: Optional[np.ndarray] = None,
+          seed: int = 42) -> Tuple[np.ndarray, np.ndarray]:
+    """📌 사용자/영화 잠재 요인 학습 (init_items가 있으면 이전 모델에서 이어서 학습)"""
+    rng = np.random.default_rng(seed)
+    Y = rng.normal(scale=0.01, size=(matrix.shape[1], factors)).astype("float32")
+    if init_items is not None:
+        known = ~np.isnan(init_items[:, 0])
+        Y[known] = init_items[known]
+    RT = matrix.T.tocsr()
+    X = np.zeros((matrix.shape[0], factors), dtype="float32")
+    for _ in range(iterations):
+        X = _solve_rows(matrix, Y, reg, alpha)
+        Y = _solve_rows(RT, X, reg, alpha)
+    return X, Y
+
+
+# ---------------- 모델 게시 ----------------
+def _current_dir(model_dir: Optional[str] = None) -> Optional[str]:
+    model_dir = model_dir or MODEL_DIR
+    pointer = os.path.join(model_dir, "CURRENT")
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, "r", encoding="utf-8") as f:
+        return os.path.join(model_dir, f.read().strip())
+
+
+def _previous_item_factors(items: List[str], model_dir: str) -> Optional[np.ndarray]:
+    """📌 이전 모델의 영화 요인을 새 영화 순서에 맞춰 정렬 (없는 영화는 NaN)"""
+    current = _current_dir(model_dir)
+    if not current:
+        return None
+    with open(os.path.join(current, "items.json"), "r", encoding="utf-8") as f:
+        old_items = {title: i for i, title in enumerate(json.load(f))}
+    old_factors = np.load(os.path.join(current, "item_factors.npy"))
+    init = np.full((len(items), old_factors.shape[1]), np.nan, dtype="float32")
+    for i, title in enumerate(items):
+        if title in old_items:
+            init[i] = old_factors[old_items[title]]
+    return init if init.shape[1] == FACTORS else None
+
+
+def _row_items(matrix: csr_matrix, row: int, items: List[str]) -> List[str]:
+    """📌 행렬의 한 행에 포함된 영화 제목 목록"""
+    return [items[i] for i in matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]]
+
+
+def train_and_publish(profile_dir: str = PROFILE_DIR, model_dir: str = MODEL_DIR) -> Optional[str]:
+    """📌 전체 프로필로 재학습하고 새 버전 디렉터리를 만든 뒤 CURRENT를 원자적으로 교체"""
+    matrix, users, items = build_matrix(load_profiles(profile_dir))
+    if not users or not items:
+        print("학습할 프로필이 없습니다.")
+        return None
+
+    X, Y = train(matrix, init_items=_previous_item_factors(items, model_dir))
+    version = f"v{int(time.time() * 1000)}"
+    target = os.path.join(model_dir, version)
+    os.makedirs(target, exist_ok=True)
+    np.save(os.path.join(target, "item_factors.npy"), Y)
+    np.save(os.path.join(target, "user_factors.npy"), X)
+    np.save(os.path.join(target, "gram.npy"), (Y.T @ Y).astype("float32"))
+    with open(os.path.join(target, "items.json"), "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+    with open(os.path.join(target, "users.json"), "w", encoding="utf-8") as f:
+        json.dump({user: {"row": i, "items": sorted(_row_items(matrix, i, items))}
+                   for i, user in enumerate(users)}, f, ensure_ascii=False)
+
+    tmp_pointer = os.path.join(model_dir, "CURRENT.tmp")
+    with open(tmp_pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_pointer, os.path.join(model_dir, "CURRENT"))
+
+    for old in sorted(glob.glob(os.path.join(model_dir, "v*")))[:-KEEP_VERSIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+    print(f"모델 게시: {version} (사용자 {len(users)}명, 영화 {len(items)}편)")
+    return target
+
+
+# ---------------- 서빙 (Streamlit 워커) ----------------
+_model = {"version": None}
+
+
+def _load_model() -> Optional[Dict]:
+    """📌 CURRENT가 바뀌었을 때만 새 모델을 memory-map으로 다시 엶"""
+    current = _current_dir()
+    if not current:
+        return None
+    if _model["version"] != current:
+        load = lambda name: np.load(os.path.join(current, f"{name}.npy"), mmap_mode="r")
+        with open(os.path.join(current, "items.json"), "r", encoding="utf-8") as f:
+            items = json.load(f)
+        with open(os.path.join(current, "users.json"), "r", encoding="utf-8") as f:
+            users = json.load(f)
+        _model.update({
+            "version": current, "items": items, "item_index": {t: i for i, t in enumerate(items)},
+            "users": users, "item_factors": load("item_factors"), "user_factors": load("user_factors"),
+            "gram": np.asarray(load("gram")),
+        })
+    return _model
+
+
+def _fold_in(model: Dict, weights: Dict[str, float]) -> Optional[np.ndarray]:
+    """📌 학습에 없던(또는 바뀐) 프로필의 사용자 벡터를 고정된 영화 요인으로 한 번에 계산"""
+    idx = [model["item_index"][t] for t in weights if t in model["item_index"]]
+    if not idx:
+        return None
+    conf = 1.0 + ALPHA * np.asarray([weights[model["items"][i]] for i in idx], dtype="float32")
+    Yu = np.asarray(model["item_factors"][idx])
+    k = Yu.shape[1]
+    A = model["gram"] + (Yu.T * (conf - 1.0)) @ Yu + REGULARIZATION * np.eye(k)
+    return np.linalg.solve(A, Yu.T @ conf)
+
+
+def recommend(profile: Dict, k: int = 10, user_key: Optional[str] = None) -> List[Tuple[str, float]]:
+    """
+    📌 프로필에 대한 top-k 추천 (영화 제목, 점수)
+    학습 당시와 같은 프로필이면 저장된 사용자 벡터를, 아니면 fold-in 벡터를 사용합니다.
+    """
+    model = _load_model()
+    if model is None:
+        return []
+    weights = profile_weights(profile)
+    user = model["users"].get(user_key) if user_key else None
+    if user and user["items"] == sorted(t for t in weights if t in model["item_index"]):
+        vector = model["user_factors"][user["row"]]
+    else:
+        vector = _fold_in(model, weights)
+    if vector is None:
+        return []
+
+    scores = np.asarray(model["item_factors"]) @ vector
+    seen = [model["item_index"][t] for t in weights if t in model["item_index"]]
+    scores[seen] = -np.inf
+    k = min(k, len(scores) - len(seen))
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(model["items"][i], float(scores[i])) for i in top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="협업 필터링 모델 학습")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("train")
+    loop = sub.add_parser("retrain-loop")
+    loop.add_argument("--interval", type=int, default=3600, help="재학습 주기 (초)")
+    args = parser.parse_args(argv)
+
+    if args.command == "train":
+        train_and_publish()
+        return
+    while True:
+        try:
+            train_and_publish()
+        except Exception as e:
+            print(f"Error retraining model: {e}")
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
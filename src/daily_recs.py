@@ -0,0 +1,188 @@
+"""
+📌 사용자별 "오늘의 추천 영화"를 밤마다 미리 계산해 두는 배치 작업과 조회 함수
+
+사용 예:
+    python -m src.daily_recs build --workers 4        # 저장된 모든 프로필을 한 번 계산
+    python -m src.daily_recs nightly-loop --at 04:00  # 매일 지정 시각에 다시 계산
+
+- 추천은 선호 장르에만 의존하므로 같은 장르 조합을 가진 사용자는 한 번만 계산합니다.
+- 장르 조합별 계산은 프로세스 풀에서 병렬로 실행합니다.
+- 결과는 사용자 키 → {입력 해시, 계산 시각, 압축 레코드 목록} 형태의 JSON 파일에 원자적으로 저장됩니다.
+- 홈 화면은 메모리에 올린 저장소에서 O(1)로 읽고, 새 프로필이나 장르가 바뀐 프로필만 즉석에서 계산합니다.
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from src import collab_filter, tmdb_client
+from src.movie_record import MovieRecord, register
+from src.genre_map import GENRE_MAP
+
+# ---------------- 배치 설정 ----------------
+STORE_FILE = os.getenv("DAILY_RECS_FILE", "data/daily_recs.json")
+RECS_PER_USER = 10                 # 사용자별로 저장하는 추천 영화 수 (홈 화면은 이 중 일부를 표시)
+FRESH_FOR = 36 * 60 * 60           # 이보다 오래된 결과는 즉석 계산으로 대체 (하루 + 배치 지연 여유)
+DEFAULT_WORKERS = 4
+LOCAL_USER_KEY = "user_profile"    # auth_user.USER_DATA_FILE 프로필의 키 (collab_filter.load_profiles와 동일)
+MAX_LIVE = 1000                    # 프로세스에 보관하는 즉석 계산 결과 수 (오래 안 쓴 것부터 제거)
+
+
+# ---------------- 추천 계산 ----------------
+def genre_ids_for(profile: Dict) -> Tuple[int, ...]:
+    """📌 프로필의 선호 장르 이름을 TMDb 장르 ID로 변환 (get_personalized_recommendations와 같은 매핑)"""
+    return tuple(GENRE_MAP[g] for g in profile.get("preferred_genres", []) if g in GENRE_MAP)
+
+
+def input_hash(profile: Dict) -> str:
+    """📌 추천 결과에 영향을 주는 입력(선호 장르)만으로 만든 해시 → 바뀌었을 때만 다시 계산"""
+    genres = json.dumps(sorted(profile.get("preferred_genres", [])), ensure_ascii=False)
+    return hashlib.sha1(genres.encode("utf-8")).hexdigest()[:16]
+
+
+def compute_records(genre_ids: Tuple[int, ...]) -> Tuple[MovieRecord, ...]:
+    """📌 장르별 discover 결과 앞쪽 영화들을 상세+크레딧까지 채워 반환 (공유 캐시 사용)"""
+    if not genre_ids:
+        return ()
+    pages = tmdb_client.get_many_json([
+        ("/discover/movie", {"language": tmdb_client.LANGUAGE, "with_genres": genre_id}) for genre_id in genre_ids
+    ])
+    movie_ids = []
+    for data in pages:
+        if isinstance(data, Exception):
+            print(f"Error discovering movies: {data}")
+            continue
+        for movie in data.get("results", []):
+            if movie.get("id") and movie["id"] not in movie_ids:
+                movie_ids.append(movie["id"])
+    movie_ids = movie_ids[:RECS_PER_USER]
+    return tuple(r for r in tmdb_client.hydrate_movies(movie_ids) if isinstance(r, MovieRecord))
+
+
+def _compute_rows(genre_ids: Tuple[int, ...]) -> List[list]:
+    """📌 프로세스 풀 작업 단위: 압축 레코드를 JSON으로 저장할 수 있는 행 목록으로 반환"""
+    return [list(record) for record in compute_records(genre_ids)]
+
+
+def build_store(profile_dir: str = collab_filter.PROFILE_DIR, workers: int = DEFAULT_WORKERS) -> Dict:
+    """📌 저장된 모든 프로필의 추천을 계산하고 저장소 파일을 교체"""
+    profiles = collab_filter.load_profiles(profile_dir)
+    by_genres: Dict[Tuple[int, ...], List[str]] = {}
+    for user_key, profile in profiles.items():
+        by_genres.setdefault(genre_ids_for(profile), []).append(user_key)
+
+    started = time.time()
+    signatures = list(by_genres)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(signatures, pool.map(_compute_rows, signatures)))
+
+    computed_at = time.time()
+    users = {
+        user_key: {"hash": input_hash(profiles[user_key]), "computed_at": computed_at, "movies": results[signature]}
+        for signature, user_keys in by_genres.items() for user_key in user_keys
+    }
+    save_store(users, computed_at)
+    print(f"추천 저장: 사용자 {len(users)}명, 장르 조합 {len(signatures)}개 ({time.time() - started:.1f}초)")
+    return users
+
+
+def save_store(users: Dict, generated_at: float):
+    """📌 저장소를 JSON 파일로 원자적으로 교체"""
+    os.makedirs(os.path.dirname(STORE_FILE) or ".", exist_ok=True)
+    tmp_path = f"{STORE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"generated_at": generated_at, "users": users}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, STORE_FILE)
+
+
+# ---------------- 조회 (Streamlit 워커) ----------------
+_store = {"mtime": None, "users": {}}
+_live: "OrderedDict[Tuple[str, str], Tuple[float, Tuple[MovieRecord, ...]]]" = OrderedDict()
+_live_lock = threading.Lock()
+
+
+def _users() -> Dict:
+    """📌 저장소 파일이 바뀌었을 때만 다시 읽음 (평소에는 stat 한 번)"""
+    try:
+        mtime = os.stat(STORE_FILE).st_mtime
+    except OSError:
+        return {}
+    if _store["mtime"] != mtime:
+        try:
+            with open(STORE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _store.update({"mtime": mtime, "users": data.get("users", {})})
+        except Exception as e:
+            print(f"Error loading daily recommendations: {e}")
+    return _store["users"]
+
+
+def lookup(user_key: str, profile: Dict) -> Optional[Tuple[MovieRecord, ...]]:
+    """📌 미리 계산된 추천 (없거나, 오래됐거나, 선호 장르가 바뀌었으면 None)"""
+    entry = _users().get(user_key)
+    if not entry or entry["hash"] != input_hash(profile) or time.time() - entry["computed_at"] > FRESH_FOR:
+        return None
+    # 행 = MovieRecord 필드 순서, 뒤의 세 필드(장르/감독/출연진)는 JSON 배열 → 튜플
+    return tuple(register(MovieRecord(*row[:6], *(tuple(v) for v in row[6:]))) for row in entry["movies"])
+
+
+def get_recommendations(user_key: str, profile: Dict) -> Tuple[MovieRecord, ...]:
+    """📌 오늘의 추천: 저장소에서 바로 읽고, 새/변경된 프로필만 즉석 계산 (프로세스 안에서 재사용)"""
+    records = lookup(user_key, profile)
+    if records is not None:
+        return records
+    key = (user_key, input_hash(profile))
+    with _live_lock:
+        cached = _live.get(key)
+        if cached and time.time() - cached[0] <= FRESH_FOR:
+            _live.move_to_end(key)
+            return cached[1]
+    records = compute_records(genre_ids_for(profile))
+    with _live_lock:
+        _live[key] = (time.time(), records)
+        _live.move_to_end(key)
+        while len(_live) > MAX_LIVE:
+            _live.popitem(last=False)
+    return records
+
+
+# ---------------- 실행 ----------------
+def _seconds_until(at: str) -> float:
+    hour, minute = (int(part) for part in at.split(":"))
+    now = datetime.datetime.now()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += datetime.timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="사용자별 오늘의 추천 미리 계산")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("build", "nightly-loop"):
+        command = sub.add_parser(name)
+        command.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+        command.add_argument("--profiles", default=collab_filter.PROFILE_DIR)
+        if name == "nightly-loop":
+            command.add_argument("--at", default="04:00", help="매일 실행할 시각 (HH:MM)")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_store(args.profiles, args.workers)
+        return
+    while True:
+        time.sleep(_seconds_until(args.at))
+        try:
+            build_store(args.profiles, args.workers)
+        except Exception as e:
+            print(f"Error building daily recommendations: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-import requests
 import streamlit as st
 
+from src import account_lists, hot_lists, tmdb_client
+
 # ---------------- TMDb API 기본 설정 ----------------
 API_KEY = st.secrets["MOVIEDB_API_KEY"]
 BASE_URL = "https://api.themoviedb.org/3"
@@ -14,22 +15,25 @@ def fetch_translations(item_id, item_type="movie", season_number=None):
     - season_number: TV 시즌일 경우 필요한 시즌 번호
     """
     if item_type == "movie":
-        url = f"{BASE_URL}/movie/{item_id}/translations?api_key={API_KEY}"
+        path = f"/movie/{item_id}/translations"
     elif item_type == "tv" and season_number is not None:
-        url = f"{BASE_URL}/tv/{item_id}/season/{season_number}/translations?api_key={API_KEY}"
+        path = f"/tv/{item_id}/season/{season_number}/translations"
     else:
         return None, None
 
     try:
-        response = requests.get(url)
-        translations = response.json().get("translations", []) if response.status_code == 200 else []
-        for t in translations:
-            if t["iso_639_1"] == "ko":  # 한국어 데이터 찾기
-                return t["data"].get("title", ""), t["data"].get("overview", "")
+        return _korean_translation(tmdb_client.get_json(path))
     except Exception as e:
         print(f"Error fetching translations: {e}")
     return None, None
 
+def _korean_translation(data):
+    """번역 응답에서 한국어 제목/줄거리를 찾습니다. (없으면 None, None)"""
+    for t in data.get("translations", []):
+        if t["iso_639_1"] == "ko":  # 한국어 데이터 찾기
+            return t["data"].get("title", ""), t["data"].get("overview", "")
+    return None, None
+
 def translate_movie(movie):
     """영화 정보를 한국어 번역으로 업데이트 (번역 없으면 원본 유지)"""
     title_ko, overview_ko = fetch_translations(movie.get("id", 0), item_type="movie")
@@ -39,35 +43,45 @@ def translate_movie(movie):
         movie["overview"] = overview_ko
     return movie
 
+def translate_movies(movies):
+    """
+    여러 영화의 번역을 한 번에 병렬로 조회해 한국어로 업데이트합니다.
+    (translate_movie를 영화마다 순서대로 부르는 것과 결과는 같고, 실패한 영화는 원본을 유지)
+    """
+    movies = [dict(movie) for movie in movies]
+    responses = tmdb_client.get_many_json([(f"/movie/{movie.get('id', 0)}/translations", None) for movie in movies])
+    for movie, data in zip(movies, responses):
+        if isinstance(data, Exception):
+            print(f"Error fetching translations: {data}")
+            continue
+        title_ko, overview_ko = _korean_translation(data)
+        if title_ko:
+            movie["title"] = title_ko
+        if overview_ko:
+            movie["overview"] = overview_ko
+    return movies
+
 def fetch_movies_by_category(category):
     """특정 카테고리(인기, 최신, 평점 높은) 영화 리스트를 가져옵니다."""
-    url = f"{BASE_URL}/movie/{category}?api_key={API_KEY}&language=ko-KR"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json().get("results", [])
-        return []
+        return tmdb_client.get_json(f"/movie/{category}", {"language": "ko-KR"}).get("results", [])
     except Exception as e:
         print(f"Error fetching movies by category: {e}")
         return []
 
 def fetch_genres_list():
     """TMDb에서 영화 장르 리스트를 가져옵니다."""
-    url = f"{BASE_URL}/genre/movie/list?api_key={API_KEY}&language=ko-KR"
     try:
-        response = requests.get(url)
-        return response.json().get("genres", []) if response.status_code == 200 else []
+        return tmdb_client.get_json("/genre/movie/list", {"language": "ko-KR"}).get("genres", [])
     except Exception as e:
         print(f"Error fetching genre list: {e}")
         return []
 
 def fetch_movies_by_genre(genre_id):
     """특정 장르에 해당하는 영화 리스트를 가져옵니다."""
-    url = f"{BASE_URL}/discover/movie?api_key={API_KEY}&with_genres={genre_id}&language=ko-KR"
     try:
-        response = requests.get(url)
-        movies = response.json().get("results", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        movies = tmdb_client.get_json("/discover/movie", {"with_genres": genre_id, "language": "ko-KR"}).get("results", [])
+        return [translate_movie(dict(movie)) for movie in movies]
     except Exception as e:
         print(f"Error fetching movies by genre: {e}")
         return []
@@ -75,33 +89,29 @@ def fetch_movies_by_genre(genre_id):
 def fetch_movies_by_selected_genres(selected_genres):
     """여러 장르가 선택된 경우 해당 영화 리스트를 가져옵니다."""
     genre_ids = ",".join(str(genre) for genre in selected_genres)
-    url = f"{BASE_URL}/discover/movie?api_key={API_KEY}&with_genres={genre_ids}&language=ko-KR"
     try:
-        response = requests.get(url)
-        movies = response.json().get("results", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        movies = tmdb_client.get_json("/discover/movie", {"with_genres": genre_ids, "language": "ko-KR"}).get("results", [])
+        return [translate_movie(dict(movie)) for movie in movies]
     except Exception as e:
         print(f"Error fetching movies by selected genres: {e}")
         return []
 
 def fetch_popular_movies():
-    """인기 영화를 가져옵니다."""
-    url = f"{BASE_URL}/movie/popular?api_key={API_KEY}&language=ko-KR"
+    """
+    인기 영화를 가져옵니다.
+    백그라운드 스냅샷(한국어 상세 정보)에서 읽으므로 호출할 때마다 번역을 다시 요청하지 않습니다.
+    """
     try:
-        response = requests.get(url)
-        movies = response.json().get("results", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        return [record._asdict() for record in hot_lists.get_snapshot("popular")]
     except Exception as e:
         print(f"Error fetching popular movies: {e}")
         return []
 
 def search_movie(query):
     """영화 제목 또는 줄거리로 영화를 검색합니다."""
-    url = f"{BASE_URL}/search/movie?api_key={API_KEY}&language=ko-KR&query={query}"
     try:
-        response = requests.get(url)
-        movies = response.json().get("results", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        movies = tmdb_client.get_json("/search/movie", {"language": "ko-KR", "query": query}).get("results", [])
+        return [translate_movie(dict(movie)) for movie in movies]
     except Exception as e:
         print(f"Error searching for movie: {e}")
         return []
@@ -111,13 +121,9 @@ def fetch_movie_details(movie_id):
     특정 영화의 세부 정보를 가져옵니다.
     append_to_response=credits 옵션을 통해 감독 및 출연진 정보도 함께 조회합니다.
     """
-    url = f"{BASE_URL}/movie/{movie_id}?api_key={API_KEY}&language=ko-KR&append_to_response=credits"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            movie = response.json()
-            return translate_movie(movie)
-        return {}
+        movie = tmdb_client.get_json(f"/movie/{movie_id}", {"language": "ko-KR", "append_to_response": "credits"})
+        return translate_movie(dict(movie))
     except Exception as e:
         print(f"Error fetching movie details: {e}")
         return {}
@@ -128,13 +134,12 @@ def get_movie_details(movie_id):
     :param movie_id: TMDb 영화 ID
     :return: 영화 정보 (딕셔너리)
     """
-    url = f"{BASE_URL}/movie/{movie_id}"
-    params = { "api_key": API_KEY,"language": "ko-KR", "append_to_response": "credits,videos"}
-    
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        return response.json()
-    return {}
+    params = {"language": "ko-KR", "append_to_response": "credits,videos"}
+    try:
+        return tmdb_client.get_json(f"/movie/{movie_id}", params)
+    except Exception as e:
+        print(f"Error fetching movie details: {e}")
+        return {}
 
 def full_movie_details(movie):
     """
@@ -181,36 +186,24 @@ def full_movie_details(movie):
 def fetch_user_movie_list(category="watchlist"):
     """
     📌 사용자의 영화 목록 (예: watchlist, favorite) 가져오기
+    전체 페이지를 계정별 캐시(account_lists)에서 읽습니다.
     :param category: "watchlist" 또는 "favorite"
-    :return: 영화 목록 리스트
+    :return: 영화 목록 리스트 (최근 추가순)
     """
     session_id = st.session_state.get("SESSION_ID")
     if not session_id:
         return []
-
-    url = f"{BASE_URL}/account/{st.secrets['ACCOUNT_ID']}/{category}/movies"
-    params = {"api_key": API_KEY, "session_id": session_id, "language": "ko-KR"}
-    
-    response = requests.get(url, params=params)
-    if response.status_code == 200:
-        return response.json().get("results", [])
-    return []
+    return [record._asdict() for record in account_lists.get_list(session_id, category)]
 
 # 예시: fetch_movie_details() 함수는 아래와 같이 구현되어 있다고 가정합니다.
 def fetch_movie_details(movie_id):
     """
     특정 영화의 세부 정보를 가져옵니다.
     append_to_response=credits 옵션을 통해 감독 및 출연진 정보도 함께 조회합니다.
+    (감독과 상위 출연진만 남긴 투영 응답을 공유 캐시에서 재사용)
     """
-    API_KEY = st.secrets["MOVIEDB_API_KEY"]
-    BASE_URL = "https://api.themoviedb.org/3"
-    url = f"{BASE_URL}/movie/{movie_id}?api_key={API_KEY}&language=ko-KR&append_to_response=credits"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            movie = response.json()
-            return movie
-        return {}
+        return tmdb_client.get_json(f"/movie/{movie_id}", {"language": "ko-KR", "append_to_response": "credits"})
     except Exception as e:
         st.error(f"Error fetching movie details: {e}")
         return {}
@@ -222,17 +215,12 @@ def fetch_movie_credits(movie_id):
     """
     특정 영화의 크레딧(감독, 배우 등) 정보를 가져옵니다.
     credits 엔드포인트는 language 파라미터를 지원하지 않으므로 제거합니다.
+    응답은 디코딩 시점에 감독(crew 중 Director)과 상위 출연진만 남기도록 투영됩니다.
     """
-    url = f"{BASE_URL}/movie/{movie_id}/credits?api_key={API_KEY}"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            credits = response.json()
-            # crew 배열에서 job이 "Director"인 항목을 감독으로 추출
-            directors = [member for member in credits.get("crew", []) if member.get("job") == "Director"]
-            credits["directors"] = directors
-            return credits
-        return {}
+        credits = dict(tmdb_client.get_json(f"/movie/{movie_id}/credits"))
+        credits["directors"] = credits.get("crew", [])
+        return credits
     except Exception as e:
         print(f"Error fetching movie credits: {e}")
         return {}
@@ -253,30 +241,27 @@ def search_person(query, include_adult=False, page=1, language="ko-KR"):
     """
     배우(또는 인물) 이름으로 검색하여 결과를 반환합니다.
     """
-    url = f"{BASE_URL}/search/person"
     params = {
-        "api_key": API_KEY,
         "query": query,
         "include_adult": include_adult,
         "page": page,
         "language": language
     }
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            return response.json().get("results", [])
-        return []
+        return tmdb_client.get_json("/search/person", params).get("results", [])
     except Exception as e:
         print(f"Error searching for person: {e}")
         return []
 
-def fetch_movies_by_person(person_id):
-    """특정 배우가 출연한 영화 목록을 가져옵니다."""
-    url = f"{BASE_URL}/person/{person_id}/movie_credits?api_key={API_KEY}&language=ko-KR"
+def fetch_movies_by_person(person_id, limit=None):
+    """
+    특정 배우가 출연한 영화 목록을 가져옵니다.
+    전체 출연작 대신 인기순 상위 limit편(기본: 필모그래피 한 페이지)만 번역해 반환합니다.
+    """
+    from src import filmography  # filmography가 이 모듈의 번역 함수를 사용하므로 호출 시점에 가져옴
+
     try:
-        response = requests.get(url)
-        movies = response.json().get("cast", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        return filmography.get_filmography(person_id).top(limit or filmography.PAGE_SIZE)
     except Exception as e:
         print(f"Error fetching movies by person: {e}")
         return []
@@ -284,14 +269,10 @@ def fetch_movies_by_person(person_id):
 def fetch_person_movie_credits(person_id, language="ko-KR"):
     """
     특정 배우의 영화 크레딧 정보를 반환합니다.
-    cast와 crew 배열 모두를 포함한 전체 데이터를 반환합니다.
+    cast와 crew 배열 모두를 포함하되, 항목마다 화면에 쓰는 필드만 남긴 투영 응답입니다.
     """
-    url = f"{BASE_URL}/person/{person_id}/movie_credits?api_key={API_KEY}&language={language}"
     try:
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        return {}
+        return tmdb_client.get_json(f"/person/{person_id}/movie_credits", {"language": language})
     except Exception as e:
         print(f"Error fetching person movie credits: {e}")
         return {}
@@ -299,21 +280,17 @@ def fetch_person_movie_credits(person_id, language="ko-KR"):
 # ---------------- 키워드 관련 함수 ----------------
 def search_keyword_movies(query):
     """키워드로 영화를 검색합니다."""
-    url = f"{BASE_URL}/search/keyword?api_key={API_KEY}&query={query}"
     try:
-        response = requests.get(url)
-        return response.json().get("results", []) if response.status_code == 200 else []
+        return tmdb_client.get_json("/search/keyword", {"query": query}).get("results", [])
     except Exception as e:
         print(f"Error searching for keyword: {e}")
         return []
 
 def fetch_movies_by_keyword(keyword_id):
     """특정 키워드에 해당하는 영화 목록을 가져옵니다."""
-    url = f"{BASE_URL}/discover/movie?api_key={API_KEY}&with_keywords={keyword_id}&language=ko-KR"
     try:
-        response = requests.get(url)
-        movies = response.json().get("results", []) if response.status_code == 200 else []
-        return [translate_movie(movie) for movie in movies]
+        movies = tmdb_client.get_json("/discover/movie", {"with_keywords": keyword_id, "language": "ko-KR"}).get("results", [])
+        return [translate_movie(dict(movie)) for movie in movies]
     except Exception as e:
         print(f"Error fetching movies by keyword: {e}")
         return []
@@ -322,18 +299,12 @@ def fetch_similar_movies(movie_id, page=1, language="ko-KR"):
     """
     특정 영화와 유사한 영화 목록을 가져옵니다.
     """
-    url = f"{BASE_URL}/movie/{movie_id}/similar"
     params = {
-        "api_key": API_KEY,
         "language": language,
         "page": page
     }
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
-        return []
+        return tmdb_client.get_json(f"/movie/{movie_id}/similar", params).get("results", [])
     except Exception as e:
         print(f"Error fetching similar movies: {e}")
         return []
@@ -342,18 +313,12 @@ def fetch_movie_reviews(movie_id, page=1, language="ko-KR"):
     """
     특정 영화의 사용자 리뷰를 가져옵니다.
     """
-    url = f"{BASE_URL}/movie/{movie_id}/reviews"
     params = {
-        "api_key": API_KEY,
         "language": language,
         "page": page
     }
     try:
-        response = requests.get(url, params=params)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get("results", [])
-        return []
+        return tmdb_client.get_json(f"/movie/{movie_id}/reviews", params).get("results", [])
     except Exception as e:
         print(f"Error fetching movie reviews: {e}")
         return []
@@ -361,20 +326,9 @@ def fetch_movie_reviews(movie_id, page=1, language="ko-KR"):
 
 
 def add_favorite_movie(movie_id):
-    """영화를 즐겨찾기에 추가합니다."""
+    """영화를 즐겨찾기에 추가합니다. (계정 ID로 요청하고 캐시된 즐겨찾기 목록에도 바로 반영)"""
     session_id = st.session_state.get("SESSION_ID")
     if not session_id:
         return False
-    url = f"{BASE_URL}/account/{session_id}/favorite?api_key={API_KEY}"
-    payload = {
-        "media_type": "movie",
-        "media_id": movie_id,
-        "favorite": True
-    }
-    try:
-        response = requests.post(url, json=payload)
-        return response.status_code == 201
-    except Exception as e:
-        print(f"Error adding favorite movie: {e}")
-        return False
+    return account_lists.set_favorite(session_id, movie_id, True)
     
@@ -0,0 +1,240 @@
+"""
+📌 노출(impression)/클릭 이벤트 기록
+
+화면 코드는 record()/track()만 호출하고, 디스크 쓰기는 백그라운드 스레드가 모아서 처리합니다.
+- 이벤트는 메모리의 고정 크기 링 버퍼에 들어가며, 가득 차면 새 이벤트를 버리고 버린 개수만 셉니다 (화면은 기다리지 않음).
+- 기록 스레드는 FLUSH_INTERVAL초마다(또는 FLUSH_BATCH개가 쌓이면) 버퍼를 비워 gzip JSON Lines 조각 파일에 덧붙입니다.
+- 조각은 크기/시간 기준으로 교체되며, 쓰는 중인 조각은 .part, 끝난 조각은 .jsonl.gz 이름을 가집니다.
+- iter_events()는 끝난 조각을 시간 순서대로 한 줄씩 읽어 오프라인 학습/프리페치 조정에 넘깁니다.
+
+사용 예:
+    python -m src.event_log read --since 2026-10-01 > events.jsonl
+    python -m src.event_log read --follow          # 새 조각이 생길 때마다 계속 출력
+    python -m src.event_log stats
+"""
+import argparse
+import atexit
+import datetime
+import gzip
+import os
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, deque
+from typing import Dict, Iterator, Optional
+
+from src.json_projection import dumps, loads
+
+# ---------------- 이벤트 로그 설정 ----------------
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", "data/events")
+RING_SIZE = 10000                  # 메모리 버퍼에 쌓아 둘 수 있는 최대 이벤트 수
+FLUSH_INTERVAL = 2.0               # 기록 스레드가 버퍼를 비우는 주기 (초)
+FLUSH_BATCH = 500                  # 이만큼 쌓이면 주기를 기다리지 않고 바로 비움
+ROTATE_BYTES = 32 * 1024 * 1024    # 조각 하나에 담는 최대 크기 (압축 전)
+ROTATE_INTERVAL = 60 * 60          # 조각 하나를 쓰는 최대 시간 (초)
+SEGMENT_SUFFIX = ".jsonl.gz"
+PROFILE_KEY_STATE = "PROFILE_KEY"  # 세션 상태에서 프로필 키를 읽는 이름 (auth_user가 게스트 프로필을 열 때 설정)
+DEFAULT_PROFILE_KEY = "user_profile"  # auth_user.USER_DATA_FILE 프로필의 키 (collab_filter.load_profiles와 동일)
+
+_buffer = deque()
+_stats = {"dropped": 0, "written": 0, "segments": 0}
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_writer = None
+_segment = None
+
+
+# ---------------- 기록 API ----------------
+def record(event: str, **fields) -> bool:
+    """📌 이벤트 하나를 버퍼에 넣음 (디스크 I/O 없음, 버퍼가 가득 차면 버리고 False)"""
+    if len(_buffer) >= RING_SIZE:
+        _stats["dropped"] += 1
+        return False
+    _buffer.append((time.time(), event, fields))
+    if _writer is None:
+        _start()
+    elif len(_buffer) >= FLUSH_BATCH:
+        _wake.set()
+    return True
+
+
+def track(event: str, dedupe_key=None, **fields) -> bool:
+    """
+    📌 Streamlit 화면용 기록: 세션 ID와 프로필 키(user)를 붙이고, dedupe_key가 있으면 세션당 한 번만 기록
+    (다시 실행(rerun)될 때마다 같은 카드의 노출이 반복 기록되지 않도록)
+    user는 collab_filter.load_profiles의 사용자 키와 같아 오프라인 평가에서 이벤트를 프로필과 연결할 수 있습니다.
+    """
+    import streamlit as st
+
+    state = st.session_state
+    session = state.setdefault("event_session", uuid.uuid4().hex[:16])
+    fields.setdefault("user", state.get(PROFILE_KEY_STATE) or DEFAULT_PROFILE_KEY)
+    if dedupe_key is not None:
+        seen = state.setdefault("event_seen", set())
+        if dedupe_key in seen:
+            return False
+        seen.add(dedupe_key)
+    return record(event, session=session, **fields)
+
+
+def stats() -> Dict:
+    """📌 버퍼에 남은 수, 버린 수, 기록한 수, 완료한 조각 수"""
+    return dict(_stats, buffered=len(_buffer))
+
+
+# ---------------- 기록 스레드 ----------------
+class _Segment:
+    """📌 쓰는 중인 gzip 조각 (.part) - 끝나면 이름을 바꿔 읽기 대상으로 공개"""
+
+    def __init__(self, directory: str, seq: int):
+        stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S")
+        self.path = os.path.join(directory, f"events-{stamp}-{os.getpid()}-{seq:04d}{SEGMENT_SUFFIX}")
+        self.file = gzip.open(f"{self.path}.part", "ab")
+        self.opened_at = time.time()
+        self.size = 0
+
+    def write(self, data: bytes):
+        self.file.write(data)
+        self.file.flush(zlib.Z_SYNC_FLUSH)  # 비정상 종료 시에도 여기까지는 읽을 수 있도록
+        self.size += len(data)
+
+    def due(self) -> bool:
+        return self.size >= ROTATE_BYTES or time.time() - self.opened_at >= ROTATE_INTERVAL
+
+    def close(self):
+        self.file.close()
+        os.replace(f"{self.path}.part", self.path)
+
+
+def _finalize_orphans(directory: str):
+    """📌 이전 프로세스가 남긴 .part 조각을 완료 처리 (마지막 동기화 지점까지 읽을 수 있음)"""
+    for name in os.listdir(directory):
+        if not name.endswith(f"{SEGMENT_SUFFIX}.part"):
+            continue
+        try:
+            pid = int(name.split("-")[2])  # events-<시각>-<pid>-<순번>.jsonl.gz.part
+        except (IndexError, ValueError):
+            continue
+        if pid == os.getpid():
+            continue
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            os.replace(os.path.join(directory, name), os.path.join(directory, name[:-len(".part")]))
+        except OSError:
+            pass  # 다른 사용자 프로세스가 살아 있음
+
+
+def flush(final: bool = False):
+    """📌 버퍼를 비워 현재 조각에 덧붙임 (final=True면 조각을 닫아 완료 처리)"""
+    global _segment
+    with _flush_lock:
+        lines = []
+        while True:
+            try:
+                ts, event, fields = _buffer.popleft()
+            except IndexError:
+                break
+            lines.append(dumps(dict(fields, ts=ts, event=event)))
+        if lines:
+            if _segment is None:
+                os.makedirs(EVENT_LOG_DIR, exist_ok=True)
+                _segment = _Segment(EVENT_LOG_DIR, _stats["segments"])
+            _segment.write(b"\n".join(lines) + b"\n")
+            _stats["written"] += len(lines)
+        if _segment is not None and (final or _segment.due()):
+            _segment.close()
+            _segment = None
+            _stats["segments"] += 1
+
+
+def _run():
+    while True:
+        _wake.wait(FLUSH_INTERVAL)
+        _wake.clear()
+        try:
+            flush()
+        except Exception as e:
+            print(f"Error writing event log: {e}")
+
+
+def _start():
+    """📌 기록 스레드 시작 (첫 이벤트가 들어올 때 한 번)"""
+    global _writer
+    with _start_lock:
+        if _writer is not None:
+            return
+        try:
+            os.makedirs(EVENT_LOG_DIR, exist_ok=True)
+            _finalize_orphans(EVENT_LOG_DIR)
+        except Exception as e:
+            print(f"Error preparing event log directory: {e}")
+        _writer = threading.Thread(target=_run, name="event-log-writer", daemon=True)
+        _writer.start()
+        atexit.register(flush, True)
+
+
+# ---------------- 읽기 (오프라인 학습/프리페치 조정) ----------------
+def iter_events(since: float = 0.0, directory: Optional[str] = None, follow: bool = False,
+                poll: float = 5.0) -> Iterator[Dict]:
+    """
+    📌 완료된 조각을 시간 순서대로 한 줄씩 읽어 since 이후 이벤트를 반환 (파일 전체를 메모리에 올리지 않음)
+    follow=True이면 모든 조각을 읽은 뒤에도 새로 완료되는 조각을 기다리며 계속 반환합니다.
+    """
+    directory = directory or EVENT_LOG_DIR
+    done = set()
+    while True:
+        names = sorted(n for n in os.listdir(directory) if n.endswith(SEGMENT_SUFFIX)) if os.path.isdir(directory) else []
+        for name in names:
+            if name in done:
+                continue
+            done.add(name)
+            try:
+                with gzip.open(os.path.join(directory, name), "rb") as f:
+                    for line in f:
+                        event = loads(line)
+                        if event.get("ts", 0) >= since:
+                            yield event
+            except (EOFError, gzip.BadGzipFile, zlib.error):
+                print(f"Event log segment truncated: {name}", file=sys.stderr)  # 비정상 종료로 끝이 잘린 조각
+        if not follow:
+            return
+        time.sleep(poll)
+
+
+def _parse_since(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="노출/클릭 이벤트 로그 읽기")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("read", "stats"):
+        command = sub.add_parser(name)
+        command.add_argument("--since", default="0", help="유닉스 시각 또는 ISO 날짜 (예: 2026-10-01)")
+        command.add_argument("--dir", default=EVENT_LOG_DIR)
+        if name == "read":
+            command.add_argument("--follow", action="store_true")
+    args = parser.parse_args(argv)
+
+    events = iter_events(_parse_since(args.since), args.dir, follow=getattr(args, "follow", False))
+    if args.command == "read":
+        out = sys.stdout.buffer
+        for event in events:
+            out.write(dumps(event) + b"\n")
+            if args.follow:
+                out.flush()
+        return
+    counts = Counter(event.get("event") for event in events)
+    for name, count in counts.most_common():
+        print(f"{name}\t{count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+📌 배우 필모그래피 보기 (보여 주는 페이지만 번역)
+
+배우의 전체 출연작을 한 번에 번역하면 출연작 수만큼 번역 요청이 나가지만 화면에는 몇 편만 보입니다.
+- 출연작은 투영된 크레딧 응답 한 번으로 받아 압축 튜플(Credit)로만 보관합니다.
+- 정렬(인기순/최신순)은 서버에서 하고, 필요한 만큼만 상위 k개를 고릅니다 (heapq, 전체 정렬 없음).
+- 번역은 화면에 표시하는 페이지의 영화만 한 번의 병렬 요청(get_many_json)으로 가져옵니다.
+- 페이지를 보여 주면 다음 페이지를 백그라운드에서 미리 번역해 둡니다.
+그래서 비용은 경력의 길이가 아니라 본 페이지 수에 비례합니다.
+"""
+import heapq
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src import tmdb_client
+from src.data_fetcher import translate_movies
+
+# ---------------- 필모그래피 설정 ----------------
+PAGE_SIZE = 10
+MAX_PEOPLE = 64              # 프로세스에 보관하는 배우 수 (오래 안 본 배우부터 제거)
+PREFETCH_WORKERS = 2
+SORTS = {
+    "popularity": lambda credit: (credit.popularity, credit.vote_count),
+    "date": lambda credit: credit.release_date or "",
+}
+
+_people: "OrderedDict[int, Filmography]" = OrderedDict()
+_people_lock = threading.Lock()
+_prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="filmography")
+
+
+class Credit(NamedTuple):
+    """📌 출연작 하나 (번역 전 원본 필드 중 화면에 쓰는 것만)"""
+    id: int
+    title: str
+    original_title: str
+    overview: str
+    release_date: str
+    vote_average: float
+    vote_count: int
+    popularity: float
+    poster_path: Optional[str]
+    genre_ids: Tuple[int, ...]
+    character: str
+
+
+def _credits(cast: List[Dict]) -> Tuple[Credit, ...]:
+    """📌 cast 배열을 Credit 튜플로 (한 영화에 여러 배역으로 나오는 중복 제거)"""
+    seen, credits = set(), []
+    for movie in cast:
+        movie_id = movie.get("id")
+        if not movie_id or movie_id in seen:
+            continue
+        seen.add(movie_id)
+        credits.append(Credit(
+            id=movie_id, title=movie.get("title") or "", original_title=movie.get("original_title") or "",
+            overview=movie.get("overview") or "", release_date=movie.get("release_date") or "",
+            vote_average=movie.get("vote_average") or 0.0, vote_count=movie.get("vote_count") or 0,
+            popularity=movie.get("popularity") or 0.0, poster_path=movie.get("poster_path"),
+            genre_ids=tuple(movie.get("genre_ids") or ()), character=movie.get("character") or "",
+        ))
+    return tuple(credits)
+
+
+# ---------------- 필모그래피 보기 ----------------
+class Filmography:
+    """📌 배우 한 명의 출연작 목록과 정렬 순서별 번역된 페이지"""
+
+    def __init__(self, person_id: int, credits: Tuple[Credit, ...]):
+        self.person_id = person_id
+        self.credits = credits
+        self._ranked: Dict[str, List[Credit]] = {}              # 정렬 이름 → 지금까지 고른 상위 k개
+        self._pages: Dict[Tuple[str, int], List[Dict]] = {}     # (정렬 이름, 페이지) → 번역된 영화
+        self._futures: Dict[Tuple[str, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.credits)
+
+    @property
+    def page_count(self) -> int:
+        return -(-len(self.credits) // PAGE_SIZE)
+
+    def ranked(self, sort: str, k: int) -> List[Credit]:
+        """📌 정렬 기준 상위 k개 (이미 더 많이 골라 두었으면 그 앞부분)"""
+        with self._lock:
+            ranked = self._ranked.get(sort)
+            if ranked is None or (len(ranked) < k and len(ranked) < len(self.credits)):
+                ranked = heapq.nlargest(k, self.credits, key=SORTS[sort])
+                self._ranked[sort] = ranked
+        return ranked[:k]
+
+    def _hydrate(self, sort: str, number: int) -> List[Dict]:
+        start = number * PAGE_SIZE
+        try:
+            credits = self.ranked(sort, start + PAGE_SIZE)[start:]
+            movies = translate_movies(credit._asdict() for credit in credits)
+            with self._lock:
+                self._pages[(sort, number)] = movies
+            return movies
+        finally:
+            # 실패한 미리 번역은 버려서 다음 page() 호출이 같은 예외를 되풀이하지 않고 다시 시도하게 함
+            with self._lock:
+                self._futures.pop((sort, number), None)
+
+    def page(self, number: int, sort: str = "popularity", prefetch: bool = True) -> List[Dict]:
+        """📌 페이지 하나의 번역된 영화 목록 (다음 페이지는 백그라운드에서 미리 번역)"""
+        with self._lock:
+            movies = self._pages.get((sort, number))
+            future = self._futures.get((sort, number))
+        if movies is None:
+            movies = future.result() if future else self._hydrate(sort, number)
+        if prefetch:
+            self.prefetch(number + 1, sort)
+        return movies
+
+    def prefetch(self, number: int, sort: str = "popularity"):
+        """📌 아직 번역하지 않은 페이지를 백그라운드에서 준비"""
+        if number >= self.page_count:
+            return
+        with self._lock:
+            key = (sort, number)
+            if key in self._pages or key in self._futures:
+                return
+            self._futures[key] = _prefetch_pool.submit(self._hydrate, sort, number)
+
+    def top(self, k: int, sort: str = "popularity") -> List[Dict]:
+        """📌 상위 k편을 번역해 반환 (한 페이지 이내면 페이지 캐시를 사용)"""
+        if k <= PAGE_SIZE:
+            return self.page(0, sort, prefetch=False)[:k]
+        return translate_movies(credit._asdict() for credit in self.ranked(sort, k))
+
+
+def get_filmography(person_id: int, language: str = tmdb_client.LANGUAGE) -> Filmography:
+    """📌 배우의 필모그래피 보기 (크레딧 요청 한 번, 이후에는 프로세스 안에서 재사용)"""
+    with _people_lock:
+        if person_id in _people:
+            _people.move_to_end(person_id)
+            return _people[person_id]
+    data = tmdb_client.get_json(f"/person/{person_id}/movie_credits", {"language": language})
+    filmography = Filmography(person_id, _credits(data.get("cast", [])))
+    with _people_lock:
+        filmography = _people.setdefault(person_id, filmography)
+        _people.move_to_end(person_id)
+        while len(_people) > MAX_PEOPLE:
+            _people.popitem(last=False)
+    return filmography
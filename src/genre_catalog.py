@@ -0,0 +1,128 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from src import hot_lists, tmdb_client
+
+# ---------------- 장르 카탈로그 설정 ----------------
+CATALOG_FILE = os.getenv("GENRE_CATALOG_FILE", "data/genre_catalog.json")
+CATALOG_REFRESH_INTERVAL = 24 * 60 * 60
+TOP_N_PER_GENRE = 100          # 장르별 인기순 후보 영화 수 (TMDb 한 페이지 = 20편)
+FETCH_WORKERS = 8
+SEARCH_LIMIT = 200             # 멀티셀렉트에 한 번에 보여줄 최대 후보 수
+
+
+# ---------------- 카탈로그 생성 ----------------
+def _fetch_genre_movies(genre_id: int) -> tuple:
+    """📌 장르별 인기 영화 상위 N편을 한국어 제목으로 가져옴 (개별 번역 요청 없음)"""
+    movies = []
+    for page in range(1, TOP_N_PER_GENRE // 20 + 1):
+        data = tmdb_client.get_json("/discover/movie", {
+            "language": tmdb_client.LANGUAGE, "with_genres": genre_id,
+            "sort_by": "popularity.desc", "page": page,
+        })
+        for movie in data.get("results", []):
+            movies.append((movie["id"], movie.get("title") or movie.get("original_title", ""),
+                           (movie.get("release_date") or "")[:4]))
+        if page >= data.get("total_pages", 1):
+            break
+    return tuple(movies[:TOP_N_PER_GENRE])
+
+
+def build_catalog() -> tuple:
+    """📌 전체 장르의 후보 카탈로그를 만들고 스냅샷 파일로 저장"""
+    genres = tmdb_client.get_json("/genre/movie/list", {"language": tmdb_client.LANGUAGE}).get("genres", [])
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        movie_lists = list(pool.map(_fetch_genre_movies, [g["id"] for g in genres]))
+    catalog = tuple(
+        {"id": g["id"], "name": g["name"], "movies": movies}
+        for g, movies in zip(genres, movie_lists)
+    )
+    save_catalog(catalog)
+    return catalog
+
+
+def save_catalog(catalog: tuple):
+    """📌 카탈로그를 JSON 스냅샷 파일로 원자적으로 저장"""
+    os.makedirs(os.path.dirname(CATALOG_FILE), exist_ok=True)
+    tmp_path = f"{CATALOG_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"generated_at": time.time(), "genres": list(catalog)}, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, CATALOG_FILE)
+
+
+def load_catalog_file() -> float:
+    """📌 시작 시 스냅샷 파일을 읽어 메모리에 올림 (생성 시각 반환, 파일이 없으면 0)"""
+    if not os.path.exists(CATALOG_FILE):
+        return 0.0
+    try:
+        with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Error loading genre catalog: {e}")
+        return 0.0
+    catalog = tuple(
+        {"id": g["id"], "name": g["name"], "movies": tuple(tuple(m) for m in g["movies"])}
+        for g in data.get("genres", [])
+    )
+    hot_lists.seed("genre_catalog", catalog, data.get("generated_at", 0.0))
+    return data.get("generated_at", 0.0)
+
+
+_generated_at = load_catalog_file()
+hot_lists.register_job(
+    "genre_catalog", build_catalog, CATALOG_REFRESH_INTERVAL,
+    first_run=_generated_at + CATALOG_REFRESH_INTERVAL if _generated_at else None,
+)
+
+
+# ---------------- 메모리 조회 ----------------
+def ready() -> bool:
+    """📌 카탈로그 스냅샷이 메모리에 있는지 (없으면 백그라운드 스케줄러가 만드는 중)"""
+    return bool(hot_lists.get_snapshot("genre_catalog", wait=0))
+
+
+def get_genres(wait: float = 0.0) -> List[Dict]:
+    """
+    📌 카탈로그에 포함된 장르 목록 ({"id", "name"})
+    화면 렌더링에서 부르므로 기본적으로 기다리지 않고, 카탈로그가 아직 없으면 빈 목록을 반환합니다.
+    """
+    return [{"id": g["id"], "name": g["name"]} for g in hot_lists.get_snapshot("genre_catalog", wait=wait)]
+
+
+def titles_for_genres(genre_ids: Iterable[int], wait: float = 0.0) -> List[str]:
+    """📌 선택한 장르들의 후보 영화 제목 (인기순, 중복 제거) - 네트워크 호출 없음, 카탈로그가 없으면 빈 목록"""
+    wanted = set(genre_ids)
+    seen = set()
+    titles = []
+    for genre in hot_lists.get_snapshot("genre_catalog", wait=wait):
+        if genre["id"] not in wanted:
+            continue
+        for _, title, _ in genre["movies"]:
+            if title and title not in seen:
+                seen.add(title)
+                titles.append(title)
+    return titles
+
+
+def find_movie_ids(titles: Iterable[str]) -> List[int]:
+    """📌 카탈로그에서 제목으로 영화 ID 찾기 (입력 순서 유지, 없는 제목은 건너뜀)"""
+    wanted = list(titles)
+    wanted_set = set(wanted)
+    found = {}
+    for genre in hot_lists.get_snapshot("genre_catalog"):
+        for movie_id, title, _ in genre["movies"]:
+            if title in wanted_set and title not in found:
+                found[title] = movie_id
+    return [found[t] for t in wanted if t in found]
+
+
+def search_titles(titles: List[str], query: str, limit: int = SEARCH_LIMIT) -> List[str]:
+    """📌 후보 제목 중 검색어(공백/대소문자 무시)를 포함하는 제목을 최대 limit개 반환"""
+    needle = query.replace(" ", "").lower()
+    if not needle:
+        return titles[:limit]
+    matches = [t for t in titles if needle in t.replace(" ", "").lower()]
+    return matches[:limit]
@@ -0,0 +1,21 @@
+"""
+📌 선호 장르/무드 이름 → TMDb 장르 ID 매핑
+
+Streamlit이나 외부 API 설정 없이 가져올 수 있도록 상수만 둡니다
+(배치 작업 daily_recs와 그 워커 프로세스, 오프라인 평가에서도 같은 매핑을 씀).
+"""
+
+# ✅ 장르 매핑
+GENRE_MAP = {
+    "액션": 28, "코미디": 35, "드라마": 18, "로맨스": 10749,
+    "스릴러": 53, "SF": 878, "애니메이션": 16, "판타지": 14,
+    "공포": 27, "다큐멘터리": 99, "역사": 36, "모험": 12
+}
+
+# ✅ 감정(무드) → 장르 매핑
+MOOD_TO_GENRE = {
+    "행복한": [35, 10751], "슬픈": [18, 10749], "신나는": [28, 12],
+    "로맨틱한": [10749, 35], "무서운": [27, 53], "미스터리한": [9648, 80],
+    "판타지한": [14, 12], "편안한": [99, 10770], "추억을 떠올리는": [10752, 36],
+    "SF 같은": [878, 28]
+}
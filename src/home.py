@@ -1,113 +1,152 @@
 import streamlit as st
+import json
 import random
-from src.movie_recommend  import get_trending_movies, get_personalized_recommendations
+from src import hot_lists, daily_recs, event_log, card_grid
 from src.auth_user import load_user_preferences
-from src.data_fetcher import get_movie_director_and_cast, fetch_movie_details
+from src.movie_record import records_from_tmdb, get_records, register
 
-# ---------------- 전역 변수 ----------------
-# 전역 변수로 이미 표시된 영화 ID를 저장하여 중복 방지
-displayed_movie_ids = set()
+# ---------------- 홈 레이아웃 설정 ----------------
+CARDS_PER_SECTION = 5
+RECOMMENDED_SECTION = "🍿 오늘의 추천 영화"
 
 # ---------------- 새로운 함수 추가 ----------------
+# 목록은 백그라운드 스케줄러(hot_lists)가 상세+크레딧까지 미리 채워 두므로 메모리에서만 읽습니다.
+def get_trending_movies():
+    """트렌딩 영화 목록을 반환"""
+    return hot_lists.get_snapshot("trending")
+
 def get_latest_popular_movies():
     """최신 인기 영화 목록을 반환"""
-    return get_trending_movies()
+    return hot_lists.get_snapshot("now_playing")
 
 def get_current_popular_movies():
     """현재 인기 영화 목록을 반환"""
-    return get_trending_movies()
+    return hot_lists.get_snapshot("popular")
 
 def get_realtime_popular_movies():
     """실시간 인기 영화 목록을 반환"""
-    return get_trending_movies()
+    return hot_lists.get_snapshot("trending")
 
-def show_full_movie_details(movie):
+HOME_SECTIONS = [
+    ("🔝 트렌드 영화", get_trending_movies),
+    ("🚀 최신 인기 영화", get_latest_popular_movies),
+    ("🎥 현재 인기 영화", get_current_popular_movies),
+    ("📈 실시간 인기 영화", get_realtime_popular_movies),
+]
+
+# ---------------- 세션별 홈 레이아웃 ----------------
+def _pick_ids(records, used):
+    """섹션에 표시할 영화를 무작위로 고르되, 앞 섹션에 나온 영화는 제외"""
+    candidates = [record for record in records if record.id not in used]
+    picked = random.sample(candidates, min(CARDS_PER_SECTION, len(candidates)))
+    used.update(record.id for record in picked)
+    return tuple(record.id for record in picked)
+
+def _ensure_credits(movie_ids):
+    """크레딧이 없는 영화만 상세+크레딧을 한 번 채워 둠 (레이아웃 생성 시 1회)"""
+    missing = [record.id for record in get_records(movie_ids) if not record.directors and not record.cast]
+    if missing:
+        try:
+            hot_lists.hydrate_all(missing, hedge=True)
+        except Exception as e:
+            print(f"Error hydrating home movies: {e}")
+
+def build_home_layout(user_profile):
     """
-    영화의 전체 상세 정보를 출력
+    세션마다 한 번만 홈 화면 구성을 계산
+    섹션 제목과 영화 ID만 보관하며, 다시 실행(rerun)되어도 같은 카드가 유지됩니다.
     """
-    movie_id = movie.get("id")
-    if not movie_id:
-        st.write("상세 정보가 없습니다.")
-        return
+    used = set()
+    sections = []
+    for title, loader in HOME_SECTIONS:
+        sections.append((title, _pick_ids(records_from_tmdb(loader()), used)))
+
+    # 오늘의 추천은 밤마다 미리 계산된 결과를 읽고, 새/변경된 프로필만 즉석 계산
+    recommended = daily_recs.get_recommendations(daily_recs.LOCAL_USER_KEY, user_profile) if user_profile else ()
+    sections.append((RECOMMENDED_SECTION, _pick_ids(recommended, used)))
+
+    for _, movie_ids in sections:
+        _ensure_credits(movie_ids)
+    return tuple(sections)
+
+def get_home_layout():
+    """현재 세션의 홈 레이아웃 반환 (프로필이 바뀐 경우에만 다시 계산)"""
+    user_profile = load_user_preferences()
+    profile_key = json.dumps(user_profile, ensure_ascii=False, sort_keys=True)
+    layout = st.session_state.get("home_layout")
+    if not layout or layout["profile_key"] != profile_key:
+        layout = {"profile_key": profile_key, "sections": build_home_layout(user_profile)}
+        st.session_state["home_layout"] = layout
+    return layout["sections"]
+
+def _resolve_records(movie_ids):
+    """영화 ID를 최신 레코드로 변환 (레지스트리에서 빠진 항목은 스냅샷에서 다시 등록)"""
+    records = get_records(movie_ids)
+    if len(records) < len(movie_ids):
+        for _, loader in HOME_SECTIONS:
+            for record in loader():
+                if record.id in movie_ids:
+                    register(record)
+        records = get_records(movie_ids)
+    return records
 
-    details = fetch_movie_details(movie_id)
-    if not details:
+# ---------------- 카드 렌더링 ----------------
+def show_full_movie_details(movie):
+    """
+    영화의 전체 상세 정보를 출력 (레코드에 이미 있는 정보만 사용, 추가 요청 없음)
+    """
+    if not movie or not movie.id:
         st.write("상세 정보가 없습니다.")
         return
 
-    title = details.get("title", "제목 없음")
-    release_date = details.get("release_date", "정보 없음")
-    vote_average = details.get("vote_average", "정보 없음")
-    overview = details.get("overview", "줄거리 없음")
-    
-    # 감독 및 출연진 정보 가져오기
-    directors, cast = get_movie_director_and_cast(movie_id)
-    director_str = ", ".join(directors) if directors else "정보 없음"
-    cast_str = ", ".join(cast[:10]) if cast else "정보 없음"
+    director_str = ", ".join(movie.directors) if movie.directors else "정보 없음"
+    cast_str = ", ".join(movie.cast[:10]) if movie.cast else "정보 없음"
 
     # 상세 정보 출력
-    st.markdown(f"### {title}")
-    st.write(f"**개봉일:** {release_date}")
-    st.write(f"**평점:** {vote_average}/10")
-    st.write(f"**줄거리:** {overview}")
+    st.markdown(f"### {movie.title}")
+    st.write(f"**개봉일:** {movie.release_date or '정보 없음'}")
+    st.write(f"**평점:** {movie.vote_average or '정보 없음'}/10")
+    st.write(f"**줄거리:** {movie.overview or '줄거리 없음'}")
     if director_str != "정보 없음":
         st.write(f"**감독:** {director_str}")
     if cast_str != "정보 없음":
         st.write(f"**출연진:** {cast_str}")
 
+def _log_open(section, movie_ids, key):
+    """자세히 볼 영화를 골랐을 때만 기록 (선택을 해제할 때는 기록하지 않음)"""
+    movie_id = st.session_state.get(key)
+    if movie_id in movie_ids:
+        event_log.track("open", surface="home", section=section, movie_id=movie_id,
+                        position=movie_ids.index(movie_id))
+
+@st.fragment
 def show_movie_section(title, movies):
-    st.markdown(f"<h2 class='sub-header'>{title}</h2>", unsafe_allow_html=True)
-    if movies:
-        selected_movies = random.sample(movies, min(5, len(movies)))
-        cols = st.columns(5)
-        for idx, movie in enumerate(selected_movies):
-            with cols[idx]:
-                if not movie.get("directors") or not movie.get("cast"):
-                    directors, cast_list = get_movie_director_and_cast(movie.get("id"))
-                    movie["directors"] = [d.get("name", "정보 없음") for d in directors] if directors else ["정보 없음"]
-                    movie["cast"] = [c.get("name", "정보 없음") for c in cast_list] if cast_list else ["정보 없음"]
-                poster_url = movie.get("poster_path", "https://via.placeholder.com/500x750?text=No+Image")
-                title = movie.get("title", "제목 없음")
-                rating = movie.get("vote_average", "N/A")
-                release_date = movie.get("release_date", "정보 없음")
-                director_names = ", ".join(movie.get("directors", ["정보 없음"]))
-                cast_names = ", ".join(movie.get("cast", ["정보 없음"])[:3])
-                overview = movie.get("overview", "줄거리 없음")[:100] + "..."
-                
-                director_html = f"<p class='movie-info'>🎬 감독: {director_names}</p>" if director_names != "정보 없음" else ""
-                cast_html = f"<p class='movie-info'>👥 출연진: {cast_names}</p>" if cast_names != "정보 없음" else ""
-                
-                st.image(poster_url, width=250, use_container_width=False)
-                st.markdown(f"""
-                <div class='movie-card'>
-                    <p class='movie-title'>{title}</p>
-                    <p class='movie-info'>⭐ 평점: {rating}/10</p>
-                    <p class='movie-info'>🗓 개봉일: {release_date}</p>
-                    <p class='movie-info'>📜 줄거리: {overview}</p>
-                    {director_html}
-                    {cast_html}
-                </div>
-                """, unsafe_allow_html=True)
-                with st.expander("자세히 보기"):
-                    show_full_movie_details(movie)
+    """
+    영화 카드 섹션 출력
+    섹션 단위 fragment이므로 섹션 안의 상호작용은 이 섹션만 다시 그립니다.
+    카드 격자는 HTML 한 번(card_grid)으로 보내고, 자세히 보기는 섹션당 선택 위젯 하나로 처리합니다.
+    """
+    section = title
+    records = records_from_tmdb(movies)[:CARDS_PER_SECTION]
+    if records:
+        for idx, movie in enumerate(records):
+            event_log.track("impression", dedupe_key=("home", section, movie.id),
+                            surface="home", section=section, movie_id=movie.id, position=idx)
+        st.html(card_grid.grid_html(records, CARDS_PER_SECTION, title=section, poster_width=250))
+
+        by_id = {movie.id: movie for movie in records}
+        movie_ids = list(by_id)
+        details_key = f"details_{section}"
+        selected = st.pills("🔍 자세히 보기", movie_ids, format_func=lambda movie_id: by_id[movie_id].title,
+                            key=details_key, on_change=_log_open, args=(section, movie_ids, details_key))
+        if selected in by_id:
+            show_full_movie_details(by_id[selected])
     else:
-        st.warning(f"{title}를 불러오는 데 문제가 발생했습니다. 잠시 후 다시 시도해주세요.")
+        st.markdown(f"<h2 class='sub-header'>{section}</h2>", unsafe_allow_html=True)
+        st.warning(f"{section}를 불러오는 데 문제가 발생했습니다. 잠시 후 다시 시도해주세요.")
 
 def show_home_page():
     """홈페이지에서 영화 섹션을 표시하는 함수"""
-    # ✅ 트렌딩 영화 섹션
-    show_movie_section("🔝 트렌드 영화", get_trending_movies())
-    
-    # ✅ 최신 인기 영화 섹션
-    show_movie_section("🚀 최신 인기 영화", get_latest_popular_movies())
-    
-    # ✅ 현재 인기 영화 섹션
-    show_movie_section("🎥 현재 인기 영화", get_current_popular_movies())
-    
-    # ✅ 실시간 인기 영화 섹션
-    show_movie_section("📈 실시간 인기 영화", get_realtime_popular_movies())
-    
-    # ✅ 맞춤형 추천 영화 섹션
-    user_profile = load_user_preferences()
-    recommended_movies = get_personalized_recommendations(user_profile) if user_profile else []
-    show_movie_section("🍿 오늘의 추천 영화", recommended_movies)
+    # ✅ 세션별로 고정된 레이아웃(섹션별 영화 ID)을 메모리의 레코드로 그림
+    for title, movie_ids in get_home_layout():
+        show_movie_section(title, _resolve_records(movie_ids))
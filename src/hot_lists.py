@@ -0,0 +1,259 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from src import tmdb_client
+from src.movie_record import MovieRecord
+
+# ---------------- 스케줄러 설정 ----------------
+LIST_ENDPOINTS = {
+    "trending": "/trending/movie/week",
+    "popular": "/movie/popular",
+    "now_playing": "/movie/now_playing",
+    "top_rated": "/movie/top_rated",
+    "upcoming": "/movie/upcoming",
+}
+LIST_REFRESH_INTERVAL = 15 * 60       # 영화 목록 갱신 주기 (초)
+GENRE_REFRESH_INTERVAL = 24 * 60 * 60  # 장르 목록 갱신 주기 (초)
+JITTER_RATIO = 0.1                     # 갱신 시각을 ±10% 흔들어 동시 요청 분산
+BACKOFF_BASE = 30                      # 실패 시 첫 재시도 대기 (초)
+BACKOFF_MAX = 15 * 60                  # 실패 시 최대 재시도 대기 (초)
+RECORD_TTL = 6 * 60 * 60               # 목록에 계속 남아 있는 영화의 상세 정보를 다시 받기까지 (초)
+
+# 이름 → (갱신 시각, 불변 스냅샷). 항목 단위로 통째로 교체하므로 읽는 쪽은 잠금이 필요 없습니다.
+_snapshots: Dict[str, Tuple[float, tuple]] = {}
+_jobs: Dict[str, Dict] = {}
+_ready: Dict[str, threading.Event] = {}
+_lock = threading.Lock()
+_wake = threading.Event()
+_thread = None
+# 영화 ID → 상세 정보를 받은 시각. 목록 갱신 때 남아 있는 영화의 레코드를 다시 쓸지 판단합니다.
+_hydrated_at: Dict[int, float] = {}
+_last_delta: Dict[str, Dict[str, int]] = {}
+_list_pages: Dict[str, Dict] = {}      # 목록 이름 → 스냅샷을 만든 TMDb 목록 응답 (page, total_pages 등 포함)
+_records_lock = threading.Lock()
+
+
+# ---------------- 작업 정의 ----------------
+def hydrate_all(movie_ids, hedge: bool = False, allow_stale: bool = True) -> Tuple[MovieRecord, ...]:
+    """
+    📌 영화 ID 목록의 상세+크레딧을 받아 순서대로 반환 (캐시 한 번 조회 + 미스만 병렬 요청, 실패 항목 제외)
+    화면 렌더링 중 호출할 때는 hedge=True로 느린 응답 하나가 전체를 붙잡지 않게 합니다.
+    스냅샷 갱신은 allow_stale=False로 불러 장애 중의 지난 값이 새 스냅샷에 섞이지 않게 합니다.
+    """
+    records = []
+    results = tmdb_client.hydrate_movies(movie_ids, hedge=hedge, allow_stale=allow_stale)
+    for movie_id, result in zip(movie_ids, results):
+        if isinstance(result, Exception):
+            print(f"Error hydrating movie {movie_id}: {result}")
+        elif result:
+            records.append(result)
+    hydrated = tuple(records)
+    if movie_ids and not hydrated:
+        raise RuntimeError("모든 영화 상세 정보를 가져오지 못했습니다.")
+    return hydrated
+
+
+def _known_records(now: float) -> Tuple[Dict[int, MovieRecord], Dict[int, MovieRecord]]:
+    """
+    📌 현재 스냅샷들에 있는 영화 레코드 (목록끼리도 공유)
+    (RECORD_TTL 안에 받은 레코드, 기한이 지난 레코드까지 포함한 전체)를 반환합니다.
+    """
+    fresh, listed = {}, {}
+    with _records_lock:
+        for _, data in list(_snapshots.values()):
+            for record in data:
+                if isinstance(record, MovieRecord):
+                    listed[record.id] = record
+                    if now - _hydrated_at.get(record.id, 0.0) < RECORD_TTL:
+                        fresh[record.id] = record
+    return fresh, listed
+
+
+def _forget_unlisted():
+    """📌 어느 스냅샷에도 없는 영화의 수신 시각은 버림 (목록 밖으로 밀려난 영화가 쌓이지 않도록)"""
+    with _records_lock:
+        listed = {record.id for _, data in list(_snapshots.values()) for record in data
+                  if isinstance(record, MovieRecord)}
+        for movie_id in [movie_id for movie_id in _hydrated_at if movie_id not in listed]:
+            del _hydrated_at[movie_id]
+
+
+def hydrate_delta(name: str, movie_ids) -> Tuple[MovieRecord, ...]:
+    """
+    📌 새 ID 순서를 지난 스냅샷과 비교해 새로 들어온(또는 RECORD_TTL이 지난) 영화만 상세 조회
+    남아 있는 영화는 기존 레코드를 그대로 쓰고, 결과는 새 순서대로 반환합니다.
+    기한이 지난 영화를 다시 받지 못하면 이전 레코드를 그대로 두고(수신 시각은 그대로라 다음 갱신 때 다시 시도)
+    새로 받은 레코드에만 수신 시각을 기록합니다.
+    """
+    now = time.time()
+    known, listed = _known_records(now)
+    previous = {getattr(record, "id", None) for record in _snapshots.get(name, (0, ()))[1]}
+    missing = [movie_id for movie_id in dict.fromkeys(movie_ids) if movie_id not in known]
+    if missing:
+        hydrated = _hydrate_some(missing)
+        with _records_lock:
+            for record in hydrated:
+                known[record.id] = record
+                _hydrated_at[record.id] = now
+        for movie_id in missing:
+            if movie_id not in known and movie_id in listed:
+                known[movie_id] = listed[movie_id]
+    _last_delta[name] = {
+        "added": sum(1 for movie_id in movie_ids if movie_id not in previous),
+        "removed": len(previous - set(movie_ids) - {None}),
+        "hydrated": len(missing),
+    }
+    records = tuple(known[movie_id] for movie_id in dict.fromkeys(movie_ids) if movie_id in known)
+    if movie_ids and not records:
+        raise RuntimeError("모든 영화 상세 정보를 가져오지 못했습니다.")
+    return records
+
+
+def _hydrate_some(movie_ids) -> Tuple[MovieRecord, ...]:
+    """📌 목록에 새로 들어온 영화만 상세 조회 (전부 실패해도 남아 있는 영화로 스냅샷을 만들 수 있게 빈 결과)"""
+    try:
+        return hydrate_all(movie_ids, allow_stale=False)
+    except RuntimeError as e:
+        print(f"Error hydrating new list entries: {e}")
+        return ()
+
+
+def _list_loader(name: str, path: str) -> Callable[[], tuple]:
+    def load():
+        # 장애 중에는 지난 값으로 스냅샷을 덮지 않고 실패로 처리 → 기존 스냅샷 유지 + 백오프
+        data = tmdb_client.get_json(path, {"language": tmdb_client.LANGUAGE}, allow_stale=False)
+        records = hydrate_delta(name, [movie["id"] for movie in data.get("results", []) if movie.get("id")])
+        _list_pages[name] = data
+        return records
+    return load
+
+
+def _load_genres() -> tuple:
+    genres = tmdb_client.get_json("/genre/movie/list", {"language": tmdb_client.LANGUAGE}).get("genres", [])
+    return tuple({"id": g["id"], "name": g["name"]} for g in genres)
+
+
+def register_job(name: str, loader: Callable[[], tuple], interval: float, first_run: float = None):
+    """📌 주기적으로 갱신할 스냅샷 작업 등록 (이미 등록된 이름이면 무시)"""
+    with _lock:
+        if name in _jobs:
+            return
+        _jobs[name] = {
+            "loader": loader, "interval": interval,
+            "next_run": first_run or time.time(), "failures": 0, "last_error": None,
+        }
+        _ready.setdefault(name, threading.Event())
+    _wake.set()
+
+
+def seed(name: str, data: tuple, fetched_at: float):
+    """📌 디스크 등에서 읽은 스냅샷을 미리 채워 넣음 (첫 갱신 전에도 바로 읽을 수 있도록)"""
+    _snapshots[name] = (fetched_at, tuple(data))
+    with _records_lock:
+        for record in data:
+            if isinstance(record, MovieRecord):
+                _hydrated_at[record.id] = max(_hydrated_at.get(record.id, 0.0), fetched_at)
+    _ready.setdefault(name, threading.Event()).set()
+
+
+for _name, _path in LIST_ENDPOINTS.items():
+    register_job(_name, _list_loader(_name, _path), LIST_REFRESH_INTERVAL)
+register_job("genres", _load_genres, GENRE_REFRESH_INTERVAL)
+
+
+# ---------------- 스케줄러 루프 ----------------
+def _jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - JITTER_RATIO, 1 + JITTER_RATIO)
+
+
+def refresh(name: str) -> bool:
+    """
+    📌 스냅샷 하나를 즉시 갱신
+    실패하면 마지막 정상 스냅샷을 유지하고 지수 백오프로 다음 시도를 미룹니다.
+    """
+    job = _jobs[name]
+    try:
+        data = job["loader"]()
+    except Exception as e:
+        job["failures"] += 1
+        job["last_error"] = str(e)
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (job["failures"] - 1))
+        job["next_run"] = time.time() + _jittered(delay)
+        print(f"Error refreshing {name} snapshot: {e}")
+        return False
+
+    _snapshots[name] = (time.time(), tuple(data))  # 원자적 교체
+    _forget_unlisted()
+    job["failures"] = 0
+    job["last_error"] = None
+    job["next_run"] = time.time() + _jittered(job["interval"])
+    _ready[name].set()
+    return True
+
+
+def _run():
+    while True:
+        with _lock:
+            name, job = min(_jobs.items(), key=lambda item: item[1]["next_run"])
+        wait = job["next_run"] - time.time()
+        if wait > 0:
+            _wake.wait(wait)
+            _wake.clear()
+            continue
+        refresh(name)
+
+
+def start():
+    """📌 백그라운드 갱신 스레드 시작 (프로세스당 한 번만 실행)"""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, name="hot-lists-refresh", daemon=True)
+        _thread.start()
+
+
+# ---------------- 읽기 API ----------------
+def get_snapshot(name: str, wait: float = 10.0) -> tuple:
+    """
+    📌 메모리에 있는 최신 스냅샷 반환
+    프로세스가 막 시작되어 아직 스냅샷이 없을 때만 최대 wait초 동안 첫 갱신을 기다립니다.
+    """
+    if _thread is None:
+        start()
+    snapshot = _snapshots.get(name)
+    if snapshot is not None:
+        return snapshot[1]
+    _ready[name].wait(wait)
+    snapshot = _snapshots.get(name)
+    return snapshot[1] if snapshot else ()
+
+
+def get_list_page(name: str, wait: float = 10.0) -> Optional[Dict]:
+    """
+    📌 최신 스냅샷을 만든 TMDb 목록 응답(1페이지) 그대로 반환
+    프록시가 2페이지 이후의 TMDb 응답과 같은 형태(total_pages, total_results 포함)로 1페이지를 돌려줄 때 씁니다.
+    디스크 등에서 채운 스냅샷만 있고 아직 갱신하지 않았으면 None.
+    """
+    get_snapshot(name, wait)
+    return _list_pages.get(name)
+
+
+def snapshot_status() -> Dict[str, Dict]:
+    """📌 스냅샷별 나이, 연속 실패 횟수, 다음 갱신까지 남은 시간 보고"""
+    now = time.time()
+    status = {}
+    for name, job in list(_jobs.items()):
+        snapshot = _snapshots.get(name)
+        status[name] = {
+            "age_seconds": round(now - snapshot[0], 1) if snapshot else None,
+            "size": len(snapshot[1]) if snapshot else 0,
+            "failures": job["failures"],
+            "last_error": job["last_error"],
+            "next_refresh_in": round(max(0.0, job["next_run"] - now), 1),
+        }
+        if name in _last_delta:
+            status[name]["last_delta"] = dict(_last_delta[name])
+    return status
@@ -0,0 +1,83 @@
+"""
+📌 JSON 디코딩과 필드 투영(projection)
+
+TMDb 응답 중 화면에 필요한 필드만 남기기 위한 스키마 표현과 빠른 디코더를 제공합니다.
+- 스키마는 {필드 이름: True | 하위 스키마 | Items(...)} 형태의 딕셔너리입니다.
+- Items는 배열 항목마다 스키마를 적용하고, 조건(where)과 개수 제한(limit)을 걸 수 있습니다.
+- orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 동작합니다.
+"""
+import json
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+try:
+    import orjson  # 선택 의존성: C 구현 파서로 디코딩/인코딩이 수 배 빠름
+except ImportError:
+    orjson = None
+
+
+# ---------------- 디코딩 / 인코딩 ----------------
+def loads(data) -> Any:
+    """📌 bytes/str JSON 디코딩 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value) -> bytes:
+    """📌 공백 없는 UTF-8 JSON 바이트로 인코딩 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ---------------- 투영 스키마 ----------------
+class Items(NamedTuple):
+    """📌 배열 필드의 투영 규칙: 각 항목에 fields를 적용하고 where를 만족하는 앞쪽 limit개만 남김"""
+    fields: Optional[Dict] = None
+    limit: Optional[int] = None
+    where: Optional[Callable[[Dict], bool]] = None
+
+
+def compile_schema(schema) -> Callable[[Any], Any]:
+    """
+    📌 스키마를 투영 함수로 미리 변환 (요청마다 스키마를 해석하지 않도록)
+    값을 그대로 두는 필드는 한 번의 딕셔너리 컴프리헨션으로 복사합니다.
+    """
+    if schema is True:
+        return lambda value: value
+    if isinstance(schema, Items):
+        inner = compile_schema(schema.fields) if schema.fields else None
+        where, limit = schema.where, schema.limit
+
+        def project_items(value):
+            if not isinstance(value, list):
+                return value
+            items = value if where is None else [item for item in value if where(item)]
+            if limit is not None:
+                items = items[:limit]
+            return list(items) if inner is None else [inner(item) for item in items]
+        return project_items
+
+    leaves = tuple(name for name, sub in schema.items() if sub is True)
+    nested = tuple((name, compile_schema(sub)) for name, sub in schema.items() if sub is not True)
+
+    def project_object(value):
+        if not isinstance(value, dict):
+            return value
+        out = {name: value[name] for name in leaves if name in value}
+        for name, sub in nested:
+            if name in value:
+                out[name] = None if value[name] is None else sub(value[name])
+        return out
+    return project_object
+
+
+def project(value: Any, schema) -> Any:
+    """📌 디코딩된 값에서 스키마에 있는 필드만 새 구조로 복사 (없는 필드는 건너뜀)"""
+    return compile_schema(schema)(value)
+
+
+def loads_projected(data, projector: Optional[Callable[[Any], Any]] = None) -> Any:
+    """📌 JSON을 디코딩하고 곧바로 투영하여 원본 구조는 남기지 않음 (projector=None이면 전체 반환)"""
+    value = loads(data)
+    return value if projector is None else projector(value)
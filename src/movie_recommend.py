@@ -7,6 +7,9 @@ import logging
 from typing import List, Dict, Set, Tuple
 import pandas as pd
 from huggingface_hub import InferenceClient
+from src import hot_lists, autocomplete, card_grid, filmography
+from src.movie_record import records_from_tmdb
+from src.genre_map import GENRE_MAP, MOOD_TO_GENRE
 
 # ---------------- TMDb API 설정 ----------------
 API_KEY = st.secrets["MOVIEDB_API_KEY"]
@@ -31,11 +34,8 @@ def get_movie_details(movie_id: int) -> Dict:
 
 
 def get_trending_movies() -> List[Dict]:
-    """📌 주간 트렌딩 영화 목록을 가져옵니다."""
-    url = f"{BASE_URL}/trending/movie/week?api_key={API_KEY}&language=ko-KR"
-    response = requests.get(url)
-    movies = response.json().get("results", [])
-    return [format_movie_details(get_movie_details(movie["id"])) for movie in movies if get_movie_details(movie["id"])]
+    """📌 주간 트렌딩 영화 목록을 가져옵니다. (백그라운드 스냅샷에서 읽음)"""
+    return [format_movie_details(record._asdict()) for record in hot_lists.get_snapshot("trending")]
 
 
 def get_recommendations(movie_id: int) -> List[Dict]:
@@ -53,17 +53,11 @@ def get_movie_details(movie_id: int) -> Dict:
 
 
 def search_person(name: str) -> List[Dict]:
-    """📌 배우 이름으로 TMDb에서 배우 검색"""
-    url = f"{BASE_URL}/search/person?api_key={API_KEY}&language=ko-KR&query={name}"
-    response = requests.get(url)
-    return response.json().get("results", []) if response.status_code == 200 else []
+    """📌 배우 이름으로 배우 검색 (자동 완성 색인에 있으면 TMDb 호출 없이)"""
+    return autocomplete.resolve(name, kinds=("person",))["person"]
 
 
-def fetch_movies_by_person(person_id: int) -> List[Dict]:
-    """📌 특정 배우가 출연한 영화 목록을 가져옵니다."""
-    url = f"{BASE_URL}/person/{person_id}/movie_credits?api_key={API_KEY}&language=ko-KR"
-    response = requests.get(url)
-    return response.json().get("cast", []) if response.status_code == 200 else []
+FILMOGRAPHY_SORTS = {"인기순": "popularity", "최신순": "date"}
 
 
 def get_movie_recommendations_with_actor():
@@ -83,19 +77,27 @@ def get_movie_recommendations_with_actor():
             selected_actor_id = st.selectbox("🎭 출연 배우를 선택하세요", options=list(actor_dict.keys()), format_func=lambda x: actor_dict[x])
 
             if selected_actor_id:
+                sort = FILMOGRAPHY_SORTS[st.radio("정렬", list(FILMOGRAPHY_SORTS), horizontal=True, key="filmography_sort")]
+                pages_key = f"filmography_pages_{selected_actor_id}_{sort}"
+                pages = st.session_state.setdefault(pages_key, 1)
+
+                # ✅ 출연작 목록은 한 번만 받고, 보여 줄 페이지만 번역 (다음 페이지는 미리 준비)
                 with st.spinner(f"⏳ {actor_dict[selected_actor_id]} 출연 영화를 가져오는 중..."):
-                    movies = fetch_movies_by_person(selected_actor_id)
+                    try:
+                        view = filmography.get_filmography(selected_actor_id)
+                        movies = [movie for page in range(pages) for movie in view.page(page, sort)]
+                    except Exception as e:
+                        print(f"Error fetching filmography: {e}")
+                        view, movies = None, []
                 
                 if movies:
-                    st.markdown(f"### 🎬 {actor_dict[selected_actor_id]}의 출연작")
-
-                    # ✅ 최대 5개의 출연작만 표시
-                    for movie in movies[:5]:
-                        poster_url = f"https://image.tmdb.org/t/p/w500{movie.get('poster_path', '')}" if movie.get("poster_path") else "https://via.placeholder.com/500x750?text=No+Image"
-                        st.image(poster_url, width=150, caption=movie.get("title", "Unknown"))
-                        st.write(f"**{movie.get('title', 'Unknown')}** ({movie.get('release_date', 'Unknown')[:4]})")
-                        st.write(f"⭐ 평점: {movie.get('vote_average', 'N/A')}/10")
-                        st.write("---")
+                    st.markdown(f"### 🎬 {actor_dict[selected_actor_id]}의 출연작 ({len(movies)}/{len(view)})")
+                    st.html(card_grid.list_html(records_from_tmdb(movies), poster_width=150))
+
+                    # ✅ "더보기" 버튼 (남은 페이지가 있을 경우)
+                    if pages < view.page_count and st.button("➕ 더보기", key=f"more_{pages_key}"):
+                        st.session_state[pages_key] = pages + 1
+                        st.rerun()
                 else:
                     st.warning("❌ 선택한 배우의 출연작을 찾을 수 없습니다.")
         else:
@@ -103,17 +105,12 @@ def get_movie_recommendations_with_actor():
 
 # =========================== 📌 사용자 맞춤형 추천 ===========================
 
+# ✅ 장르/감정(무드) 매핑은 src.genre_map (배치 작업도 Streamlit 없이 가져올 수 있도록)
+
 def get_personalized_recommendations(profile: Dict) -> List[Dict]:
     """📌 사용자 프로필을 기반으로 맞춤 추천 영화를 가져옵니다."""
     
-    # ✅ 장르 매핑
-    genre_map = {
-        "액션": 28, "코미디": 35, "드라마": 18, "로맨스": 10749,
-        "스릴러": 53, "SF": 878, "애니메이션": 16, "판타지": 14,
-        "공포": 27, "다큐멘터리": 99, "역사": 36, "모험": 12
-    }
-    
-    genre_ids = [genre_map[g] for g in profile.get("preferred_genres", []) if g in genre_map]
+    genre_ids = [GENRE_MAP[g] for g in profile.get("preferred_genres", []) if g in GENRE_MAP]
     movies = []
     
     for genre_id in genre_ids:
@@ -127,14 +124,7 @@ def get_personalized_recommendations(profile: Dict) -> List[Dict]:
 def get_mood_based_recommendations(mood: str) -> List[Dict]:
     """📌 사용자 감정(무드)에 따라 추천 영화 목록을 가져옵니다."""
     
-    mood_to_genre = {
-        "행복한": [35, 10751], "슬픈": [18, 10749], "신나는": [28, 12],
-        "로맨틱한": [10749, 35], "무서운": [27, 53], "미스터리한": [9648, 80],
-        "판타지한": [14, 12], "편안한": [99, 10770], "추억을 떠올리는": [10752, 36],
-        "SF 같은": [878, 28]
-    }
-    
-    genre_ids = mood_to_genre.get(mood, [35])  # 기본값: 코미디 장르
+    genre_ids = MOOD_TO_GENRE.get(mood, [35])  # 기본값: 코미디 장르
     movies = []
     
     for genre_id in genre_ids:
@@ -218,6 +208,7 @@ def format_movie_details(details: Dict) -> Dict:
     poster_url = f"https://image.tmdb.org/t/p/w500{poster}" if poster else None
     
     return {
+        "id": details.get("id"),
         "title": details.get("title", "제목 없음"),
         "overview": short_overview,
         "release_date": details.get("release_date", "정보 없음"),
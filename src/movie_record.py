@@ -0,0 +1,156 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# ---------------- 기본 설정 ----------------
+POSTER_BASE_URL = "https://image.tmdb.org/t/p/"
+CAST_LIMIT = 10          # 레코드에 보관하는 최대 출연진 수
+REGISTRY_MAX = 5000      # 프로세스 전체에서 공유하는 레코드 수 상한
+
+
+# ---------------- 압축 영화 레코드 ----------------
+class MovieRecord(NamedTuple):
+    """
+    📌 세션 상태와 화면 표시에 사용하는 압축된 불변 영화 레코드
+    TMDb 원본 딕셔너리 대신 화면에 필요한 필드만 튜플로 보관합니다.
+    """
+    id: int
+    title: str
+    overview: str
+    release_date: str
+    vote_average: float
+    poster_path: Optional[str]
+    genre_ids: Tuple[int, ...] = ()
+    directors: Tuple[str, ...] = ()
+    cast: Tuple[str, ...] = ()
+
+
+# 여러 세션이 같은 영화를 보므로 동일한 레코드 객체를 공유합니다.
+_REGISTRY: "OrderedDict[int, MovieRecord]" = OrderedDict()
+_REGISTRY_LOCK = threading.Lock()  # 세션 스레드, 스냅샷 갱신, 상세 조회 풀이 동시에 등록/조회
+
+
+def _intern(value) -> str:
+    """📌 반복되는 짧은 문자열(날짜, 인물 이름)을 intern 처리"""
+    return sys.intern(value) if isinstance(value, str) and value else ""
+
+
+def _names(members: Iterable, limit: Optional[int] = None) -> Tuple[str, ...]:
+    """📌 인물 목록(딕셔너리 또는 이름 문자열)을 intern된 이름 튜플로 변환"""
+    names = []
+    for member in members or []:
+        name = member.get("name") if isinstance(member, dict) else member
+        if name and name != "정보 없음":
+            names.append(_intern(name))
+        if limit and len(names) >= limit:
+            break
+    return tuple(names)
+
+
+def _poster_path(value) -> Optional[str]:
+    """📌 전체 URL로 변환된 포스터 경로를 TMDb 상대 경로로 되돌림"""
+    if not value:
+        return None
+    if value.startswith(POSTER_BASE_URL):
+        # ".../t/p/w500/abc.jpg" → "/abc.jpg"
+        return "/" + value[len(POSTER_BASE_URL):].split("/", 1)[-1]
+    return value
+
+
+def from_tmdb(movie: Dict, directors: Iterable = None, cast: Iterable = None) -> Optional[MovieRecord]:
+    """
+    📌 TMDb 응답(목록, 상세, format_movie_details 결과)을 MovieRecord로 변환
+    append_to_response=credits 결과가 있으면 감독과 출연진도 함께 추출합니다.
+    """
+    if not movie or not movie.get("id"):
+        return None
+
+    credits = movie.get("credits") or {}
+    if directors is None:
+        directors = movie.get("directors")
+        if directors is None and credits:
+            directors = [m for m in credits.get("crew", []) if m.get("job") == "Director"]
+    if cast is None:
+        cast = movie.get("cast") if isinstance(movie.get("cast"), list) else credits.get("cast")
+
+    genre_ids = movie.get("genre_ids")
+    if genre_ids is None:
+        genre_ids = [g.get("id") for g in movie.get("genres", []) if isinstance(g, dict)]
+
+    vote_average = movie.get("vote_average")
+    return register(MovieRecord(
+        id=int(movie["id"]),
+        title=movie.get("title") or movie.get("original_title") or "제목 없음",
+        overview=movie.get("overview") or "",
+        release_date=_intern(movie.get("release_date")),
+        vote_average=float(vote_average) if isinstance(vote_average, (int, float)) else 0.0,
+        poster_path=_poster_path(movie.get("poster_path")),
+        genre_ids=tuple(int(g) for g in genre_ids if g),
+        directors=_names(directors),
+        cast=_names(cast, CAST_LIMIT),
+    ))
+
+
+def records_from_tmdb(movies: Iterable[Dict]) -> Tuple[MovieRecord, ...]:
+    """📌 TMDb 영화 목록을 중복 없는 MovieRecord 튜플로 변환 (순서 유지)"""
+    seen = set()
+    records = []
+    for movie in movies or []:
+        record = movie if isinstance(movie, MovieRecord) else from_tmdb(movie)
+        if record and record.id not in seen:
+            seen.add(record.id)
+            records.append(record)
+    return tuple(records)
+
+
+def with_credits(record: MovieRecord, directors: Iterable, cast: Iterable) -> MovieRecord:
+    """📌 감독/출연진 정보를 채운 새 레코드를 반환 (원본은 변경하지 않음)"""
+    return register(record._replace(directors=_names(directors), cast=_names(cast, CAST_LIMIT)))
+
+
+# ---------------- 프로세스 공유 레지스트리 ----------------
+def register(record: MovieRecord) -> MovieRecord:
+    """
+    📌 레코드를 공유 레지스트리에 등록하고 정규(canonical) 객체를 반환
+    같은 내용의 레코드가 이미 있으면 기존 객체를 재사용합니다.
+    """
+    with _REGISTRY_LOCK:
+        existing = _REGISTRY.get(record.id)
+        if existing == record:
+            _REGISTRY.move_to_end(record.id)
+            return existing
+        if existing is not None and not record.directors and not record.cast and (existing.directors or existing.cast):
+            # 목록 응답에는 크레딧이 없으므로, 이미 채워진 크레딧은 유지합니다.
+            record = record._replace(directors=existing.directors, cast=existing.cast)
+            if existing == record:
+                _REGISTRY.move_to_end(record.id)
+                return existing
+        _REGISTRY[record.id] = record
+        _REGISTRY.move_to_end(record.id)
+        while len(_REGISTRY) > REGISTRY_MAX:
+            _REGISTRY.popitem(last=False)
+    return record
+
+
+def get_record(movie_id: int) -> Optional[MovieRecord]:
+    """📌 레지스트리에서 영화 ID로 레코드 조회"""
+    with _REGISTRY_LOCK:
+        return _REGISTRY.get(movie_id)
+
+
+def get_records(movie_ids: Iterable[int]) -> List[MovieRecord]:
+    """📌 여러 영화 ID의 레코드를 순서대로 조회 (없는 ID는 건너뜀)"""
+    with _REGISTRY_LOCK:
+        found = [_REGISTRY.get(i) for i in movie_ids]
+    return [record for record in found if record is not None]
+
+
+# ---------------- 표시용 헬퍼 ----------------
+def poster_url(record: MovieRecord, size: str = "w500") -> Optional[str]:
+    """📌 레코드의 포스터 상대 경로를 TMDb 이미지 URL로 변환"""
+    if not record.poster_path:
+        return None
+    if record.poster_path.startswith("http"):
+        return record.poster_path
+    return f"{POSTER_BASE_URL}{size}{record.poster_path}"
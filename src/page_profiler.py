@@ -0,0 +1,277 @@
+"""
+📌 Streamlit 페이지 렌더링 CPU 샘플링 프로파일러 (켜 둘 때만 동작)
+
+- PAGE_PROFILE=1 환경 변수로 켭니다. PAGE_PROFILE_ALLOW_QUERY=1일 때만 ?profile=1 쿼리 파라미터로도 켤 수 있습니다
+  (공개 배포에서 누구나 디스크 쓰기를 일으키지 못하도록). 꺼져 있으면 설정 확인만 하고 바로 통과합니다.
+- 켜져 있으면 렌더링하는 동안 별도 스레드가 PROFILE_INTERVAL초마다 렌더링 스레드의 호출 스택을 읽습니다
+  (코드에 계측을 넣지 않으므로 load_css, HTML 조립, JSON 파싱처럼 네트워크가 아닌 CPU 비용도 보입니다.
+  벽시계 기준 샘플이라 네트워크/잠금 대기는 기다리던 함수의 자체 시간으로 잡힙니다).
+- 렌더링이 끝나면 페이지별로 두 가지 파일을 PROFILE_DIR에 저장합니다.
+  · <시각>-<페이지>.collapsed: 접힌 스택 형식 (flamegraph.pl, speedscope에서 열기)
+  · <시각>-<페이지>.speedscope.json: speedscope 형식 (https://www.speedscope.app 에 끌어다 놓기)
+  최근 MAX_PROFILES회 렌더링의 파일만 남기고 오래된 것부터 지웁니다.
+- 최근 SUMMARY_RENDERS회 렌더링의 자체 시간(self time) 상위 함수를 summary.txt로 계속 갱신합니다.
+
+사용 예:
+    PAGE_PROFILE=1 streamlit run app.py
+    python -m src.page_profiler top --last 50      # 저장된 접힌 스택에서 자체 시간 상위 함수
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter, deque
+from typing import List, Optional, Tuple
+
+# ---------------- 프로파일러 설정 ----------------
+PROFILE_ENABLED = os.getenv("PAGE_PROFILE", "") not in ("", "0")
+PROFILE_ALLOW_QUERY = os.getenv("PAGE_PROFILE_ALLOW_QUERY", "") not in ("", "0")
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_DIR = os.getenv("PAGE_PROFILE_DIR", "data/profiles")
+PROFILE_INTERVAL = float(os.getenv("PAGE_PROFILE_INTERVAL", "0.005"))  # 스택 샘플링 간격 (초)
+SUMMARY_RENDERS = 50         # 자체 시간 요약에 포함하는 최근 렌더링 수
+SUMMARY_TOP = 30
+MAX_PROFILES = int(os.getenv("PAGE_PROFILE_MAX", "500"))  # 디스크에 남기는 렌더링 수 (렌더링당 파일 2개)
+COLLAPSED_SUFFIX = ".collapsed"
+SPEEDSCOPE_SUFFIX = ".speedscope.json"
+
+_recent = deque(maxlen=SUMMARY_RENDERS)  # (페이지, 렌더링 시간, 샘플 수, 자체 시간 Counter)
+_recent_lock = threading.Lock()
+_prune_lock = threading.Lock()
+_root = os.getcwd()
+_stdlib = sysconfig.get_paths()["stdlib"]
+
+
+def enabled() -> bool:
+    """📌 이번 렌더링을 프로파일링할지 (환경 변수, 허용된 경우에만 쿼리 파라미터)"""
+    if PROFILE_ENABLED:
+        return True
+    if not PROFILE_ALLOW_QUERY:
+        return False
+    import streamlit as st
+
+    try:
+        return st.query_params.get(PROFILE_QUERY_PARAM, "") not in ("", "0")
+    except Exception:
+        return False
+
+
+# ---------------- 샘플링 ----------------
+def _label(code) -> str:
+    """📌 "함수 (파일:줄)" 형식의 프레임 이름 (접힌 스택 구분자 ';'는 쓰지 않음)"""
+    path = code.co_filename
+    if "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[-1]
+    elif path.startswith(_stdlib):
+        path = os.path.relpath(path, _stdlib)
+    elif path.startswith(_root):
+        path = os.path.relpath(path, _root)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ",")
+
+
+class _Sampler(threading.Thread):
+    """📌 대상 스레드의 호출 스택을 주기적으로 읽어 스택별 샘플 수를 셈 (root 프레임 위쪽은 버림)"""
+
+    def __init__(self, thread_id: int, root, interval: float):
+        super().__init__(name="page-profiler", daemon=True)
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        current_frames = sys._current_frames
+        while not self._stop_event.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                if frame is self.root:
+                    break
+                frame = frame.f_back
+            if stack:
+                self.samples[tuple(reversed(stack))] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+# ---------------- 결과 저장 ----------------
+def _labelled(samples: Counter) -> Counter:
+    stacks = Counter()
+    for codes, count in samples.items():
+        stacks[tuple(_label(code) for code in codes)] += count
+    return stacks
+
+
+def write_collapsed(path: str, stacks: Counter):
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{';'.join(stack)} {count}\n")
+
+
+def write_speedscope(path: str, name: str, stacks: Counter, wall: float):
+    """📌 샘플 하나의 무게는 렌더링 시간을 샘플 수로 나눈 값 (GIL 경합으로 실제 간격이 설정보다 길어질 수 있음)"""
+    per_sample = wall * 1000 / (sum(stacks.values()) or 1)
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, count in stacks.items():
+        ids = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frames.append({"name": label})
+            ids.append(index[label])
+        samples.append(ids)
+        weights.append(round(count * per_sample, 3))
+    profile = {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name, "exporter": "src.page_profiler",
+        "shared": {"frames": frames},
+        "profiles": [{"type": "sampled", "name": name, "unit": "milliseconds", "startValue": 0,
+                      "endValue": round(sum(weights), 3), "samples": samples, "weights": weights}],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(profile, f, ensure_ascii=False)
+
+
+def self_time(stacks: Counter) -> Counter:
+    """📌 스택 맨 위(실제로 CPU를 쓰던) 함수별 샘플 수"""
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack[-1]] += count
+    return leaves
+
+
+def format_summary(leaves: Counter, renders: List[Tuple[str, float, int]], top: int = SUMMARY_TOP) -> str:
+    total = sum(leaves.values()) or 1
+    pages, walls = Counter(), Counter()
+    for page, wall, _ in renders:
+        pages[page] += 1
+        walls[page] += wall
+    lines = [f"최근 렌더링 {len(renders)}회, 샘플 {sum(leaves.values())}개",
+             "페이지: " + ", ".join(f"{page} {n}회 (평균 {walls[page] / n * 1000:.0f} ms)"
+                                    for page, n in pages.most_common()),
+             f"{'자체 시간':>8}  {'샘플':>6}  함수"]
+    for label, count in leaves.most_common(top):
+        lines.append(f"{count / total:8.1%}  {count:6d}  {label}")
+    return "\n".join(lines) + "\n"
+
+
+def _prune(keep: int = MAX_PROFILES):
+    """📌 파일 이름의 시각 순으로 오래된 렌더링의 프로파일 파일을 지워 keep회분만 남김"""
+    with _prune_lock:
+        paths = sorted(glob.glob(os.path.join(PROFILE_DIR, f"*{COLLAPSED_SUFFIX}")))
+        for path in paths[:max(0, len(paths) - keep)]:
+            base = path[:-len(COLLAPSED_SUFFIX)]
+            for stale in (path, base + SPEEDSCOPE_SUFFIX):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+def _record(page: str, wall: float, stacks: Counter):
+    """📌 렌더링 하나의 결과를 파일로 저장하고 최근 자체 시간 요약을 갱신"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    base = os.path.join(PROFILE_DIR, f"{stamp}-{page.replace(' ', '_').replace(os.sep, '_')}")
+    write_collapsed(base + COLLAPSED_SUFFIX, stacks)
+    write_speedscope(base + SPEEDSCOPE_SUFFIX, page, stacks, wall)
+    _prune()
+
+    with _recent_lock:
+        _recent.append((page, wall, sum(stacks.values()), self_time(stacks)))
+        recent = list(_recent)
+    leaves = sum((entry[3] for entry in recent), Counter())
+    with open(os.path.join(PROFILE_DIR, "summary.txt"), "w", encoding="utf-8") as f:
+        f.write(format_summary(leaves, [entry[:3] for entry in recent]))
+
+
+# ---------------- 렌더링 감싸기 ----------------
+class _Render:
+    """📌 렌더링 하나의 샘플러 수명 관리 (with 블록)"""
+
+    def __init__(self, page: str = "page"):
+        self.page = page
+        self._sampler: Optional[_Sampler] = None
+
+    def __enter__(self):
+        if not enabled():
+            return self
+        self._started = time.perf_counter()
+        self._sampler = _Sampler(threading.get_ident(), sys._getframe(1), PROFILE_INTERVAL)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._sampler is None:
+            return False
+        wall = time.perf_counter() - self._started
+        samples = self._sampler.stop()
+        self._sampler = None
+        try:
+            _record(self.page, wall, _labelled(samples))
+        except Exception as e:
+            print(f"Error writing page profile: {e}")
+        return False
+
+
+def profile_render(page: str = "page") -> _Render:
+    """
+    📌 with 블록 안의 렌더링을 샘플링 (꺼져 있으면 아무 일도 하지 않음)
+    페이지 이름은 블록 안에서 정해지므로 render.page에 넣어 주면 파일 이름과 요약에 쓰입니다.
+    """
+    return _Render(page)
+
+
+# ---------------- 저장된 프로파일 요약 ----------------
+def read_collapsed(path: str) -> Counter:
+    stacks = Counter()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[tuple(stack.split(";"))] += int(count)
+    return stacks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 렌더링 프로파일 요약")
+    sub = parser.add_subparsers(dest="command", required=True)
+    top_cmd = sub.add_parser("top")
+    top_cmd.add_argument("--dir", default=PROFILE_DIR)
+    top_cmd.add_argument("--last", type=int, default=SUMMARY_RENDERS, help="최근 렌더링 수")
+    top_cmd.add_argument("--page", help="이 페이지의 렌더링만 (예: 홈)")
+    top_cmd.add_argument("-n", type=int, default=SUMMARY_TOP)
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.dir, f"*{COLLAPSED_SUFFIX}")))
+    if args.page:
+        paths = [p for p in paths if os.path.basename(p)[:-len(COLLAPSED_SUFFIX)].split("-", 1)[1] ==
+                 args.page.replace(" ", "_")]
+    paths = paths[-args.last:]
+    leaves, renders = Counter(), []
+    for path in paths:
+        stacks = read_collapsed(path)
+        leaves.update(self_time(stacks))
+        samples = sum(stacks.values())
+        try:
+            with open(path[:-len(COLLAPSED_SUFFIX)] + SPEEDSCOPE_SUFFIX, "r", encoding="utf-8") as f:
+                wall = json.load(f)["profiles"][0]["endValue"] / 1000
+        except (OSError, ValueError, KeyError, IndexError):
+            wall = samples * PROFILE_INTERVAL  # speedscope 파일이 없으면 샘플 수로 추정
+        renders.append((os.path.basename(path)[:-len(COLLAPSED_SUFFIX)].split("-", 1)[1], wall, samples))
+    print(format_summary(leaves, renders, args.n), end="")
+
+
+if __name__ == "__main__":
+    main()
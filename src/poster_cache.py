@@ -0,0 +1,223 @@
+import io
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+import requests
+from PIL import Image, ImageDraw
+
+from src import shared_cache
+
+# ---------------- 포스터 캐시 설정 ----------------
+TMDB_IMAGE_URL = "https://image.tmdb.org/t/p/w500"
+POSTER_PROXY_URL = os.getenv("POSTER_PROXY_URL", "http://localhost:5000").rstrip("/")
+POSTER_CACHE_DIR = os.getenv("POSTER_CACHE_DIR", "data/poster_cache")
+POSTER_CACHE_MAX_BYTES = int(os.getenv("POSTER_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+# 화면에서 실제로 쓰는 표시 폭 (검색/즐겨찾기 150px, 홈 카드 250px, 기분 추천 전체 폭)
+THUMBNAIL_WIDTHS = (150, 250, 500)
+WEBP_QUALITY = 80
+CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9_-]+\.(jpg|jpeg|png|webp)$")
+_fetch_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_cache_bytes = None
+
+
+# ---------------- URL 헬퍼 (Streamlit 화면에서 사용) ----------------
+def _poster_name(poster_path: Optional[str]) -> Optional[str]:
+    """📌 "/abc.jpg" 또는 TMDb 전체 URL에서 안전한 파일 이름만 추출"""
+    if not poster_path:
+        return None
+    name = poster_path.rsplit("/", 1)[-1]
+    return name if _SAFE_NAME.match(name) else None
+
+
+def snap_width(width: int) -> int:
+    """📌 요청 폭을 지원하는 썸네일 폭 중 가장 가까운 큰 값으로 맞춤"""
+    for candidate in THUMBNAIL_WIDTHS:
+        if width <= candidate:
+            return candidate
+    return THUMBNAIL_WIDTHS[-1]
+
+
+def poster_url(poster_path: Optional[str], width: int = 250) -> str:
+    """
+    📌 포스터 프록시 URL 반환
+    포스터가 없으면 로컬에서 생성한 플레이스홀더 URL을 반환합니다.
+    """
+    width = snap_width(width)
+    name = _poster_name(poster_path)
+    if not name:
+        return f"{POSTER_PROXY_URL}/posters/placeholder/w{width}.webp"
+    return f"{POSTER_PROXY_URL}/posters/w{width}/{name}"
+
+
+# ---------------- 디스크 캐시 (LRU) ----------------
+def _thumb_path(name: str, width: int) -> str:
+    stem = name.rsplit(".", 1)[0]
+    return os.path.join(POSTER_CACHE_DIR, f"w{width}", f"{stem}.webp")
+
+
+def _scan_cache_bytes() -> int:
+    total = 0
+    for root, _, files in os.walk(POSTER_CACHE_DIR):
+        for f in files:
+            total += os.path.getsize(os.path.join(root, f))
+    return total
+
+
+def _add_cache_bytes(delta: int) -> int:
+    """📌 캐시 크기 합계를 delta만큼 바꾸고 반환 (최초 1회만 디스크를 스캔, 여러 다운로드 스레드가 동시에 갱신)"""
+    global _cache_bytes
+    with _locks_guard:
+        _cache_bytes = (_scan_cache_bytes() if _cache_bytes is None else _cache_bytes) + delta
+        return _cache_bytes
+
+
+def _current_cache_bytes() -> int:
+    """📌 캐시 디렉터리 전체 크기"""
+    return _add_cache_bytes(0)
+
+
+def _evict_if_needed():
+    """📌 캐시 크기가 상한을 넘으면 가장 오래 사용하지 않은 파일부터 삭제"""
+    if _current_cache_bytes() <= POSTER_CACHE_MAX_BYTES:
+        return
+    entries = []
+    for root, _, files in os.walk(POSTER_CACHE_DIR):
+        if os.path.basename(root) == "placeholder":
+            continue
+        for f in files:
+            path = os.path.join(root, f)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # 다른 스레드가 먼저 삭제
+            entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    target = int(POSTER_CACHE_MAX_BYTES * 0.9)
+    for _, size, path in entries:
+        if _current_cache_bytes() <= target:
+            break
+        try:
+            os.remove(path)
+            _add_cache_bytes(-size)
+        except OSError:
+            pass
+
+
+def _write_thumbnails(name: str, image: Image.Image):
+    """📌 원본 이미지 한 장으로 모든 표시 폭의 WebP 썸네일 생성"""
+    image = image.convert("RGB")
+    for width in THUMBNAIL_WIDTHS:
+        height = round(image.height * width / image.width)
+        thumb = image if width >= image.width else image.resize((width, height), Image.LANCZOS)
+        path = _thumb_path(name, width)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        thumb.save(tmp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+        os.replace(tmp_path, path)
+        _add_cache_bytes(os.path.getsize(path))
+    _evict_if_needed()
+
+
+# ---------------- 캐시 스냅샷 연동 ----------------
+def snapshot_key(name: str, width: int) -> str:
+    return f"poster:w{width}/{name}"
+
+
+def snapshot_entries(poster_path: Optional[str]) -> Dict[str, bytes]:
+    """📌 디스크에 있는 썸네일을 캐시 스냅샷 항목(키 → WebP 바이트)으로 반환 (모든 폭이 있을 때만)"""
+    name = _poster_name(poster_path)
+    if not name:
+        return {}
+    entries = {}
+    for width in THUMBNAIL_WIDTHS:
+        try:
+            with open(_thumb_path(name, width), "rb") as f:
+                entries[snapshot_key(name, width)] = f.read()
+        except OSError:
+            return {}
+    return entries
+
+
+def _restore_from_snapshot(name: str) -> bool:
+    """📌 캐시 스냅샷에 썸네일이 있으면 디스크 캐시로 옮겨 씀 (이미지 서버 요청과 재인코딩 생략)"""
+    snapshot = shared_cache.get_snapshot()
+    if snapshot is None:
+        return False
+    blobs = {width: snapshot.get_raw(snapshot_key(name, width)) for width in THUMBNAIL_WIDTHS}
+    if any(blob is None for blob in blobs.values()):
+        return False
+    for width, blob in blobs.items():
+        path = _thumb_path(name, width)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+        _add_cache_bytes(len(blob))
+    _evict_if_needed()
+    return True
+
+
+def _fetch_source(name: str) -> Optional[Image.Image]:
+    """📌 TMDb에서 원본 포스터를 내려받음"""
+    try:
+        response = requests.get(f"{TMDB_IMAGE_URL}/{name}", timeout=10)
+        if response.status_code == 200:
+            return Image.open(io.BytesIO(response.content))
+    except Exception as e:
+        print(f"Error fetching poster: {e}")
+    return None
+
+
+def get_thumbnail(poster_path: str, width: int) -> Optional[str]:
+    """
+    📌 썸네일 파일 경로 반환 (없으면 원본을 한 번만 받아 생성)
+    같은 포스터에 대한 동시 요청은 하나의 다운로드를 기다립니다.
+    """
+    name = _poster_name(poster_path)
+    if not name:
+        return None
+    path = _thumb_path(name, snap_width(width))
+    if os.path.exists(path):
+        os.utime(path)  # LRU: 최근 사용 시각 갱신
+        return path
+
+    with _locks_guard:
+        lock = _fetch_locks.setdefault(name, threading.Lock())
+    try:
+        with lock:
+            if not os.path.exists(path) and not _restore_from_snapshot(name):
+                image = _fetch_source(name)
+                if image is None:
+                    return None
+                _write_thumbnails(name, image)
+    finally:
+        with _locks_guard:
+            _fetch_locks.pop(name, None)
+    return path if os.path.exists(path) else None
+
+
+def get_placeholder(width: int) -> str:
+    """📌 로컬에서 생성한 "No Image" 플레이스홀더 경로 반환"""
+    width = snap_width(width)
+    path = os.path.join(POSTER_CACHE_DIR, "placeholder", f"w{width}.webp")
+    if os.path.exists(path):
+        return path
+
+    height = width * 3 // 2
+    image = Image.new("RGB", (width, height), (40, 40, 40))
+    draw = ImageDraw.Draw(image)
+    text = "No Image"
+    left, top, right, bottom = draw.textbbox((0, 0), text)
+    draw.text(((width - (right - left)) / 2, (height - (bottom - top)) / 2), text, fill=(179, 179, 179))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    image.save(tmp_path, "WEBP", quality=WEBP_QUALITY)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,208 @@
+"""
+📌 추천 카테고리를 준비되는 순서대로 흘려보내는 스트리밍 추천 파이프라인
+
+- 카테고리(장르/스타일/본 영화/좋아하는 영화/비슷한 사용자/검색어)는 동시에 계산하고, 끝나는 대로 이벤트로 내보냅니다.
+- LLM 설명 문장은 토큰 단위 이벤트로 전달합니다.
+- 이벤트는 크기가 제한된 큐를 거치므로 소비자가 느리면 작업 스레드도 기다립니다(backpressure).
+- 소비자가 이터레이터를 닫으면(클라이언트 연결 끊김) 남은 작업을 취소하고 LLM 스트림도 닫습니다.
+
+Flask(SSE)와 Streamlit 화면이 같은 파이프라인을 사용합니다.
+"""
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from src import collab_filter, genre_catalog, hot_lists, tmdb_client
+from src.genre_map import GENRE_MAP, MOOD_TO_GENRE
+from src.movie_recommend import build_recommendation_prompt, format_movie_details, get_huggingface_client
+
+# ---------------- 스트리밍 설정 ----------------
+CATEGORY_SIZE = 5            # 카테고리당 추천 영화 수
+CATEGORY_WORKERS = 4
+QUEUE_SIZE = 32              # 소비자가 읽지 않은 이벤트가 이만큼 쌓이면 생산자가 대기
+HEARTBEAT_INTERVAL = 15      # 이벤트가 없을 때 연결 확인용 주석을 보내는 간격 (초)
+LLM_MAX_TOKENS = 400
+_FINISHED = "_finished"
+
+
+class StreamCancelled(Exception):
+    """📌 소비자가 스트림을 닫아 더 이상 작업할 필요가 없음"""
+
+
+class _EventQueue:
+    """📌 작업 스레드 → 소비자 방향의 제한 크기 큐와 취소 플래그"""
+
+    def __init__(self, maxsize: int = QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.cancelled = threading.Event()
+
+    def emit(self, event: str, data: Dict) -> bool:
+        """📌 이벤트를 넣음 (큐가 가득 차면 대기, 취소되면 False)"""
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put((event, data), timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def check(self):
+        """📌 다음 원본 요청 전에 호출: 취소됐으면 작업 중단"""
+        if self.cancelled.is_set():
+            raise StreamCancelled()
+
+
+# ---------------- 카테고리 계산 ----------------
+def _hydrate(events: _EventQueue, movie_ids: List[int]) -> List[Dict]:
+    events.check()
+    records = hot_lists.hydrate_all(movie_ids[:CATEGORY_SIZE], hedge=True) if movie_ids else ()
+    return [format_movie_details(record._asdict()) for record in records]
+
+
+def _discover_ids(events: _EventQueue, genre_ids: List[int]) -> List[int]:
+    events.check()
+    results = tmdb_client.get_many_json([
+        ("/discover/movie", {"language": tmdb_client.LANGUAGE, "with_genres": genre_id}) for genre_id in genre_ids
+    ])
+    ids, seen = [], set()
+    for data in results:
+        if isinstance(data, Exception):
+            continue
+        for movie in data.get("results", []):
+            if movie["id"] not in seen:
+                seen.add(movie["id"])
+                ids.append(movie["id"])
+    return ids
+
+
+def _search_ids(events: _EventQueue, query: str) -> List[int]:
+    events.check()
+    data = tmdb_client.get_json("/search/movie", {"language": tmdb_client.LANGUAGE, "query": query})
+    return [movie["id"] for movie in data.get("results", [])]
+
+
+def _plan(profile: Dict, additional_info: str) -> List[Tuple[str, Callable[[_EventQueue], List[Dict]]]]:
+    """📌 프로필에 있는 정보로 계산할 수 있는 카테고리 목록 (ui.show_generated_recommendations와 같은 구성)"""
+    genres = profile.get("preferred_genres") or []
+    styles = profile.get("preferred_styles") or []
+    watched = profile.get("watched_movies") or []
+    favorites = profile.get("favorite_movies") or []
+    keyword = (additional_info or "").strip()
+    jobs = []
+
+    if genres:
+        genre_ids = [GENRE_MAP[g] for g in genres if g in GENRE_MAP]
+        jobs.append(("장르별 추천", lambda ev: _hydrate(ev, _discover_ids(ev, genre_ids))))
+    if styles:
+        mood_genres = next((MOOD_TO_GENRE[s] for s in styles if s in MOOD_TO_GENRE), [35])  # 기본값: 코미디 장르
+        jobs.append(("영화 스타일별 추천", lambda ev: _hydrate(ev, _discover_ids(ev, mood_genres))))
+    if watched:
+        jobs.append(("지금까지 본 영화 기반 추천", lambda ev: _hydrate(ev, _search_ids(ev, watched[0]))))
+    if favorites:
+        jobs.append(("좋아하는 영화 기반 추천", lambda ev: _hydrate(ev, _search_ids(ev, favorites[0]))))
+    if watched or favorites:
+        def similar_users(ev):
+            titles = [title for title, _ in collab_filter.recommend(profile, k=CATEGORY_SIZE)]
+            return _hydrate(ev, genre_catalog.find_movie_ids(titles)) if titles else []
+        jobs.append(("비슷한 취향의 사용자 기반 추천", similar_users))
+    if keyword:
+        def keyword_search(ev):
+            movies = _hydrate(ev, _search_ids(ev, keyword))
+            if not movies:
+                # 검색 결과가 없으면 최신 인기 영화로 대체 (스냅샷에서 읽으므로 추가 요청 없음)
+                trending = hot_lists.get_snapshot("trending")[:CATEGORY_SIZE]
+                ev.emit("category", {"name": "최신 개봉 영화 추천", "fallback_for": "검색 키워드 기반 추천",
+                                     "movies": [format_movie_details(r._asdict()) for r in trending]})
+            return movies
+        jobs.append(("검색 키워드 기반 추천", keyword_search))
+    return jobs
+
+
+def _run_category(events: _EventQueue, name: str, job: Callable[[_EventQueue], List[Dict]]):
+    try:
+        movies = job(events)
+        events.emit("category", {"name": name, "movies": movies})
+    except StreamCancelled:
+        pass
+    except Exception as e:
+        print(f"Error building recommendation category {name}: {e}")
+        events.emit("category_error", {"name": name, "error": "추천을 가져오지 못했습니다."})
+    finally:
+        events.emit(_FINISHED, {})
+
+
+def _run_llm(events: _EventQueue, prompt: str):
+    """📌 LLM 응답을 토큰 단위로 전달 (취소되면 업스트림 스트림을 닫아 남은 생성 비용을 아낌)"""
+    tokens = None
+    try:
+        events.check()
+        tokens = get_huggingface_client().text_generation(prompt, stream=True, max_new_tokens=LLM_MAX_TOKENS)
+        for token in tokens:
+            if not events.emit("token", {"text": token}):
+                break
+        else:
+            events.emit("llm_done", {})
+    except StreamCancelled:
+        pass
+    except Exception as e:
+        print(f"Error streaming LLM text: {e}")
+        events.emit("llm_error", {"error": "AI 추천 설명을 생성하지 못했습니다."})
+    finally:
+        if tokens is not None and hasattr(tokens, "close"):
+            tokens.close()
+        events.emit(_FINISHED, {})
+
+
+# ---------------- 이벤트 스트림 ----------------
+def iter_events(profile: Dict, additional_info: str = "", include_llm: bool = True,
+                heartbeat: float = HEARTBEAT_INTERVAL) -> Iterator[Tuple[str, Dict]]:
+    """
+    📌 (이벤트 이름, 데이터)를 준비되는 순서대로 반환
+    이벤트: start → category / category_error / token / llm_done / llm_error (순서 무관) → done
+    heartbeat초 동안 이벤트가 없으면 ("heartbeat", {})를 반환합니다.
+    이터레이터를 중간에 닫으면 남은 작업이 취소됩니다.
+    """
+    events = _EventQueue()
+    jobs = _plan(profile, additional_info)
+    pool = ThreadPoolExecutor(max_workers=CATEGORY_WORKERS + 1, thread_name_prefix="rec-stream")
+    futures = [pool.submit(_run_category, events, name, job) for name, job in jobs]
+    if include_llm:
+        futures.append(pool.submit(_run_llm, events, build_recommendation_prompt(profile, additional_info)))
+    pending = len(futures)
+    try:
+        yield "start", {"categories": [name for name, _ in jobs], "llm": include_llm}
+        while pending:
+            try:
+                event, data = events.queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield "heartbeat", {}
+                continue
+            if event == _FINISHED:
+                pending -= 1
+            else:
+                yield event, data
+        yield "done", {}
+    finally:
+        events.cancelled.set()
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=False)
+
+
+def format_sse(event: str, data: Dict) -> str:
+    """📌 SSE 형식 문자열 (heartbeat는 클라이언트가 무시하는 주석 줄)"""
+    if event == "heartbeat":
+        return ": keep-alive\n\n"
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_sse(profile: Dict, additional_info: str = "", include_llm: bool = True) -> Iterator[str]:
+    """📌 Flask 응답 본문용 SSE 스트림 (응답이 닫히면 iter_events도 닫혀 작업이 취소됨)"""
+    events = iter_events(profile, additional_info, include_llm)
+    try:
+        for event, data in events:
+            yield format_sse(event, data)
+    finally:
+        events.close()
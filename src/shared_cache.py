@@ -0,0 +1,388 @@
+"""
+📌 TMDb 클라이언트 아래에서 쓰는 교체 가능한 캐시 백엔드
+
+- MemoryCache: 프로세스 내부 딕셔너리 (기본값, 단일 프로세스 개발용)
+- MmapCache:   같은 호스트의 여러 Streamlit/Flask 워커가 공유하는 mmap 파일 해시 테이블
+- RedisCache:  여러 노드가 공유하는 Redis 프로토콜 캐시 (redis 패키지 필요)
+
+모든 백엔드는 get_many/set_many(여러 키를 한 번에 처리)와 lock(key)(프로세스 간 single-flight)을 제공합니다.
+백엔드는 환경 변수 TMDB_CACHE_BACKEND(memory|mmap|redis)로 고릅니다.
+
+TMDB_CACHE_SNAPSHOT 위치에 캐시 스냅샷 파일(src.cache_warmup이 생성)이 있으면 시작 시 mmap으로 열어
+백엔드 미스를 스냅샷 값으로 채웁니다 (새 노드가 TMDb를 두드리며 데워지지 않도록).
+"""
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+from src.json_projection import dumps, loads
+
+# ---------------- 캐시 설정 ----------------
+CACHE_BACKEND = os.getenv("TMDB_CACHE_BACKEND", "memory")
+CACHE_PATH = os.getenv("TMDB_CACHE_PATH", "/tmp/moviemind-cache")
+CACHE_URL = os.getenv("TMDB_CACHE_URL", "redis://localhost:6379/0")
+MEMORY_MAX_ENTRIES = 10000
+MMAP_SLOTS = int(os.getenv("TMDB_CACHE_SLOTS", "4096"))
+MMAP_SLOT_SIZE = int(os.getenv("TMDB_CACHE_SLOT_SIZE", str(64 * 1024)))
+MMAP_PROBES = 8
+LOCK_TIMEOUT = 15.0
+LOCK_STRIPES = 256         # 키별 잠금을 해시로 나눠 담는 고정 개수 (키가 늘어도 잠금/잠금 파일 수는 일정)
+KEY_PREFIX = "moviemind:"
+SNAPSHOT_PATH = os.getenv("TMDB_CACHE_SNAPSHOT", "data/cache_snapshot.bin")
+SNAPSHOT_MAGIC = b"MMCS"
+SNAPSHOT_VERSION = 1
+
+
+def key_digest(key: str) -> bytes:
+    """📌 캐시 키의 16바이트 해시 (mmap 캐시 슬롯과 스냅샷 색인에서 공통 사용)"""
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def lock_stripe(key: str) -> int:
+    """📌 키가 쓰는 잠금 번호 (다른 키가 같은 잠금을 나눠 쓸 수 있지만 기다리기만 할 뿐 결과는 같음)"""
+    return int.from_bytes(key_digest(key)[8:12], "little") % LOCK_STRIPES
+
+
+# ---------------- 프로세스 내부 캐시 ----------------
+class MemoryCache:
+    """📌 프로세스 내부 TTL 캐시 (워커마다 따로 데워짐, 오래된 항목부터 제거)"""
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self.guard = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        now = time.time()
+        found = {}
+        with self.guard:
+            for key in keys:
+                entry = self.data.get(key)
+                if entry and entry[0] > now:
+                    found[key] = entry[1]
+        return found
+
+    def set_many(self, items: Dict, ttl: float):
+        expires_at = time.time() + ttl
+        with self.guard:
+            for key, value in items.items():
+                self.data[key] = (expires_at, value)
+                self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    @contextmanager
+    def lock(self, key: str, timeout: float = LOCK_TIMEOUT):
+        lock = self.locks[lock_stripe(key)]
+        acquired = lock.acquire(timeout=timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+
+
+# ---------------- 같은 호스트 공유 캐시 (mmap) ----------------
+class MmapCache:
+    """
+    📌 고정 크기 슬롯으로 나눈 mmap 파일 해시 테이블
+    슬롯 = [키 해시 16바이트 | 만료 시각 double | 길이 uint32 | 값]. 선형 탐사로 충돌을 처리하고,
+    파일 전체에 flock을 걸어 여러 프로세스의 동시 읽기/쓰기를 보호합니다.
+    """
+    HEADER = struct.Struct("<16sdI")
+
+    def __init__(self, path: str = CACHE_PATH, slots: int = MMAP_SLOTS, slot_size: int = MMAP_SLOT_SIZE):
+        os.makedirs(path, exist_ok=True)
+        self.slots = slots
+        self.slot_size = slot_size
+        self.lock_dir = os.path.join(path, "locks")
+        os.makedirs(self.lock_dir, exist_ok=True)
+        self.fd = os.open(os.path.join(path, "cache.bin"), os.O_RDWR | os.O_CREAT, 0o644)
+        size = slots * slot_size
+        if os.fstat(self.fd).st_size < size:
+            os.ftruncate(self.fd, size)  # 희소 파일이므로 실제 디스크 사용량은 쓴 만큼만 늘어남
+        self.map = mmap.mmap(self.fd, size)
+        # flock은 같은 프로세스의 스레드끼리 구분하지 못하므로 스레드 잠금을 함께 사용
+        self.thread_lock = threading.Lock()
+        self.oversize = 0                  # 슬롯보다 커서 넣지 못한 값의 수
+        self._oversize_keys = set()        # 이미 알린 키 (같은 키를 반복해서 출력하지 않음)
+
+    _digest = staticmethod(key_digest)
+
+    def _probe(self, digest: bytes):
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        for i in range(MMAP_PROBES):
+            yield ((start + i) % self.slots) * self.slot_size
+
+    @contextmanager
+    def _file_lock(self, mode):
+        with self.thread_lock:
+            fcntl.flock(self.fd, mode)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        now = time.time()
+        found = {}
+        with self._file_lock(fcntl.LOCK_SH):
+            for key in keys:
+                digest = self._digest(key)
+                for offset in self._probe(digest):
+                    slot_digest, expires_at, length = self.HEADER.unpack_from(self.map, offset)
+                    if slot_digest == digest:
+                        if expires_at > now:
+                            start = offset + self.HEADER.size
+                            found[key] = self.map[start:start + length]
+                        break
+        return {key: loads(raw) for key, raw in found.items()}
+
+    def set_many(self, items: Dict, ttl: float):
+        now = time.time()
+        expires_at = now + ttl
+        encoded = {key: dumps(value) for key, value in items.items()}
+        with self._file_lock(fcntl.LOCK_EX):
+            for key, payload in encoded.items():
+                if len(payload) > self.slot_size - self.HEADER.size:
+                    self._skip_oversize(key, len(payload))  # 슬롯보다 큰 값은 공유 캐시에 넣지 않음
+                    continue
+                digest = self._digest(key)
+                target = oldest = None
+                for offset in self._probe(digest):
+                    slot_digest, slot_expires, _ = self.HEADER.unpack_from(self.map, offset)
+                    if slot_digest == digest or slot_expires <= now:
+                        target = offset
+                        break
+                    if oldest is None or slot_expires < oldest[0]:
+                        oldest = (slot_expires, offset)
+                target = target if target is not None else oldest[1]
+                self.HEADER.pack_into(self.map, target, digest, expires_at, len(payload))
+                start = target + self.HEADER.size
+                self.map[start:start + len(payload)] = payload
+
+    def _skip_oversize(self, key: str, size: int):
+        self.oversize += 1
+        if key not in self._oversize_keys and len(self._oversize_keys) < 1000:
+            self._oversize_keys.add(key)
+            print(f"Error caching {key}: {size:,} bytes exceeds the {self.slot_size:,}-byte mmap slot")
+
+    @contextmanager
+    def lock(self, key: str, timeout: float = LOCK_TIMEOUT):
+        """
+        📌 잠금 파일에 flock을 걸어 같은 호스트의 모든 프로세스/스레드에서 single-flight 보장
+        잠금 파일은 LOCK_STRIPES개로 고정하고 키 해시로 나눠 씁니다.
+        """
+        path = os.path.join(self.lock_dir, f"{lock_stripe(key):04d}")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        acquired = False
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    acquired = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        break
+                    time.sleep(0.01)
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+# ---------------- 여러 노드 공유 캐시 (Redis) ----------------
+class RedisCache:
+    """📌 Redis 프로토콜 캐시: MGET/파이프라인으로 여러 키를 한 번의 왕복으로 처리"""
+    _RELEASE = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str = CACHE_URL, client=None):
+        if client is None:
+            import redis  # 선택 의존성: Redis 백엔드를 쓸 때만 필요
+            client = redis.Redis.from_url(url)
+        self.client = client
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([KEY_PREFIX + key for key in keys])
+        return {key: loads(raw) for key, raw in zip(keys, values) if raw is not None}
+
+    def set_many(self, items: Dict, ttl: float):
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(KEY_PREFIX + key, dumps(value), ex=max(1, int(ttl)))
+        pipe.execute()
+
+    @contextmanager
+    def lock(self, key: str, timeout: float = LOCK_TIMEOUT):
+        """📌 SET NX PX 잠금: 여러 노드 중 한 곳만 원본을 가져오고 나머지는 캐시를 기다림"""
+        lock_key = f"{KEY_PREFIX}lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while True:
+            if self.client.set(lock_key, token, nx=True, px=int(timeout * 1000)):
+                acquired = True
+                break
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.02)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.client.eval(self._RELEASE, 1, lock_key, token)
+
+
+# ---------------- 캐시 스냅샷 (배포 시 노드 간에 옮기는 읽기 전용 파일) ----------------
+class CacheSnapshot:
+    """
+    📌 mmap으로 여는 읽기 전용 캐시 스냅샷
+    파일 = [헤더 | 키 해시 순으로 정렬된 색인 | 값 바이트]. 여는 비용은 헤더 확인과 체크섬 계산뿐이고,
+    값은 조회할 때 색인을 이진 탐색해 찾은 뒤 그 값만 디코딩합니다.
+    """
+    HEADER = struct.Struct("<4sHHdII")   # 매직, 버전, 예약, 생성 시각, 항목 수, 헤더 뒤 전체의 CRC32
+    ENTRY = struct.Struct("<16sQI")       # 키 해시, 값 위치(값 영역 기준), 값 길이
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) < self.HEADER.size:
+            raise ValueError("캐시 스냅샷 파일이 너무 짧습니다.")
+        magic, version, _, self.created_at, self.count, checksum = self.HEADER.unpack_from(self.map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("캐시 스냅샷 파일이 아닙니다.")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"지원하지 않는 캐시 스냅샷 버전입니다: {version}")
+        with memoryview(self.map) as view, view[self.HEADER.size:] as body:
+            valid = zlib.crc32(body) == checksum  # 복사 없이 매핑된 페이지를 그대로 계산
+        if not valid:
+            raise ValueError("캐시 스냅샷 체크섬이 맞지 않습니다.")
+        self.path = path
+        self.index_at = self.HEADER.size
+        self.data_at = self.index_at + self.count * self.ENTRY.size
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """📌 키에 해당하는 값 바이트 (없으면 None)"""
+        digest = key_digest(key)
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            at = self.index_at + mid * self.ENTRY.size
+            mid_digest = self.map[at:at + 16]
+            if mid_digest < digest:
+                low = mid + 1
+            elif mid_digest > digest:
+                high = mid
+            else:
+                _, offset, length = self.ENTRY.unpack_from(self.map, at)
+                start = self.data_at + offset
+                return self.map[start:start + length]
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        found = {}
+        for key in keys:
+            raw = self.get_raw(key)
+            if raw is not None:
+                found[key] = loads(raw)
+        return found
+
+
+def write_snapshot(path: str, entries: Dict[str, bytes], created_at: Optional[float] = None) -> int:
+    """📌 키 → 값 바이트를 스냅샷 파일로 원자적으로 저장하고 파일 크기를 반환"""
+    rows = sorted((key_digest(key), value) for key, value in entries.items())
+    index, data, offset = bytearray(), bytearray(), 0
+    for digest, value in rows:
+        index += CacheSnapshot.ENTRY.pack(digest, offset, len(value))
+        data += value
+        offset += len(value)
+    body = bytes(index + data)
+    header = CacheSnapshot.HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, created_at or time.time(),
+                                       len(rows), zlib.crc32(body))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+    return len(header) + len(body)
+
+
+class SnapshotTier:
+    """📌 백엔드 미스를 스냅샷으로 채우는 읽기 계층 (쓰기와 잠금은 백엔드가 그대로 처리)"""
+
+    def __init__(self, cache, snapshot: CacheSnapshot):
+        self.cache = cache
+        self.snapshot = snapshot
+
+    def get_many(self, keys: Iterable[str]) -> Dict:
+        keys = list(keys)
+        found = self.cache.get_many(keys)
+        found.update(self.snapshot.get_many(key for key in keys if key not in found))
+        return found
+
+    def set_many(self, items: Dict, ttl: float):
+        self.cache.set_many(items, ttl)
+
+    def lock(self, key: str, timeout: float = LOCK_TIMEOUT):
+        return self.cache.lock(key, timeout)
+
+
+_snapshot = None
+
+
+def get_snapshot() -> Optional[CacheSnapshot]:
+    """📌 시작 시 한 번 연 캐시 스냅샷 (파일이 없거나 손상되었으면 None)"""
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = False
+        if os.path.exists(SNAPSHOT_PATH):
+            try:
+                _snapshot = CacheSnapshot(SNAPSHOT_PATH)
+            except Exception as e:
+                print(f"Error loading cache snapshot: {e}")
+    return _snapshot or None
+
+
+# ---------------- 백엔드 선택 ----------------
+_cache = None
+
+
+def get_cache():
+    """📌 환경 변수로 고른 캐시 백엔드 (프로세스당 하나, 스냅샷이 있으면 그 위에 읽기 계층을 얹음)"""
+    global _cache
+    if _cache is None:
+        if CACHE_BACKEND == "mmap":
+            cache = MmapCache()
+        elif CACHE_BACKEND == "redis":
+            cache = RedisCache()
+        else:
+            cache = MemoryCache()
+        snapshot = get_snapshot()
+        _cache = SnapshotTier(cache, snapshot) if snapshot else cache
+    return _cache
+
+
+def set_cache(cache) -> Optional[object]:
+    """📌 캐시 백엔드를 직접 지정 (벤치마크/스냅샷 가져오기 등), 이전 백엔드를 반환"""
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
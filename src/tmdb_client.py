@@ -0,0 +1,501 @@
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import requests
+
+from src import shared_cache
+from src.json_projection import Items, compile_schema, dumps, loads_projected
+from src.movie_record import CAST_LIMIT, MovieRecord, from_tmdb
+
+# ---------------- TMDb API 기본 설정 ----------------
+BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+LANGUAGE = "ko-KR"
+REQUEST_TIMEOUT = 10
+DEFAULT_CACHE_TTL = 15 * 60
+STALE_TTL = 24 * 60 * 60       # 신선 기간이 지난 값도 장애 대비용으로 이만큼 더 보관
+FILL_WORKERS = 8
+
+# ---------------- 회로 차단기 설정 (엔드포인트 계열별) ----------------
+BREAKER_WINDOW = 30.0          # 오류율/지연을 계산하는 최근 구간 (초)
+BREAKER_MIN_CALLS = 5          # 이보다 적게 호출됐으면 판단하지 않음
+BREAKER_ERROR_RATE = 0.5       # 실패 비율이 이 이상이면 차단
+BREAKER_SLOW_CALL = 3.0        # 이보다 오래 걸린 호출은 느린 호출로 집계 (초)
+BREAKER_SLOW_RATE = 0.5        # 느린 호출 비율이 이 이상이면 차단
+BREAKER_OPEN_FOR = 15.0        # 차단 후 첫 시험 요청(half-open)까지 대기 (초)
+BREAKER_OPEN_MAX = 120.0       # 시험 요청이 계속 실패할 때 최대 대기 (초)
+
+# ---------------- 헤지 요청 설정 (멱등 GET의 지연 꼬리 줄이기, 선택 사용) ----------------
+HEDGE_QUANTILE = 0.95          # 첫 요청이 엔드포인트 계열의 이 분위수 지연을 넘기면 같은 요청을 한 번 더 보냄
+HEDGE_MIN_DELAY = 0.02         # 헤지 대기의 하한 (초)
+HEDGE_DEFAULT_DELAY = 0.5      # 지연 표본이 부족할 때 쓰는 대기 (초)
+HEDGE_MIN_SAMPLES = 20         # 분위수를 믿을 수 있는 최소 표본 수
+LATENCY_SAMPLES = 256          # 엔드포인트 계열별로 보관하는 최근 성공 지연 표본 수
+HEDGE_MAX_RATIO = 0.1          # 전체 요청 대비 헤지 요청 비율 상한 (API 할당량 보호)
+HEDGE_BURST = 5                # 한꺼번에 쓸 수 있는 헤지 예산
+HEDGE_WORKERS = 16
+
+
+def _load_api_key() -> Optional[str]:
+    """📌 환경 변수 → Streamlit secrets 순서로 TMDb API 키를 찾음 (Flask 프로세스에서도 사용)"""
+    api_key = os.getenv("MOVIEDB_API_KEY")
+    if api_key:
+        return api_key
+    try:
+        import streamlit as st
+        return st.secrets["MOVIEDB_API_KEY"]
+    except Exception:
+        return None
+
+
+# ---------------- 응답 투영 스키마 ----------------
+# 크레딧/필모그래피 응답은 대부분 쓰지 않는 crew 항목이라, 디코딩 직후 필요한 필드만 남겨 캐시합니다.
+def _is_director(member: Dict) -> bool:
+    return member.get("job") == "Director"
+
+
+MOVIE_FIELDS = {
+    "id": True, "title": True, "original_title": True, "overview": True, "release_date": True,
+    "vote_average": True, "vote_count": True, "popularity": True, "poster_path": True,
+    "backdrop_path": True, "runtime": True, "genre_ids": True, "genres": Items({"id": True, "name": True}),
+}
+CREDITS_FIELDS = {
+    "id": True,
+    "cast": Items({"id": True, "name": True, "character": True, "profile_path": True}, limit=CAST_LIMIT),
+    "crew": Items({"id": True, "name": True, "job": True}, where=_is_director),
+}
+FILMOGRAPHY_ITEM = {
+    "id": True, "title": True, "original_title": True, "overview": True, "release_date": True,
+    "vote_average": True, "vote_count": True, "popularity": True, "poster_path": True,
+    "genre_ids": True, "character": True, "job": True,
+}
+PROJECTIONS = {
+    "movie_details": dict(MOVIE_FIELDS, credits=CREDITS_FIELDS),
+    "movie_credits": CREDITS_FIELDS,
+    # 참여작(crew)은 연출작만 남김 (한 영화에 여러 직무로 중복 등장하는 항목 제거)
+    "filmography": {"id": True, "cast": Items(FILMOGRAPHY_ITEM), "crew": Items(FILMOGRAPHY_ITEM, where=_is_director)},
+}
+_PROJECTORS = {name: compile_schema(schema) for name, schema in PROJECTIONS.items()}
+# (경로 패턴, 필요한 append_to_response 값, 스키마 이름)
+ENDPOINT_PROJECTIONS = (
+    (re.compile(r"^/movie/\d+$"), "credits", "movie_details"),
+    (re.compile(r"^/movie/\d+/credits$"), None, "movie_credits"),
+    (re.compile(r"^/person/\d+/movie_credits$"), None, "filmography"),
+)
+
+
+def projection_for(path: str, params: Optional[Dict] = None) -> Optional[str]:
+    """📌 요청에 적용할 투영 스키마 이름 (해당 없으면 None → 원본 그대로)"""
+    append = (params or {}).get("append_to_response")
+    for pattern, required_append, name in ENDPOINT_PROJECTIONS:
+        if pattern.match(path) and append == required_append:
+            return name
+    return None
+
+
+API_KEY = _load_api_key()
+_session = requests.Session()
+_fill_pool = ThreadPoolExecutor(max_workers=FILL_WORKERS, thread_name_prefix="tmdb-fill")
+_hedge_pool = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="tmdb-hedge")
+
+# 원본(TMDb) 요청 수와 캐시 적중 수 (벤치마크/상태 확인용)
+STATS = {"upstream": 0, "cache_hits": 0, "stale_served": 0, "circuit_rejected": 0, "hedged": 0, "hedge_wins": 0}
+_stats_lock = threading.Lock()
+_hedge_budget = {"tokens": float(HEDGE_BURST)}
+
+
+def _count(name: str, n: int = 1):
+    with _stats_lock:
+        STATS[name] += n
+
+
+# ---------------- 회로 차단기 ----------------
+class CircuitOpenError(Exception):
+    """📌 엔드포인트 계열의 회로가 열려 있어 TMDb를 호출하지 않고 즉시 실패"""
+
+
+class CircuitBreaker:
+    """
+    📌 최근 BREAKER_WINDOW초의 실패율/느린 호출 비율로 열리는 회로 차단기
+    closed → (실패/지연 증가) → open → (대기 후) half-open: 시험 요청 1개만 통과
+    → 성공하면 closed, 실패하면 대기 시간을 두 배로 늘려 다시 open.
+    """
+
+    def __init__(self, family: str):
+        self.family = family
+        self.state = "closed"
+        self.calls = deque()          # (시각, 성공 여부, 느린 호출 여부)
+        self.opened_at = 0.0
+        self.open_for = BREAKER_OPEN_FOR
+        self.probing = False
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)  # 호출자가 실제로 기다린 최근 성공 지연 (헤지 기준)
+        self.hedge_after = None                         # 캐시된 분위수 (표본이 16개 쌓일 때마다 다시 계산)
+        self.lock = threading.Lock()
+
+    def rejecting(self) -> bool:
+        """📌 지금 요청하면 거절될지 (상태를 바꾸지 않는 확인용)"""
+        with self.lock:
+            if self.state == "open":
+                return time.monotonic() - self.opened_at < self.open_for
+            return self.state == "half_open" and self.probing
+
+    def allow(self) -> bool:
+        """📌 요청을 보내도 되는지 (half-open이면 시험 요청 하나만 허용)"""
+        with self.lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.open_for:
+                self.state, self.probing = "half_open", False
+            if self.state == "closed":
+                return True
+            if self.state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+    def hedge_delay(self) -> float:
+        """📌 헤지 요청을 보내기 전 기다릴 시간 = 최근 성공 지연의 HEDGE_QUANTILE 분위수"""
+        with self.lock:
+            if len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return HEDGE_DEFAULT_DELAY
+            if self.hedge_after is None:
+                ordered = sorted(self.latencies)
+                self.hedge_after = max(HEDGE_MIN_DELAY, ordered[int(len(ordered) * HEDGE_QUANTILE)])
+            return self.hedge_after
+
+    def observe(self, latency: float):
+        """📌 헤지 기준 표본 추가 (헤지에 진 요청의 늦은 응답은 넣지 않아 분위수가 부풀지 않게 함)"""
+        with self.lock:
+            self.latencies.append(latency)
+            if len(self.latencies) % 16 == 0:
+                self.hedge_after = None
+
+    def record(self, ok: bool, latency: float):
+        now = time.monotonic()
+        slow = latency >= BREAKER_SLOW_CALL
+        with self.lock:
+            if self.state == "half_open":
+                self.probing = False
+                if ok and not slow:
+                    self.state, self.open_for = "closed", BREAKER_OPEN_FOR
+                    self.calls.clear()
+                else:
+                    self._open(now, min(self.open_for * 2, BREAKER_OPEN_MAX))
+                return
+            if self.state == "open":
+                return
+            self.calls.append((now, ok, slow))
+            while self.calls and now - self.calls[0][0] > BREAKER_WINDOW:
+                self.calls.popleft()
+            total = len(self.calls)
+            if total < BREAKER_MIN_CALLS:
+                return
+            failures = sum(1 for _, call_ok, _ in self.calls if not call_ok)
+            slow_calls = sum(1 for _, _, call_slow in self.calls if call_slow)
+            if failures / total >= BREAKER_ERROR_RATE or slow_calls / total >= BREAKER_SLOW_RATE:
+                self._open(now, BREAKER_OPEN_FOR)
+
+    def _open(self, now: float, open_for: float):
+        self.state, self.opened_at, self.open_for = "open", now, open_for
+        self.calls.clear()
+        print(f"TMDb 회로 차단: {self.family} ({open_for:.0f}초)")
+
+    def status(self) -> Dict:
+        with self.lock:
+            return {"state": self.state, "recent_calls": len(self.calls),
+                    "retry_in": max(0.0, self.open_for - (time.monotonic() - self.opened_at))
+                    if self.state == "open" else 0.0}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def endpoint_family(path: str) -> str:
+    """📌 회로 차단 단위: 경로의 숫자 ID를 {id}로 바꾼 형태 (예: /movie/{id}/credits)"""
+    return re.sub(r"/\d+", "/{id}", path)
+
+
+def _breaker(path: str) -> CircuitBreaker:
+    family = endpoint_family(path)
+    breaker = _breakers.get(family)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(family, CircuitBreaker(family))
+    return breaker
+
+
+def circuit_status() -> Dict[str, Dict]:
+    """📌 엔드포인트 계열별 회로 상태 (상태 확인 엔드포인트용)"""
+    return {family: breaker.status() for family, breaker in list(_breakers.items())}
+
+
+def degraded() -> bool:
+    """📌 열려 있는 회로가 하나라도 있으면 True (화면에 저장된 데이터 사용 안내용)"""
+    return any(breaker.state != "closed" for breaker in list(_breakers.values()))
+
+
+def _is_failure(error: Exception) -> bool:
+    """📌 장애로 집계할 오류인지 (404 같은 요청 자체의 문제는 제외, 429/5xx/네트워크 오류는 포함)"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+def _guarded(path: str, send):
+    """📌 회로 차단기를 거쳐 요청 실행: 열려 있으면 기다리지 않고 즉시 CircuitOpenError"""
+    breaker = _breaker(path)
+    if not breaker.allow():
+        _count("circuit_rejected")
+        raise CircuitOpenError(f"TMDb 회로 차단 중: {breaker.family}")
+    started = time.monotonic()
+    try:
+        response = send()
+        response.raise_for_status()
+    except Exception as e:
+        breaker.record(not _is_failure(e), time.monotonic() - started)
+        raise
+    breaker.record(True, time.monotonic() - started)
+    return response
+
+
+def _entry(cached: Dict, key: str) -> Optional[list]:
+    """📌 캐시 값 [신선 기한, 값] 꺼내기 (이전 형식으로 저장된 값은 미스로 취급)"""
+    entry = cached.get(key)
+    return entry if isinstance(entry, list) and len(entry) == 2 else None
+
+
+def _spend_hedge() -> bool:
+    """📌 헤지 예산에서 하나를 씀 (요청마다 HEDGE_MAX_RATIO씩 쌓이고 HEDGE_BURST까지만 모임)"""
+    with _stats_lock:
+        if _hedge_budget["tokens"] < 1:
+            return False
+        _hedge_budget["tokens"] -= 1
+        return True
+
+
+def _hedged(path: str, attempt):
+    """
+    📌 같은 GET을 최대 두 번 보내 먼저 성공한 응답 사용
+    첫 요청이 엔드포인트 계열의 p95 안에 끝나면 그대로 반환하고, 넘기면 예산이 남아 있을 때만 예비 요청을
+    헤지 풀에 올립니다. 두 요청의 결과는 공유 Future 하나로 모아 먼저 성공한 쪽을 반환하고, 둘 다 실패하면
+    첫 요청의 예외를 올립니다. 예산이 없어 헤지할 수 없으면 호출한 스레드에서 그대로 보냅니다.
+    """
+    with _stats_lock:
+        _hedge_budget["tokens"] = min(HEDGE_BURST, _hedge_budget["tokens"] + HEDGE_MAX_RATIO)
+        can_hedge = _hedge_budget["tokens"] >= 1
+    if not can_hedge:
+        return attempt()
+
+    outcome: Future = Future()
+    guard = threading.Lock()
+    state = {"running": 1, "errors": []}
+
+    def run(backup: bool):
+        try:
+            value = attempt()
+        except Exception as e:
+            with guard:
+                state["running"] -= 1
+                state["errors"].append(e)
+                if state["running"] == 0 and not outcome.done():
+                    outcome.set_exception(state["errors"][0])
+            return
+        with guard:
+            state["running"] -= 1
+            if not outcome.done():
+                outcome.set_result((backup, value))
+
+    # 호출한 스레드는 소켓 읽기 중에 다른 응답을 받을 수 없으므로, 첫 요청은 풀 밖의 짧은 스레드로 보내고
+    # 호출한 스레드는 결과만 기다림 (헤지 풀은 예비 요청 전용이라 첫 요청이 풀 자리를 두고 밀리지 않음)
+    threading.Thread(target=run, args=(False,), name="tmdb-primary", daemon=True).start()
+    wait([outcome], timeout=_breaker(path).hedge_delay())
+    if not outcome.done():
+        with guard:
+            send = not outcome.done() and _spend_hedge()
+            if send:
+                state["running"] += 1
+        if send:
+            _count("hedged")
+            _hedge_pool.submit(run, True)
+    backup, value = outcome.result()
+    if backup:
+        _count("hedge_wins")
+    return value
+
+
+def _mark_stale(value):
+    """📌 장애 중 대신 돌려주는 지난 값 표시 (원본 캐시 객체는 건드리지 않음)"""
+    return dict(value, _stale=True) if isinstance(value, dict) else value
+
+
+# ---------------- 공통 요청 함수 ----------------
+def cache_key(path: str, params: Optional[Dict] = None, projection: Optional[str] = None) -> str:
+    """📌 경로와 파라미터(api_key 제외), 투영 스키마 이름으로 만든 캐시 키"""
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "api_key")
+    key = f"{path}?{urlencode(items)}"
+    return f"{key}#{projection}" if projection else key
+
+
+def _fetch(path: str, params: Optional[Dict], timeout: float, projection: Optional[str] = None,
+           hedge: bool = False) -> Dict:
+    """📌 캐시를 거치지 않고 TMDb에 직접 GET 요청 (디코딩하면서 바로 투영, hedge=True면 헤지 요청)"""
+    query = {"api_key": API_KEY}
+    query.update(params or {})
+
+    def attempt():
+        _count("upstream")
+        response = _guarded(path, lambda: _session.get(f"{BASE_URL}{path}", params=query, timeout=timeout))
+        return loads_projected(response.content, _PROJECTORS.get(projection))
+
+    started = time.monotonic()
+    value = _hedged(path, attempt) if hedge else attempt()
+    _breaker(path).observe(time.monotonic() - started)
+    return value
+
+
+def _fill(key: str, path: str, params: Optional[Dict], timeout: float, cache_ttl: float,
+          projection: Optional[str] = None, hedge: bool = False) -> Dict:
+    """
+    📌 캐시 미스 채우기 (single-flight)
+    같은 키를 여러 프로세스가 동시에 요청하면 한 곳만 TMDb를 호출하고 나머지는 그 결과를 캐시에서 읽습니다.
+    캐시에는 [신선 기한, 값]을 신선 기간 + STALE_TTL 동안 보관해 장애 시 지난 값을 돌려줄 수 있게 합니다.
+    """
+    if _breaker(path).rejecting():
+        # 회로가 열려 있으면 잠금을 기다리지 않고 바로 실패 → 호출자가 지난 값으로 대체
+        _count("circuit_rejected")
+        raise CircuitOpenError(f"TMDb 회로 차단 중: {endpoint_family(path)}")
+    cache = shared_cache.get_cache()
+    with cache.lock(key) as acquired:
+        if acquired:
+            entry = _entry(cache.get_many([key]), key)
+            if entry and entry[0] > time.time():
+                _count("cache_hits")
+                return entry[1]
+        value = _fetch(path, params, timeout, projection, hedge)
+        cache.set_many({key: [time.time() + cache_ttl, value]}, cache_ttl + STALE_TTL)
+        return value
+
+
+def get_many_json(requests_: Iterable[Tuple[str, Optional[Dict]]], timeout: float = REQUEST_TIMEOUT,
+                  cache_ttl: float = DEFAULT_CACHE_TTL, project: bool = True,
+                  allow_stale: bool = True, hedge: bool = False) -> List[Union[Dict, Exception]]:
+    """
+    📌 여러 GET 요청을 한 번에 처리
+    캐시는 한 번의 multi-get으로 조회하고, 미스만 병렬로 TMDb에서 채웁니다.
+    실패한 요청은 결과 자리에 예외 객체를 넣어 부분 결과를 돌려줍니다.
+    project=True이면 크레딧/필모그래피 응답은 투영된 압축 구조만 반환·캐시합니다.
+    allow_stale=True이면 요청이 실패하거나 회로가 열려 있을 때 마지막 정상 값을 "_stale": True로 표시해 반환합니다.
+    hedge=True이면 늦어지는 요청을 한 번 더 보내 먼저 온 응답을 씁니다 (화면을 바로 그려야 하는 조회용).
+    """
+    requests_ = list(requests_)
+    projections = [projection_for(path, params) if project else None for path, params in requests_]
+    keys = [cache_key(path, params, name) for (path, params), name in zip(requests_, projections)]
+    cache = shared_cache.get_cache()
+    cached = cache.get_many(set(keys)) if cache_ttl else {}
+
+    results: List[Union[Dict, Exception, None]] = [None] * len(requests_)
+    misses, stale = {}, {}
+    now = time.time()
+    for i, key in enumerate(keys):
+        entry = _entry(cached, key)
+        if entry and entry[0] > now:
+            results[i] = entry[1]
+            continue
+        if entry:
+            stale[key] = entry[1]
+        misses.setdefault(key, []).append(i)
+    _count("cache_hits", len(requests_) - sum(len(v) for v in misses.values()))
+
+    def fill(key):
+        first = misses[key][0]
+        path, params = requests_[first]
+        if not cache_ttl:
+            return _fetch(path, params, timeout, projections[first], hedge)
+        try:
+            return _fill(key, path, params, timeout, cache_ttl, projections[first], hedge)
+        except Exception:
+            if allow_stale and key in stale:
+                _count("stale_served")
+                return _mark_stale(stale[key])
+            raise
+
+    if len(misses) == 1:
+        futures = {key: None for key in misses}
+    else:
+        futures = {key: _fill_pool.submit(fill, key) for key in misses}
+    for key, future in futures.items():
+        try:
+            value = fill(key) if future is None else future.result()
+        except Exception as e:
+            value = e
+        for i in misses[key]:
+            results[i] = value
+    return results
+
+
+def export_entries(keys: Iterable[str], fresh_for: float) -> Dict[str, bytes]:
+    """
+    📌 캐시 스냅샷용 항목: 캐시에 있는 값을 지금부터 fresh_for초 동안 신선한 값으로 인코딩
+    (스냅샷을 가져온 노드가 곧바로 TMDb를 다시 부르지 않도록)
+    """
+    keys = list(keys)
+    cache = shared_cache.get_cache()
+    fresh_until = time.time() + fresh_for
+    entries = {}
+    for start in range(0, len(keys), 500):
+        cached = cache.get_many(keys[start:start + 500])
+        for key in cached:
+            entry = _entry(cached, key)
+            if entry:
+                entries[key] = dumps([fresh_until, entry[1]])
+    return entries
+
+
+def get_json(path: str, params: Optional[Dict] = None, timeout: float = REQUEST_TIMEOUT,
+             cache_ttl: float = DEFAULT_CACHE_TTL, project: bool = True, allow_stale: bool = True,
+             hedge: bool = False) -> Dict:
+    """
+    📌 TMDb GET 요청을 보내고 JSON을 반환 (공유 캐시 사용, cache_ttl=0이면 캐시 생략)
+    장애 중에는 지난 값("_stale": True)을 반환하고, 그것도 없으면 예외를 그대로 올려
+    호출자(스케줄러 등)가 재시도 여부를 판단하게 합니다.
+    """
+    result = get_many_json([(path, params)], timeout=timeout, cache_ttl=cache_ttl, project=project,
+                           allow_stale=allow_stale, hedge=hedge)[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def post_json(path: str, payload: Dict, params: Optional[Dict] = None, timeout: float = REQUEST_TIMEOUT) -> Dict:
+    """📌 TMDb POST 요청 (계정 목록 변경 등, 캐시 사용 안 함), 실패 시 예외"""
+    query = {"api_key": API_KEY}
+    query.update(params or {})
+    _count("upstream")
+    response = _guarded(path, lambda: _session.post(f"{BASE_URL}{path}", params=query, json=payload, timeout=timeout))
+    return loads_projected(response.content)
+
+
+# ---------------- 영화 상세 수집 ----------------
+def _details_request(movie_id: int) -> Tuple[str, Dict]:
+    return f"/movie/{movie_id}", {"language": LANGUAGE, "append_to_response": "credits"}
+
+
+def hydrate_movies(movie_ids: Iterable[int], hedge: bool = False,
+                   allow_stale: bool = True) -> List[Union[MovieRecord, Exception, None]]:
+    """📌 여러 영화의 상세+크레딧을 캐시 한 번 조회로 모아 MovieRecord로 변환 (실패는 예외 객체)"""
+    results = get_many_json([_details_request(movie_id) for movie_id in movie_ids], hedge=hedge,
+                            allow_stale=allow_stale)
+    return [r if isinstance(r, Exception) else from_tmdb(r) for r in results]
+
+
+def hydrate_movie(movie_id: int) -> Optional[MovieRecord]:
+    """📌 상세 정보와 크레딧을 한 번의 요청으로 받아 MovieRecord로 변환"""
+    result = hydrate_movies([movie_id])[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
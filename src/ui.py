@@ -4,18 +4,18 @@ from src.auth_user import (
     create_session, create_guest_session, delete_session, is_user_authenticated
 )
 from src.data_fetcher import (
-    fetch_genres_list, fetch_movies_by_category, fetch_movies_by_genre,
-    search_movie, search_person, fetch_movies_by_person,
-    search_keyword_movies, fetch_movies_by_keyword,
-    get_movie_details,
+    fetch_movies_by_genre,
+    search_movie, fetch_movies_by_person, fetch_movies_by_keyword,
 )
 from src.movie_recommend import (
-    get_personalized_recommendations, 
-    get_mood_based_recommendations, 
-    get_movies_by_keyword, get_trending_movies,
     generate_text_via_api
 )
+from src.genre_map import GENRE_MAP
 from src.auth_user import load_user_preferences, save_user_preferences
+from src.movie_record import records_from_tmdb
+from src.poster_cache import poster_url
+from src import hot_lists, genre_catalog, account_lists, event_log, card_grid, autocomplete
+from src.rec_stream import iter_events
 
 
 # ---------------- CSS 스타일 로드 함수 ----------------
@@ -45,6 +45,31 @@ def load_css():
             margin-bottom: 5px;
             display: block;
         }
+        .card-grid {
+            display: grid;
+            gap: 1rem;
+        }
+        .card-grid img, .card-list img {
+            max-width: 100%;
+            height: auto;
+            border-radius: 6px;
+            background: #262730;
+        }
+        .card-grid img {
+            width: 250px;
+        }
+        .card-list-row {
+            display: flex;
+            gap: 1rem;
+            padding: 0.75rem 0;
+            border-bottom: 1px solid #333;
+            content-visibility: auto;
+            contain-intrinsic-size: auto 240px;
+        }
+        .card-list-row img {
+            flex: none;
+            width: 150px;
+        }
     </style>
     """, unsafe_allow_html=True)
 
@@ -84,24 +109,50 @@ def navigation_menu():
 
     return st.session_state.selected_page
 # ---------------- 즐겨찾기 영화 함수 ----------------
+ACCOUNT_LIST_PAGE_SIZE = 10
+ACCOUNT_LIST_LABELS = {"favorite": "🌟 즐겨찾기", "watchlist": "📌 보고 싶은 영화"}
+
+
 def show_favorite_movies():
     st.subheader("🌟 즐겨찾기한 영화")
     session_id = st.session_state.get("SESSION_ID", None)
-    account_id = st.secrets.get("ACCOUNT_ID", None)
-    if not session_id or not account_id:
-        st.warning("로그인 없이도 즐겨찾기한 영화를 볼 수 있습니다.")
+    if not session_id or not account_lists.get_account_id(session_id):
+        st.warning("TMDb 계정으로 로그인하면 즐겨찾기한 영화를 볼 수 있습니다.")
         return
-    with st.spinner("즐겨찾기한 영화를 불러오는 중..."):
-        movies = fetch_movies_by_category("favorite") or []
-    if not movies:
-        st.warning("즐겨찾기한 영화가 없습니다.")
+    tabs = st.tabs([ACCOUNT_LIST_LABELS[c] for c in account_lists.CATEGORIES])
+    for tab, category in zip(tabs, account_lists.CATEGORIES):
+        with tab:
+            show_account_list(session_id, category)
+
+
+def show_account_list(session_id, category):
+    """📌 계정 목록을 캐시에서 읽어 페이지 단위로 표시 (첫 로드 이후에는 네트워크 대기 없음)"""
+    with st.spinner("목록을 불러오는 중..."):
+        records = account_lists.get_list(session_id, category)
+    if not records:
+        st.warning("목록에 영화가 없습니다.")
         return
-    for movie in movies[:5]:
-        poster_url = movie.get("poster_path") or "https://via.placeholder.com/500x750?text=정보없음"
-        st.image(poster_url, width=150, caption=movie.get("title") or "정보없음")
-        st.write(f"**{movie.get('title', '정보없음')}** ({movie.get('release_date', '정보없음')})")
-        st.write(f"⭐ 평점: {movie.get('vote_average', '정보없음')}/10")
-        st.write(f"📜 줄거리: {movie.get('overview', '정보없음')[:150]}...")
+
+    shown_key = f"account_list_shown_{category}"
+    shown = st.session_state.get(shown_key, ACCOUNT_LIST_PAGE_SIZE)
+    st.caption(f"총 {len(records)}편")
+    for position, record in enumerate(records[:shown]):
+        event_log.track("impression", dedupe_key=(category, record.id),
+                        surface=category, movie_id=record.id, position=position)
+        cols = st.columns([1, 4])
+        cols[0].image(poster_url(record.poster_path, 150), width=150)
+        with cols[1]:
+            st.write(f"**{record.title}** ({record.release_date or '정보없음'})")
+            st.write(f"⭐ 평점: {record.vote_average}/10")
+            st.write(f"📜 줄거리: {(record.overview or '정보없음')[:150]}...")
+            if st.button("목록에서 제거", key=f"remove_{category}_{record.id}"):
+                if not account_lists.set_favorite(session_id, record, False, category=category):
+                    st.error("목록을 변경하지 못했습니다. 잠시 후 다시 시도해주세요.")
+                st.rerun()
+    if shown < len(records) and st.button("더 보기", key=f"more_{category}"):
+        event_log.track("more", surface=category, shown=shown)
+        st.session_state[shown_key] = shown + ACCOUNT_LIST_PAGE_SIZE
+        st.rerun()
 
 
 
@@ -111,12 +162,13 @@ def show_profile_setup():
     """📌 사용자 프로필 설정"""
     st.subheader("🔰 선호하는 영화 스타일을 선택해주세요!")
     
-    with st.spinner(" 영화 스타일 정보를 불러오는 중...⏳"):
-        time.sleep(2)  # ✅ 로딩 효과 추가
-        from src.data_fetcher import fetch_genres_list, fetch_movies_by_genre
-        genre_data = fetch_genres_list()
-        genre_dict = {genre["id"]: genre["name"] for genre in genre_data if isinstance(genre, dict)}
-        genre_list = list(genre_dict.values()) if genre_dict else ["액션", "코미디", "드라마", "SF", "스릴러"]
+    # ✅ 장르 및 후보 영화는 미리 만든 카탈로그 스냅샷에서 읽음 (네트워크 호출 없음, 스냅샷을 기다리지 않음)
+    genre_data = genre_catalog.get_genres() or hot_lists.get_snapshot("genres", wait=0)
+    genre_dict = {genre["id"]: genre["name"] for genre in genre_data if isinstance(genre, dict)}
+    if not genre_dict:
+        # 첫 실행이라 스냅샷이 아직 없으면 내장 장르 매핑으로 그리고, 카탈로그는 백그라운드에서 채워짐
+        genre_dict = {genre_id: name for name, genre_id in GENRE_MAP.items()}
+    genre_list = list(genre_dict.values())
 
     # ✅ 사용자가 선택할 수 있는 옵션
     selected_genres = st.multiselect("🎭 선호하는 장르를 선택하세요", genre_list)
@@ -124,13 +176,20 @@ def show_profile_setup():
     movie_titles = []
     if selected_genres:
         genre_ids = [key for key, value in genre_dict.items() if value in selected_genres]
-        movies = []
-        for genre_id in genre_ids:
-            movies.extend(fetch_movies_by_genre(genre_id) or [])
-        movie_titles = [movie.get("title") or "정보없음" for movie in movies]
+        movie_titles = genre_catalog.titles_for_genres(genre_ids)
+        if not genre_catalog.ready():
+            st.info("🎬 후보 영화 목록을 준비하고 있어요. 잠시 후 다시 열면 영화를 고를 수 있습니다.")
 
-    watched_movies = st.multiselect("📌 지금까지 본 영화를 선택하세요", movie_titles)
-    favorite_movies = st.multiselect("🌟 좋아하는 영화를 선택하세요", movie_titles)
+    # ✅ 후보가 많을 때를 위한 제목 검색 (이미 선택한 영화는 항상 옵션에 유지)
+    title_query = st.text_input("🔎 영화 제목 검색", placeholder="제목 일부를 입력하면 후보가 좁혀집니다")
+    matched_titles = genre_catalog.search_titles(movie_titles, title_query)
+
+    def _options(key):
+        selected = [t for t in st.session_state.get(key, []) if t not in matched_titles]
+        return selected + matched_titles
+
+    watched_movies = st.multiselect("📌 지금까지 본 영화를 선택하세요", _options("profile_watched"), key="profile_watched")
+    favorite_movies = st.multiselect("🌟 좋아하는 영화를 선택하세요", _options("profile_favorite"), key="profile_favorite")
     
     additional_choices = [
         "감동적인", "긴장감 있는", "로맨틱한", "현실적인", "코미디 요소", "강렬한 액션", "미스터리한",
@@ -172,18 +231,42 @@ def show_mood_based_recommendations():
         return
 
     for movie in mood_movies[:5]:
-        poster_url = f"https://image.tmdb.org/t/p/w500{movie.get('poster_path', '')}" if movie.get("poster_path") else "https://via.placeholder.com/500x750?text=No+Image"
-        st.image(poster_url, use_container_width=True, caption=movie.get("title", "Unknown"))
+        st.image(poster_url(movie.get("poster_path"), 500), use_container_width=True, caption=movie.get("title", "Unknown"))
         st.write(f"**{movie.get('title', 'Unknown')}** ({movie.get('release_date', 'Unknown')[:4]})")
 
 
 
 # ---------------- 영화 검색 함수 ----------------
+SUGGESTION_ICONS = {"person": "🎭", "keyword": "🔑"}
+
+
+def _pick_suggestion(suggestions):
+    """📌 추천 검색어를 고르면 검색창에 채우고, 제출할 때 다시 찾지 않도록 고른 항목을 기억"""
+    label = st.session_state.get("search_suggestion")
+    picked = next((s for s in suggestions if f"{SUGGESTION_ICONS[s.kind]} {s.label}" == label), None)
+    if picked:
+        st.session_state["search_query"] = picked.name
+        st.session_state["search_pick"] = picked
+    st.session_state["search_suggestion"] = None
+
+
+@st.fragment
+def _search_box():
+    """📌 입력하는 동안 이 부분만 다시 실행하며 로컬 색인에서 배우/키워드 추천 (네트워크 호출 없음)"""
+    query = st.text_input("검색할 영화를 입력하세요", placeholder="예: 인셉션, 톰 크루즈",
+                          key="search_query", live="200ms")
+    suggestions = autocomplete.suggest(query) if query.strip() else []
+    if suggestions:
+        st.pills("💡 추천 검색어", [f"{SUGGESTION_ICONS[s.kind]} {s.label}" for s in suggestions],
+                 key="search_suggestion", on_change=_pick_suggestion, args=(suggestions,))
+
+
 def show_movie_search():
     st.subheader("🔍 영화 검색")
     
-    # 🔎 검색 입력 받기
-    query = st.text_input("검색할 영화를 입력하세요", placeholder="예: 인셉션, 톰 크루즈")
+    # 🔎 검색 입력 받기 (입력 중 자동 완성)
+    _search_box()
+    query = st.session_state.get("search_query", "")
     
     # ✅ '검색 결과' 상태를 저장할 공간 (초기화)
     if "search_results" not in st.session_state:
@@ -198,8 +281,15 @@ def show_movie_search():
         with st.spinner("영화 정보를 검색하는 중...⏳"):
             time.sleep(2)  # ✅ 로딩 효과 추가
             movies = search_movie(query) or []
-            actors = search_person(query) or []
-            keywords = search_keyword_movies(query) or []
+            picked = st.session_state.get("search_pick")
+            if picked and picked.name == query:
+                # ✅ 추천 검색어를 골랐으면 그 배우/키워드만 사용
+                found = {"person": [], "keyword": [], picked.kind: [{"id": picked.id, "name": picked.name}]}
+            else:
+                # ✅ 로컬 색인에 없는 종류만 TMDb에 한 번에 검색
+                found = autocomplete.resolve(query)
+            actors = found["person"]
+            keywords = found["keyword"]
 
         # ✅ 배우 선택 및 영화 검색 결과 추가
         if actors:
@@ -223,9 +313,10 @@ def show_movie_search():
             if selected_keyword:
                 movies.extend(fetch_movies_by_keyword(selected_keyword))
 
-        # ✅ 검색 결과 저장
+        # ✅ 검색 결과 저장 (원본 JSON 대신 압축 레코드만 세션에 보관)
+        event_log.track("search", surface="search", query=query, results=len(movies))
         if movies:
-            st.session_state.search_results = movies
+            st.session_state.search_results = records_from_tmdb(movies)
             st.session_state.display_count = 10  # 결과 초기화
         else:
             st.warning(f"❌ '{query}'와 관련된 영화가 없습니다.")
@@ -237,19 +328,16 @@ def show_movie_search():
         # ✅ 처음 10개만 표시 (더보기 버튼 클릭 시 확장)
         displayed_movies = st.session_state.search_results[: st.session_state.display_count]
 
-        for movie in displayed_movies:
-            details = get_movie_details(movie["id"])
-            if details:
-                poster_url = f"https://image.tmdb.org/t/p/w500{details.get('poster_path', '')}" if details.get("poster_path") else "https://via.placeholder.com/500x750?text=No+Image"
-                st.image(poster_url, width=150, caption=details.get("title", "정보없음"))
-                st.write(f"**{details.get('title', '정보없음')}** ({details.get('release_date', '정보없음')})")
-                st.write(f"⭐ 평점: {details.get('vote_average', '정보없음')}/10")
-                st.write(f"📜 줄거리: {details.get('overview', '정보없음')[:150]}...")
-                st.write("---")
+        # ✅ 검색 결과에 이미 표시 정보가 있으므로 영화별 상세 조회 없이 출력 (목록 전체를 HTML 한 번으로)
+        for position, movie in enumerate(displayed_movies):
+            event_log.track("impression", dedupe_key=("search", movie.id),
+                            surface="search", movie_id=movie.id, position=position)
+        st.html(card_grid.list_html(displayed_movies, poster_width=150))
 
         # ✅ "더보기" 버튼 (남은 영화가 있을 경우)
         if st.session_state.display_count < len(st.session_state.search_results):
             if st.button("➕ 더보기", key="load_more_btn"):
+                event_log.track("more", surface="search", shown=st.session_state.display_count)
                 st.session_state.display_count += 10  # 10개씩 추가 표시
                 st.experimental_rerun()  # UI 업데이트
 
@@ -277,51 +365,25 @@ def show_generated_recommendations():
 
     # ✅ "추천 생성" 버튼
     if st.button("🎬 추천 생성", key="generate_btn"):
-        with st.spinner("⏳ 추천 영화를 찾는 중... 잠시만 기다려 주세요!"):
-            time.sleep(2)  # ✅ 로딩 효과
-            
-            # ✅ 추천 결과 초기화
-            recommendations = {}
-
-            # ✅ 1. 장르 기반 추천 (사용자 정보가 있을 경우)
-            if selected_genres:
-                recommendations["장르별 추천"] = get_personalized_recommendations(user_preferences)[:5]
-
-            # ✅ 2. 영화 스타일 기반 추천 (사용자 정보가 있을 경우)
-            if preferred_styles:
-                recommendations["영화 스타일별 추천"] = get_mood_based_recommendations(preferred_styles)[:5]
-
-            # ✅ 3. 지금까지 본 영화 기반 추천 (사용자 정보가 있을 경우)
-            if watched_movies:
-                recommendations["지금까지 본 영화 기반 추천"] = get_movies_by_keyword(watched_movies[0])[:5]  # ✅ 첫 번째 영화 키워드 검색
-
-            # ✅ 4. 좋아하는 영화 기반 추천 (사용자 정보가 있을 경우)
-            if favorite_movies:
-                recommendations["좋아하는 영화 기반 추천"] = get_movies_by_keyword(favorite_movies[0])[:5]  # ✅ 첫 번째 영화 키워드 검색
-
-            # ✅ 추가 입력한 키워드 기반 추천 (사용자 정보가 없더라도 가능)
-            if additional_info.strip():
-                print(f"🔎 검색 키워드: {additional_info.strip()}")  # 디버깅용 로그 출력
-                recommendations["검색 키워드 기반 추천"] = get_movies_by_keyword(additional_info.strip())[:5]
-
-                # ✅ 검색 결과가 없을 경우 대체 추천 제공
-                if not recommendations["검색 키워드 기반 추천"]:
+        st.markdown("### 🎥 추천된 영화 목록")
+        status = st.empty()
+        status.info("⏳ 추천 영화를 찾는 중... 준비된 카테고리부터 바로 보여드려요!")
+
+        # ✅ 카테고리는 동시에 계산되며, 끝나는 순서대로 화면에 추가됨
+        for event, data in iter_events(user_preferences, additional_info, include_llm=False):
+            if event == "category":
+                if data.get("fallback_for"):
                     st.warning(f"🔎 '{additional_info.strip()}'에 대한 영화가 없습니다. 대신 최신 영화를 추천해드립니다!")
-                    recommendations["최신 개봉 영화 추천"] = get_trending_movies()[:5]
-
-            # ✅ 결과 출력
-            st.markdown("### 🎥 추천된 영화 목록")
-
-            for category, movies in recommendations.items():
-                if movies:
-                    st.markdown(f"#### 🔹 {category}")
-                    for movie in movies:
-                        st.write(f"**🎬 {movie['title']}**")
-                        st.write(f"📜 {movie['overview']}\n")
-                else:
-                    st.markdown(f"#### 🔹 {category}")
+                st.markdown(f"#### 🔹 {data['name']}")
+                if not data["movies"]:
                     st.warning("❌ 관련 추천 영화가 없습니다.")
-
+                for movie in data["movies"]:
+                    st.write(f"**🎬 {movie['title']}**")
+                    st.write(f"📜 {movie['overview']}\n")
+            elif event == "category_error":
+                st.markdown(f"#### 🔹 {data['name']}")
+                st.warning(f"❌ {data['error']}")
+        status.empty()
         st.success("✅ 추천이 완료되었습니다!")
 
 
@@ -0,0 +1,61 @@
+"""
+📌 저장된 프로필/이벤트 로그 재생 테스트 (event_log.track으로 기록한 로그가 프로필과 연결되는지)
+
+실행: python -m pytest -q tests
+"""
+import importlib
+import json
+import os
+
+import pytest
+import streamlit
+
+from src import event_log
+
+
+@pytest.fixture
+def eval_recommenders(tmp_path, monkeypatch):
+    """📌 movie_recommend가 가져올 때 st.secrets를 읽으므로 임시 secrets.toml이 있는 곳에서 가져옴"""
+    secrets = tmp_path / ".streamlit"
+    secrets.mkdir()
+    (secrets / "secrets.toml").write_text('MOVIEDB_API_KEY = "standin"\n', encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return importlib.import_module("benchmarks.eval_recommenders")
+
+
+def _write_profile(profile_dir, key):
+    with open(os.path.join(profile_dir, f"{key}.json"), "w", encoding="utf-8") as f:
+        json.dump({"watched_movies": ["Heat"], "favorite_movies": [], "preferred_genres": ["액션"]}, f)
+
+
+def test_tracked_events_join_stored_profiles(eval_recommenders, tmp_path, monkeypatch):
+    profile_dir, events_dir = tmp_path / "profiles", tmp_path / "events"
+    profile_dir.mkdir()
+    _write_profile(profile_dir, event_log.DEFAULT_PROFILE_KEY)
+    _write_profile(profile_dir, "guest_abc")
+    monkeypatch.setattr(event_log, "EVENT_LOG_DIR", str(events_dir))
+
+    # 로그인 사용자 세션 (기본 프로필)
+    monkeypatch.setattr(streamlit, "session_state", {})
+    event_log.track("search", surface="search", query="heat", results=3)
+    event_log.track("open", surface="home", section="popular", movie_id=11, position=0)
+    # 게스트 세션 (auth_user가 게스트 프로필을 열면서 PROFILE_KEY를 설정)
+    monkeypatch.setattr(streamlit, "session_state", {event_log.PROFILE_KEY_STATE: "guest_abc"})
+    event_log.track("open", surface="home", section="popular", movie_id=22, position=1)
+    event_log.flush(final=True)
+
+    cases = {case.user: case for case in eval_recommenders.load_cases(str(profile_dir), str(events_dir))}
+    assert set(cases) == {event_log.DEFAULT_PROFILE_KEY, "guest_abc"}
+    assert cases[event_log.DEFAULT_PROFILE_KEY].relevant == frozenset({11})
+    assert cases[event_log.DEFAULT_PROFILE_KEY].query == "heat"
+    assert cases["guest_abc"].relevant == frozenset({22})
+
+
+def test_synthetic_dataset_yields_cases(eval_recommenders, tmp_path, monkeypatch):
+    profile_dir, events_dir = tmp_path / "profiles", tmp_path / "events"
+    profile_dir.mkdir()
+    monkeypatch.setattr(event_log, "EVENT_LOG_DIR", str(events_dir))
+    eval_recommenders.synthetic_dataset(5, str(profile_dir), str(events_dir))
+    cases = eval_recommenders.load_cases(str(profile_dir), str(events_dir))
+    assert len(cases) == 5
+    assert all(case.relevant for case in cases)
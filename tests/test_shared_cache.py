@@ -0,0 +1,170 @@
+"""
+📌 shared_cache 백엔드 테스트 (MemoryCache, MmapCache, RedisCache + 가짜 Redis 클라이언트)
+
+실행: python -m pytest -q tests
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from src import shared_cache
+
+
+class FakeRedis:
+    """📌 RedisCache가 쓰는 명령(MGET, SET EX/NX PX, 파이프라인, 잠금 해제 스크립트)만 흉내 낸 클라이언트"""
+
+    def __init__(self):
+        self.data = {}
+        self.guard = threading.Lock()
+
+    def _alive(self, key):
+        entry = self.data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.data[key]
+            return None
+        return entry
+
+    def get(self, key):
+        with self.guard:
+            entry = self._alive(key)
+            return entry[0] if entry else None
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False):
+        with self.guard:
+            if nx and self._alive(key):
+                return None
+            ttl = ex if ex is not None else (px / 1000 if px is not None else None)
+            self.data[key] = (value, time.monotonic() + ttl if ttl is not None else None)
+            return True
+
+    def delete(self, key):
+        with self.guard:
+            return 1 if self.data.pop(key, None) else 0
+
+    def eval(self, script, numkeys, key, token):
+        assert script == shared_cache.RedisCache._RELEASE
+        with self.guard:
+            entry = self._alive(key)
+            if entry and entry[0] == token:
+                del self.data[key]
+                return 1
+            return 0
+
+    def pipeline(self, transaction=False):
+        client = self
+
+        class Pipeline:
+            def __init__(self):
+                self.commands = []
+
+            def set(self, *args, **kwargs):
+                self.commands.append((args, kwargs))
+
+            def execute(self):
+                return [client.set(*args, **kwargs) for args, kwargs in self.commands]
+        return Pipeline()
+
+
+@pytest.fixture(params=["memory", "mmap", "redis"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return shared_cache.MemoryCache()
+    if request.param == "mmap":
+        return shared_cache.MmapCache(str(tmp_path / "cache"), slots=64, slot_size=4096)
+    return shared_cache.RedisCache(client=FakeRedis())
+
+
+def test_get_many_returns_only_stored_keys(cache):
+    cache.set_many({"a": {"x": 1}, "b": [1, 2, 3], "c": "문자열"}, ttl=60)
+    assert cache.get_many(["a", "b", "c", "missing"]) == {"a": {"x": 1}, "b": [1, 2, 3], "c": "문자열"}
+    assert cache.get_many([]) == {}
+
+
+def test_set_many_overwrites_existing_key(cache):
+    cache.set_many({"a": 1}, ttl=60)
+    cache.set_many({"a": 2}, ttl=60)
+    assert cache.get_many(["a"]) == {"a": 2}
+
+
+def test_entries_expire_after_ttl(cache):
+    cache.set_many({"short": 1}, ttl=1)
+    cache.set_many({"long": 2}, ttl=60)
+    time.sleep(1.1)
+    assert cache.get_many(["short", "long"]) == {"long": 2}
+
+
+def test_lock_is_exclusive_until_released(cache):
+    held, release = threading.Event(), threading.Event()
+
+    def holder():
+        with cache.lock("key", timeout=1) as acquired:
+            assert acquired
+            held.set()
+            release.wait(5)
+
+    thread = threading.Thread(target=holder)
+    thread.start()
+    held.wait(5)
+    with cache.lock("key", timeout=0.1) as acquired:
+        assert not acquired
+    release.set()
+    thread.join()
+    with cache.lock("key", timeout=1) as acquired:
+        assert acquired
+
+
+def test_lock_single_flight_under_contention(cache):
+    calls, results = [], []
+
+    def fill():
+        with cache.lock("hot", timeout=5):
+            found = cache.get_many(["hot"])
+            if "hot" not in found:
+                calls.append(1)
+                time.sleep(0.05)
+                cache.set_many({"hot": "value"}, ttl=60)
+                found = {"hot": "value"}
+            results.append(found["hot"])
+
+    threads = [threading.Thread(target=fill) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+
+
+def test_memory_cache_evicts_oldest_entries():
+    cache = shared_cache.MemoryCache(max_entries=2)
+    cache.set_many({"a": 1}, ttl=60)
+    cache.set_many({"b": 2}, ttl=60)
+    cache.set_many({"c": 3}, ttl=60)
+    assert cache.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+
+
+def test_mmap_cache_lock_files_are_striped(tmp_path):
+    cache = shared_cache.MmapCache(str(tmp_path / "cache"), slots=16, slot_size=1024)
+    for i in range(shared_cache.LOCK_STRIPES * 4):
+        with cache.lock(f"key-{i}", timeout=1) as acquired:
+            assert acquired
+    assert len(os.listdir(cache.lock_dir)) <= shared_cache.LOCK_STRIPES
+
+
+def test_mmap_cache_counts_values_larger_than_a_slot(tmp_path):
+    cache = shared_cache.MmapCache(str(tmp_path / "cache"), slots=16, slot_size=256)
+    cache.set_many({"big": "x" * 1000, "small": "y"}, ttl=60)
+    assert cache.get_many(["big", "small"]) == {"small": "y"}
+    assert cache.oversize == 1
+
+
+def test_mmap_cache_is_shared_between_instances(tmp_path):
+    writer = shared_cache.MmapCache(str(tmp_path / "cache"), slots=16, slot_size=1024)
+    reader = shared_cache.MmapCache(str(tmp_path / "cache"), slots=16, slot_size=1024)
+    writer.set_many({"k": {"v": 1}}, ttl=60)
+    assert reader.get_many(["k"]) == {"k": {"v": 1}}